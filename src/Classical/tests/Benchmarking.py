@@ -209,7 +209,7 @@ def main():
 
                 labels.min_percent_remain = 0.99
 
-                runtime = time_function(lambda: labels.run_algorithm(graph, source_node = 0, max_weight = MAX_WEIGHT))
+                runtime = time_function(lambda: labels.run_algorithm(graph, source_node = 0, max_weight = MAX_WEIGHT, destination_node = graph_size - 1))
                 node_results[graph_size] = runtime
                 edge_results[len(graph.edges)] = runtime
         except:
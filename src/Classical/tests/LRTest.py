@@ -29,6 +29,7 @@ def main():
     for alph in range(1,5):
         print("Alpha = "+str(alph)+":")
         [graph_dict, meff_path] = run_dirty_lagrange(graph, alph, eff_paths)
+        run_lagrangian_label_setting(graph, max_weight, num_nodes, alph)
         # print(graph_dict)
         LRedges = list(graph_dict.keys())
         
@@ -46,8 +47,18 @@ def main():
 def run_label_setting(graph, max_w, num_nodes):
     #Function takes in the graph and a list of efficient paths
     labels = LabelAlgorithmRec()
-    labels.run_algorithm(graph, 0, max_weight=max_w)
-    x = labels.node_labels[num_nodes-1].paths.values()
+    labels.run_algorithm(graph, 0, max_weight=max_w, destination_node=num_nodes-1)
+    x = labels.node_labels[num_nodes-1].get_efficient_paths()
+    print("Efficient Paths:", list(x))
+    return x
+
+def run_lagrangian_label_setting(graph, max_w, num_nodes, alpha):
+    #Runs label setting on the graph reduced with the Lagrange multiplier (edges that can't beat the incumbent are removed)
+    labels = LabelAlgorithmRec()
+    labels.lagrange_multiplier = alpha
+    labels.run_algorithm(graph, 0, max_weight=max_w, destination_node=num_nodes-1)
+    print("Edges after Lagrangian reduction: ", len(labels.graph.edges), "of", len(graph.edges))
+    x = labels.node_labels[num_nodes-1].get_efficient_paths()
     print("Efficient Paths:", list(x))
     return x
 
@@ -0,0 +1,153 @@
+import numpy
+
+class CSRAdjacency:
+    """
+    The CSRAdjacency class stores the edges of a directed graph in compressed sparse row (CSR) form.
+    The neighbors of a node are a contiguous slice of a single array, so a neighbor query costs
+    O(degree) and the whole structure uses O(V + E) memory.
+
+    Nodes are referred to by their dense index (0, ..., num_nodes - 1), not by their identifier.
+
+    members:
+        + num_nodes (int): the number of rows (nodes) in the adjacency
+        + offsets (numpy.ndarray): row pointer of length num_nodes + 1, the neighbors of node i are
+            stored in targets[offsets[i]:offsets[i + 1]]
+        + targets (numpy.ndarray): dense indices of the neighbor nodes, grouped by row and sorted within each row
+        + edge_ids (numpy.ndarray): the edge id (position in the original edge arrays) of each stored neighbor
+    """
+
+    def __init__(self, num_nodes: int, sources: numpy.ndarray, targets: numpy.ndarray, edge_ids: numpy.ndarray | None = None) -> None:
+        """
+        Creates a new CSR adjacency from arrays of edge endpoints.
+
+        Args:
+            num_nodes (int): the number of nodes in the graph
+            sources (numpy.ndarray): dense index of the origin node of each edge
+            targets (numpy.ndarray): dense index of the destination node of each edge
+            edge_ids (numpy.ndarray | None, optional): the id of each edge. Defaults to None (the position of the edge in the arrays).
+        """
+        sources = numpy.asarray(sources, dtype = numpy.int64)
+        targets = numpy.asarray(targets, dtype = numpy.int64)
+        if edge_ids is None:
+            edge_ids = numpy.arange(len(sources), dtype = numpy.int64)
+
+        # sort the edges by row, then by column, so each row is a sorted contiguous slice
+        order = numpy.lexsort((targets, sources))
+
+        self.num_nodes: int = num_nodes
+        self.offsets: numpy.ndarray = numpy.zeros(num_nodes + 1, dtype = numpy.int64)
+        numpy.cumsum(numpy.bincount(sources, minlength = num_nodes), out = self.offsets[1:])
+        self.targets: numpy.ndarray = targets[order]
+        self.edge_ids: numpy.ndarray = numpy.asarray(edge_ids, dtype = numpy.int64)[order]
+
+    def get_neighbors(self, index: int) -> numpy.ndarray:
+        """
+        Returns the dense indices of the neighbors of the given node.
+
+        Args:
+            index (int): dense index of the node
+
+        Returns:
+            numpy.ndarray: the (sorted) dense indices of the neighbors
+        """
+        return self.targets[self.offsets[index]:self.offsets[index + 1]]
+
+    def get_edge_ids(self, index: int) -> numpy.ndarray:
+        """
+        Returns the edge ids of the edges stored in the row of the given node (aligned with get_neighbors).
+
+        Args:
+            index (int): dense index of the node
+
+        Returns:
+            numpy.ndarray: the edge ids of the row
+        """
+        return self.edge_ids[self.offsets[index]:self.offsets[index + 1]]
+
+    def get_positions_of(self, indices: numpy.ndarray) -> numpy.ndarray:
+        """
+        Returns the positions (in targets/edge_ids) of every entry stored in the rows of the given nodes,
+        gathered with vectorized operations instead of a loop over the rows.
+
+        Args:
+            indices (numpy.ndarray): dense indices of the row nodes
+
+        Returns:
+            numpy.ndarray: the positions of the entries of all the rows, row after row
+        """
+        indices = numpy.asarray(indices, dtype = numpy.int64)
+        starts = self.offsets[indices]
+        counts = self.offsets[indices + 1] - starts
+        # shift a running counter by the start of the row each entry belongs to
+        row_offsets = numpy.cumsum(counts) - counts
+        return numpy.repeat(starts - row_offsets, counts) + numpy.arange(counts.sum(), dtype = numpy.int64)
+
+    def get_neighbors_of(self, indices: numpy.ndarray) -> numpy.ndarray:
+        """
+        Returns the concatenated neighbors of all the given nodes (duplicates are kept).
+
+        Args:
+            indices (numpy.ndarray): dense indices of the nodes
+
+        Returns:
+            numpy.ndarray: the dense indices of the neighbors of every given node, row after row
+        """
+        return self.targets[self.get_positions_of(indices)]
+
+    def find_position(self, index: int, target: int) -> int:
+        """
+        Finds where the entry (index, target) is stored, using a binary search over the sorted row.
+
+        Args:
+            index (int): dense index of the row node
+            target (int): dense index of the neighbor node
+
+        Returns:
+            int: the position of the entry in targets/edge_ids, -1 if the entry doesn't exist
+        """
+        start = self.offsets[index]
+        end = self.offsets[index + 1]
+        position = start + int(numpy.searchsorted(self.targets[start:end], target))
+        if position < end and self.targets[position] == target:
+            return int(position)
+        return -1
+
+    def get_degree(self, index: int) -> int:
+        """
+        Returns the number of neighbors of the given node.
+
+        Args:
+            index (int): dense index of the node
+
+        Returns:
+            int: the number of neighbors
+        """
+        return int(self.offsets[index + 1] - self.offsets[index])
+
+    def get_degrees(self) -> numpy.ndarray:
+        """
+        Returns the number of neighbors of every node.
+
+        Returns:
+            numpy.ndarray: array of length num_nodes with the degree of each node
+        """
+        return numpy.diff(self.offsets)
+
+    def get_rows(self) -> numpy.ndarray:
+        """
+        Returns the row (dense index of the owning node) of every stored neighbor, aligned with targets.
+
+        Returns:
+            numpy.ndarray: the row index of every stored entry
+        """
+        return numpy.repeat(numpy.arange(self.num_nodes, dtype = numpy.int64), self.get_degrees())
+
+    def transpose(self) -> "CSRAdjacency":
+        """
+        Returns the transposed adjacency (rows become columns), keeping the edge ids. Transposing the
+        outgoing adjacency gives the incoming (predecessor) adjacency.
+
+        Returns:
+            CSRAdjacency: the transposed adjacency
+        """
+        return CSRAdjacency(self.num_nodes, self.targets, self.get_rows(), self.edge_ids)
@@ -0,0 +1,130 @@
+import numpy
+from scipy import sparse
+from types import MappingProxyType
+from typing import Tuple
+
+from .WCGraph import WCGraph
+
+class FrozenWCGraph(WCGraph):
+    """
+    Immutable snapshot of a Weight-Constrained Graph. The edges are stored in canonical order (sorted by
+    from node, then to node) in read-only arrays, the derived views (wc_edges, weight and cost matricies) are
+    read-only as well, and the methods that change the graph (add_edge, remove_edge, update_edge, reorder_nodes,
+    invalidate_views) raise a TypeError. A frozen graph is hashable: its hash and equality are based on the
+    content hash, so it can be used directly (or through get_content_hash) as part of a cache key,
+    e.g. (graph.get_content_hash(), source, target, budget).
+
+    The snapshot is a full WCGraph, so it can be handed to any algorithm that reads a WCGraph.
+    """
+
+    @staticmethod
+    def from_graph(graph: WCGraph) -> "FrozenWCGraph":
+        """
+        Creates a frozen snapshot of the given graph. The snapshot shares no data with the graph, so later
+        changes to the graph don't affect it.
+
+        Args:
+            graph (WCGraph): the graph to take a snapshot of
+
+        Returns:
+            FrozenWCGraph: the frozen snapshot
+        """
+        if isinstance(graph, FrozenWCGraph):
+            return graph
+
+        columns = graph.get_canonical_edge_columns()
+        frozen = FrozenWCGraph.from_arrays(columns["src"], columns["dst"], columns["edge_weights"], columns["edge_costs"])
+        frozen._set_read_only()
+        return frozen
+
+    @classmethod
+    def load_binary_file(cls, filename: str, memory_map: bool = False) -> "FrozenWCGraph":
+        """
+        Loads a frozen snapshot from a file written by save_binary_file. The columns of a file saved from a
+        frozen graph are already in canonical order, so they are used directly (memory-mapped or not) without
+        being sorted or copied. Files with columns in another order are loaded through from_graph.
+
+        Args:
+            filename (str): the path of the file
+            memory_map (bool, optional): true = memory-map the columns (see WCGraph.load_binary_file). Defaults to False.
+
+        Raises:
+            ValueError: if the file is not a binary graph file of a supported version
+
+        Returns:
+            FrozenWCGraph: the frozen snapshot
+        """
+        frozen = super(FrozenWCGraph, cls).load_binary_file(filename, memory_map)
+        if not frozen._has_canonical_columns():
+            return FrozenWCGraph.from_graph(frozen.thaw())
+        frozen._set_read_only()
+        return frozen
+
+    @property
+    def wc_edges(self) -> MappingProxyType:
+        """The read-only dictionary of edges to (weight, cost), built from the edge arrays on first access."""
+        return self._get_view("wc_edges", lambda: MappingProxyType(self._gen_wc_edges()))
+
+    def _gen_wc_matrix(self, values: numpy.ndarray) -> numpy.ndarray | sparse.csr_matrix:
+        matrix = super(FrozenWCGraph, self)._gen_wc_matrix(values)
+        (matrix if isinstance(matrix, numpy.ndarray) else matrix.data).flags.writeable = False
+        return matrix
+
+    def add_edge(self, from_node: int, to_node: int, weight: int = 0, cost: int = 0) -> None:
+        raise TypeError("a FrozenWCGraph can't be modified, use thaw() to get a mutable copy")
+
+    def remove_edge(self, from_node: int, to_node: int) -> None:
+        raise TypeError("a FrozenWCGraph can't be modified, use thaw() to get a mutable copy")
+
+    def update_edge(self, from_node: int, to_node: int, weight: int, cost: int) -> None:
+        raise TypeError("a FrozenWCGraph can't be modified, use thaw() to get a mutable copy")
+
+    def reorder_nodes(self, method: str = "rcm") -> numpy.ndarray:
+        raise TypeError("a FrozenWCGraph can't be reordered, use thaw() to get a mutable copy")
+
+    def invalidate_views(self) -> None:
+        raise TypeError("a FrozenWCGraph can't be modified, use thaw() to get a mutable copy")
+
+    def generate_weight_cost_matricies(self, sparse_matricies: bool = False) -> Tuple[numpy.ndarray | sparse.csr_matrix, numpy.ndarray | sparse.csr_matrix]:
+        raise TypeError("a FrozenWCGraph can't be modified, its weight and cost matricies are built on first access")
+
+    def freeze(self) -> "FrozenWCGraph":
+        return self
+
+    def thaw(self) -> WCGraph:
+        """
+        Returns a mutable copy of the snapshot.
+
+        Returns:
+            WCGraph: a new graph with the same edges
+        """
+        columns = self.get_canonical_edge_columns()
+        return WCGraph.from_arrays(columns["src"], columns["dst"], columns["edge_weights"], columns["edge_costs"])
+
+    def __hash__(self) -> int:
+        return int(self.get_content_hash()[:16], 16)
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, FrozenWCGraph):
+            return NotImplemented
+        return self.get_content_hash() == other.get_content_hash()
+
+    def __reduce__(self) -> Tuple:
+        # pickle only the canonical edge columns, the views are rebuilt on demand in the other process
+        columns = self.get_canonical_edge_columns()
+        return (FrozenWCGraph._unpickle, (columns["src"], columns["dst"], columns["edge_weights"], columns["edge_costs"]))
+
+    def _has_canonical_columns(self) -> bool:
+        """Returns true if the nodes are sorted and the edges are sorted by (from, to) dense index, i.e. by (from, to) node."""
+        sources, targets = self._edge_sources, self._edge_targets
+        nodes_sorted = bool(numpy.all(self._node_array[1:] > self._node_array[:-1]))
+        return nodes_sorted and bool(numpy.all((sources[1:] > sources[:-1]) | ((sources[1:] == sources[:-1]) & (targets[1:] > targets[:-1]))))
+
+    def _set_read_only(self) -> None:
+        """Makes the node array and the edge columns read-only."""
+        for name in ["_node_array"] + self._get_edge_column_names():
+            getattr(self, name).flags.writeable = False
+
+    @staticmethod
+    def _unpickle(sources, targets, weights, costs) -> "FrozenWCGraph":
+        return FrozenWCGraph.from_graph(WCGraph.from_arrays(sources, targets, weights, costs))
@@ -1,9 +1,13 @@
-from typing import Dict, List, Tuple
+from typing import Any, Callable, Dict, List, Tuple
+import hashlib
 import matplotlib.pyplot as pyplot
 import networkx
 import numpy
+from scipy import sparse
+from scipy.sparse import csgraph
 
-from numpy import random as r
+from .CSRAdjacency import CSRAdjacency
+from .GraphRenderer import GraphRenderer
 
 class Graph:
     """ 
@@ -11,9 +15,19 @@ class Graph:
 
     members:
         + edges (List[int]): a list of (from, to) node tuples
-        + nodes (List[int]): a list of nodes (sorted in increasing order) in the graph
-        + direction_matrix (numpy.ndarray): matrix of the directed edges between nodes
+        + nodes (List[int]): a list of nodes in the graph, indexed by dense index (sorted in increasing order, unless
+            nodes were added by add_edge, which appends them, or the graph was reordered by reorder_nodes)
+        + node_index (Dict[int, int]): mapping of each node identifier to its dense index (position in nodes)
+        + adjacency (CSRAdjacency): compressed sparse row adjacency of the outgoing edges of each node
+        + reverse_adjacency (CSRAdjacency): compressed sparse row adjacency of the incoming edges of each node
+        + connection_matrix (numpy.ndarray): dense matrix of the directed edges between nodes
         + networkx_graph (networkx.DiGraph): networkx object representation of graph
+        + version (int): counter that is increased every time the graph changes
+
+    The edges, adjacency, connection matrix and networkx graph are derived views of the edge arrays. Each
+    view is built the first time it is accessed, cached, and dropped by invalidate_views() when the graph changes.
+    The mutation methods (add_edge, remove_edge) update the cheap views in place and only drop the ones that
+    would need a full rebuild (e.g. the CSR adjacency), which are then rebuilt once on their next access.
     """
     
     def __init__(self, edges: List[int]) -> None:
@@ -24,20 +38,485 @@ class Graph:
         Args:
             edges (Sequence): a list of edges (node from-to tuples)
         """
-        self.edges: List[int] = edges
-        self.connection_matrix: numpy.ndarray
-        self.networkx_graph: networkx.DiGraph
-        self.nodes = Graph.get_nodes(self.edges)
+        # copy the edges, so the graph doesn't share the caller's list
+        edge_list = list(edges)
+        # convert the edges to arrays of node identifiers and build every structure in bulk
+        edge_array = Graph._gen_edge_array(edge_list)
+        self._initialize_from_arrays(edge_array[:, 0], edge_array[:, 1])
+        self._views["edges"] = edge_list
+
+    @classmethod
+    def from_arrays(cls, sources: numpy.ndarray, targets: numpy.ndarray) -> "Graph":
+        """
+        Creates a new graph directly from arrays of edge endpoints, without going through a Python
+        list of edges. Every internal structure is built with bulk numpy operations.
+
+        Args:
+            sources (numpy.ndarray): the origin node of each edge
+            targets (numpy.ndarray): the destination node of each edge
+
+        Returns:
+            Graph: the graph with the given edges
+        """
+        sources = numpy.asarray(sources, dtype = numpy.int64)
+        targets = numpy.asarray(targets, dtype = numpy.int64)
+
+        graph = cls.__new__(cls)
+        graph._initialize_from_arrays(sources, targets)
+        return graph
+
+    def _initialize_from_arrays(self, sources: numpy.ndarray, targets: numpy.ndarray) -> None:
+        """
+        Initializes the nodes, the id to index mapping and the edge arrays from arrays of edge endpoints
+        (node identifiers). The derived views are left to be built on first access.
+
+        Args:
+            sources (numpy.ndarray): the origin node of each edge
+            targets (numpy.ndarray): the destination node of each edge
+        """
+        # find the (sorted) nodes and the dense index of both endpoints of every edge in one pass
+        num_edges = len(sources)
+        node_array, inverse = numpy.unique(numpy.concatenate((sources, targets)), return_inverse = True)
+        self._initialize_from_indexed_arrays(node_array, inverse[:num_edges].astype(numpy.int64), inverse[num_edges:].astype(numpy.int64))
+
+    def _initialize_from_indexed_arrays(self, node_array: numpy.ndarray, edge_sources: numpy.ndarray, edge_targets: numpy.ndarray) -> None:
+        """
+        Initializes the graph from the array of node identifiers and the dense index of both endpoints of
+        every edge. The arrays are used as they are (no copy), e.g. arrays memory-mapped from a binary graph file.
+
+        Args:
+            node_array (numpy.ndarray): the node identifiers, indexed by dense index
+            edge_sources (numpy.ndarray): dense index of the origin node of each edge
+            edge_targets (numpy.ndarray): dense index of the destination node of each edge
+        """
+        self._views: Dict[str, Any] = {}
+        self._column_buffers: Dict[str, numpy.ndarray] = {}
+        self.version: int = 0
+
+        self._node_array: numpy.ndarray = node_array
+        self._edge_sources: numpy.ndarray = edge_sources
+        self._edge_targets: numpy.ndarray = edge_targets
+        self.nodes: List[int] = self._node_array.tolist()
+        self.node_index: Dict[int, int] = dict(zip(self.nodes, range(len(self.nodes))))
+
+    @property
+    def edges(self) -> List[Tuple[int, int]]:
+        """The list of (from, to) edges, built from the edge arrays on first access."""
+        return self._get_view("edges", self._gen_edge_list)
+
+    @property
+    def adjacency(self) -> CSRAdjacency:
+        """The CSR adjacency of the outgoing edges, built on first access (see _gen_adjacency)."""
+        return self._get_view("adjacency", self._gen_adjacency)
+
+    @property
+    def reverse_adjacency(self) -> CSRAdjacency:
+        """The CSR adjacency of the incoming edges, built on first access."""
+        return self._get_view("reverse_adjacency", lambda: self.adjacency.transpose())
+
+    @property
+    def connection_matrix(self) -> numpy.ndarray:
+        """The dense nxn connection matrix, built on first access since it needs O(n^2) memory (see _gen_connection_matrix)."""
+        return self._get_view("connection_matrix", self._gen_connection_matrix)
+
+    @property
+    def networkx_graph(self) -> networkx.DiGraph:
+        """The networkx representation of the graph, built on first access (e.g. by print_graph or get_simple_paths)."""
+        return self._get_view("networkx_graph", self._gen_networkx_graph)
+
+    def is_acyclic(self) -> bool:
+        """
+        Returns true if the graph is a directed acyclic graph (DAG). Computed once and cached.
+
+        Returns:
+            bool: true if the graph has no directed cycle
+        """
+        return self._get_view("topology", self._gen_topology)[0]
+
+    def get_topological_order(self) -> numpy.ndarray:
+        """
+        Returns the nodes in topological order (every edge goes from an earlier to a later node), sorted
+        by level. Computed once and cached. If the graph has cycles, the nodes on or after a cycle are left out.
+
+        Returns:
+            numpy.ndarray: array of node identifiers in topological order
+        """
+        return self._node_array[self._get_view("topology", self._gen_topology)[1]]
+
+    def get_node_levels(self) -> numpy.ndarray:
+        """
+        Returns the depth level of every node: 0 for nodes without incoming edges, otherwise one more
+        than the highest level of its incoming nodes (the number of edges of the longest path reaching it).
+        Nodes of the same level have no edges between them, so each level can be processed in parallel.
+        Computed once and cached.
+
+        Returns:
+            numpy.ndarray: the level of each node, aligned with nodes (-1 for nodes on or after a cycle)
+        """
+        return self._get_view("topology", self._gen_topology)[2]
+
+    def get_content_hash(self) -> str:
+        """
+        Returns a stable hash of the content of the graph: a sha256 digest of the canonical (sorted by
+        from, then to node) edge columns. Two graphs with the same edges (and edge values) have the same
+        hash, regardless of the order the edges were given in, the process or the platform, so the hash
+        can be used as a key to cache results across sessions. Computed once and cached until the graph changes.
+
+        Returns:
+            str: the hexadecimal sha256 digest
+        """
+        return self._get_view("content_hash", self._gen_content_hash)
+
+    def get_canonical_edge_columns(self) -> Dict[str, numpy.ndarray]:
+        """
+        Returns the edge columns in canonical order (sorted by from node, then to node), with the node
+        columns converted from dense indices to node identifiers.
+
+        Returns:
+            Dict[str, numpy.ndarray]: dictionary of column names ("src", "dst", then the other edge columns) to arrays
+        """
+        sources = self._node_array[self._edge_sources]
+        targets = self._node_array[self._edge_targets]
+        order = numpy.lexsort((targets, sources))
+
+        columns = { "src": sources[order], "dst": targets[order] }
+        for name in self._get_edge_column_names()[2:]:
+            columns[name] = getattr(self, name)[order]
+        return columns
+
+    def reorder_nodes(self, method: str = "rcm") -> numpy.ndarray:
+        """
+        Renumbers the dense indices of the nodes so that nodes close to each other in the graph are close to
+        each other in memory, and sorts the edge columns by (from, to) dense index. The traversals over the
+        dense arrays (adjacency, Dijkstra, label propagation) then access memory mostly sequentially instead
+        of at random, which matters for graphs with 10^5 nodes or more.
+
+        The node identifiers don't change: nodes (dense index -> identifier) and node_index (identifier ->
+        dense index) stay the mapping between both, so every result is still reported in node identifiers.
+        The edge ids change, and every derived view is rebuilt on its next access.
+
+        Args:
+            method (str, optional): the ordering, see get_locality_order. Defaults to "rcm".
+
+        Returns:
+            numpy.ndarray: the previous dense index of each node, in the new order
+        """
+        order = self.get_locality_order(method)
+        self._permute_nodes(order)
+        return order
+
+    def get_locality_order(self, method: str = "rcm") -> numpy.ndarray:
+        """
+        Returns an ordering of the nodes that improves memory locality (see reorder_nodes):
+
+            + "bfs": breadth first order of every (weakly) connected component, starting from a node of
+                minimum degree and visiting the neighbors by increasing degree (Cuthill-McKee order)
+            + "rcm": reverse Cuthill-McKee order (scipy.sparse.csgraph), which also reduces the bandwidth
+                of the connection matrix
+            + "topological": the topological order (get_topological_order), only for acyclic graphs, so every
+                edge goes from a lower to a higher dense index
+
+        Args:
+            method (str, optional): "bfs", "rcm" or "topological". Defaults to "rcm".
+
+        Raises:
+            ValueError: if the method is unknown, or if the method is "topological" and the graph has a cycle
+
+        Returns:
+            numpy.ndarray: the dense indices of the nodes in the new order
+        """
+        if method == "topological":
+            if not self.is_acyclic():
+                raise ValueError("the topological order only exists for acyclic graphs")
+            return self._get_view("topology", self._gen_topology)[1].copy()
+        if method not in ("bfs", "rcm"):
+            raise ValueError(f"unknown ordering '{method}', expected 'bfs', 'rcm' or 'topological'")
+
+        # the orderings work on the undirected version of the graph
+        matrix = self._gen_pattern_matrix(self.adjacency)
+        undirected = (matrix + matrix.T).tocsr()
+        order = csgraph.reverse_cuthill_mckee(undirected, symmetric_mode = True).astype(numpy.int64)
+        # the Cuthill-McKee (breadth first) order is the reverse cuthill-mckee order read backwards
+        return order if method == "rcm" else order[::-1].copy()
+
+    def get_reachable_nodes(self, node: int, reverse: bool = False) -> numpy.ndarray:
+        """
+        Returns the nodes reachable from the given node (breadth first search on the CSR adjacency), or the
+        nodes the given node is reachable from if reverse is set. The node itself is included.
+
+        Args:
+            node (int): the node identifier
+            reverse (bool, optional): false = follow the outgoing edges, true = follow the incoming edges. Defaults to False.
+
+        Raises:
+            KeyError: if the node is not in the graph
+
+        Returns:
+            numpy.ndarray: array of node identifiers, in breadth first order
+        """
+        matrix = self._gen_pattern_matrix(self.reverse_adjacency if reverse else self.adjacency)
+        order = csgraph.breadth_first_order(matrix, self.get_node_index(node), directed = True, return_predecessors = False)
+        return self._node_array[order]
+
+    def get_induced_subgraph(self, nodes: numpy.ndarray | List[int], edge_mask: numpy.ndarray | None = None) -> "Graph":
+        """
+        Returns the subgraph induced by the given nodes: the nodes and every edge between two of them. The
+        nodes keep their relative dense order, and the edges their relative edge id order.
+
+        Args:
+            nodes (numpy.ndarray | List[int]): the node identifiers of the subgraph
+            edge_mask (numpy.ndarray | None, optional): boolean mask over the edge ids, only the selected edges
+                between the nodes are kept. Defaults to None (every edge between the nodes).
 
-        # Initialize connection matrix using the list of edges
-        self._initialize_connection_matrix()
+        Raises:
+            KeyError: if any of the nodes is not in the graph
 
-        # Initialize the networkx graph
-        self._initialize_networkx_graph()
+        Returns:
+            Graph: a new graph, sharing no data with this one
+        """
+        node_array, _, edge_sources, edge_targets = self._gen_induced_arrays(nodes, edge_mask)
+        subgraph = Graph.__new__(Graph)
+        subgraph._initialize_from_indexed_arrays(node_array, edge_sources, edge_targets)
+        return subgraph
+
+    def add_edge(self, from_node: int, to_node: int) -> None:
+        """
+        Adds the edge (from_node, to_node) to the graph (nothing happens if the edge already exists). Nodes
+        that are not in the graph yet are added. Costs amortized O(1), the views that can't be updated in
+        place are rebuilt on their next access.
+
+        Args:
+            from_node (int): origin node of the directed edge
+            to_node (int): destination node of the directed edge
+        """
+        if (from_node, to_node) not in self._get_edge_id_map():
+            self._insert_edge(from_node, to_node, {})
+
+    def remove_edge(self, from_node: int, to_node: int) -> None:
+        """
+        Removes the edge (from_node, to_node) from the graph. Its nodes are kept, even if they are left
+        without edges. Costs O(1), the views that can't be updated in place are rebuilt on their next access.
+
+        Note: the last edge takes the edge id of the removed edge.
+
+        Args:
+            from_node (int): origin node of the directed edge
+            to_node (int): destination node of the directed edge
+
+        Raises:
+            KeyError: if the edge is not in the graph
+        """
+        self._delete_edge(from_node, to_node)
+
+    def invalidate_views(self) -> None:
+        """
+        Drops every cached derived view of the graph and increases the version counter. Must be called
+        whenever the edge arrays change, the views are then rebuilt on their next access.
+        """
+        self._views.clear()
+        self.version += 1
+
+    def _drop_views(self, *names: str) -> None:
+        """
+        Drops the given cached views (if they exist), without changing the version.
+
+        Args:
+            names (str): the names of the views
+        """
+        for name in names:
+            self._views.pop(name, None)
+
+    def _insert_edge(self, from_node: int, to_node: int, edge_values: Dict[str, Any]) -> int:
+        """
+        Appends a new edge to the edge arrays and updates (or drops) the cached views.
+
+        Args:
+            from_node (int): origin node of the directed edge
+            to_node (int): destination node of the directed edge
+            edge_values (Dict[str, Any]): the values of the edge for the other edge columns, e.g. {"edge_weights": 3}
+
+        Returns:
+            int: the edge id of the new edge
+        """
+        new_nodes = [node for node in dict.fromkeys((from_node, to_node)) if node not in self.node_index]
+        for node in new_nodes:
+            self.node_index[node] = len(self.nodes)
+            self.nodes.append(node)
+            self._append_to_columns({ "_node_array": node })
+
+        edge_id = len(self._edge_sources)
+        self._append_to_columns({ "_edge_sources": self.node_index[from_node], "_edge_targets": self.node_index[to_node], **edge_values })
+
+        # update the views that support it, drop the ones that have to be rebuilt
+        self._get_edge_id_map()[(from_node, to_node)] = edge_id
+        if "networkx_graph" in self._views:
+            self._views["networkx_graph"].add_edge(from_node, to_node)
+        if "connection_matrix" in self._views and not new_nodes:
+            self._views["connection_matrix"][self.node_index[from_node], self.node_index[to_node]] = 1
+        else:
+            self._drop_views("connection_matrix")
+        if new_nodes:
+            self._drop_views("node_sorter")
+        self._drop_views("edges", "adjacency", "reverse_adjacency", "edge_keys", "topology", "content_hash")
+        self.version += 1
+        return edge_id
+
+    def _delete_edge(self, from_node: int, to_node: int) -> Tuple[int, int]:
+        """
+        Removes an edge from the edge arrays by moving the last edge into its place, and updates (or drops)
+        the cached views.
+
+        Args:
+            from_node (int): origin node of the directed edge
+            to_node (int): destination node of the directed edge
+
+        Raises:
+            KeyError: if the edge is not in the graph
+
+        Returns:
+            Tuple[int, int]: (the edge id of the removed edge, the previous edge id of the edge that took its place)
+        """
+        edge_id_map = self._get_edge_id_map()
+        edge_id = edge_id_map.pop((from_node, to_node))
+        last_id = len(self._edge_sources) - 1
+
+        # move the last edge into the freed position
+        if edge_id != last_id:
+            last_edge = (int(self._node_array[self._edge_sources[last_id]]), int(self._node_array[self._edge_targets[last_id]]))
+            edge_id_map[last_edge] = edge_id
+        self._remove_from_columns(self._get_edge_column_names(), edge_id)
+
+        # update the views that support it, drop the ones that have to be rebuilt
+        if "networkx_graph" in self._views:
+            self._views["networkx_graph"].remove_edge(from_node, to_node)
+        if "connection_matrix" in self._views:
+            self._views["connection_matrix"][self.node_index[from_node], self.node_index[to_node]] = 0
+        self._drop_views("edges", "adjacency", "reverse_adjacency", "edge_keys", "topology", "content_hash")
+        self.version += 1
+        return (edge_id, last_id)
+
+    def _permute_nodes(self, order: numpy.ndarray) -> None:
+        """
+        Moves the node at dense index order[i] to dense index i, and sorts the edge columns by (from, to)
+        dense index. The content hash doesn't depend on the dense indices, so it is kept.
+
+        Args:
+            order (numpy.ndarray): the previous dense index of each node, in the new order
+        """
+        new_index = numpy.empty(len(order), dtype = numpy.int64)
+        new_index[order] = numpy.arange(len(order), dtype = numpy.int64)
+        sources = new_index[self._edge_sources]
+        targets = new_index[self._edge_targets]
+        edge_order = numpy.lexsort((targets, sources))
+
+        for name in self._get_edge_column_names()[2:]:
+            setattr(self, name, getattr(self, name)[edge_order])
+        self._edge_sources = sources[edge_order]
+        self._edge_targets = targets[edge_order]
+        self._node_array = self._node_array[order]
+        self.nodes = self._node_array.tolist()
+        self.node_index = dict(zip(self.nodes, range(len(self.nodes))))
+        self._column_buffers.clear()
+
+        content_hash = self._views.get("content_hash")
+        self.invalidate_views()
+        if content_hash is not None:
+            self._views["content_hash"] = content_hash
+
+    def _gen_induced_arrays(self, nodes: numpy.ndarray | List[int],
+                            edge_mask: numpy.ndarray | None = None) -> Tuple[numpy.ndarray, numpy.ndarray, numpy.ndarray, numpy.ndarray]:
+        """
+        Selects the given nodes and the edges between them, and renumbers the selected nodes densely.
 
+        Args:
+            nodes (numpy.ndarray | List[int]): the node identifiers to keep
+            edge_mask (numpy.ndarray | None, optional): boolean mask over the edge ids of the edges that may be kept. Defaults to None.
+
+        Returns:
+            Tuple[numpy.ndarray, numpy.ndarray, numpy.ndarray, numpy.ndarray]: the kept node identifiers, the ids of the
+                kept edges, and the new dense index of the origin and destination node of each kept edge
+        """
+        node_mask = numpy.zeros(len(self.nodes), dtype = bool)
+        node_mask[self.get_node_indices(nodes)] = True
+        kept_edges = node_mask[self._edge_sources] & node_mask[self._edge_targets]
+        if edge_mask is not None:
+            kept_edges &= edge_mask
+        edge_ids = numpy.flatnonzero(kept_edges)
+        new_index = numpy.cumsum(node_mask, dtype = numpy.int64) - 1
+        return (self._node_array[node_mask], edge_ids, new_index[self._edge_sources[edge_ids]], new_index[self._edge_targets[edge_ids]])
+
+    def _get_edge_column_names(self) -> List[str]:
+        """
+        Returns the names of the array attributes that hold one value per edge (indexed by edge id).
+
+        Returns:
+            List[str]: the names of the edge columns
+        """
+        return ["_edge_sources", "_edge_targets"]
+
+    def _get_edge_id_map(self) -> Dict[Tuple[int, int], int]:
+        """
+        Returns the cached dictionary of (from, to) edges to their edge id, used for O(1) lookups by the
+        mutation methods. The dictionary is built on first use, then kept up to date by the mutations.
+
+        Returns:
+            Dict[Tuple[int, int], int]: dictionary of edges to edge ids
+        """
+        return self._get_view("edge_id_map", lambda: dict(zip(self._gen_edge_list(), range(len(self._edge_sources)))))
+
+    def _append_to_columns(self, values: Dict[str, Any]) -> None:
+        """
+        Appends one value to each of the given array attributes. Each array is kept as a prefix view of a
+        larger buffer whose capacity is doubled when it is full, so appending costs amortized O(1).
+
+        Args:
+            values (Dict[str, Any]): dictionary of attribute names to the value to append
+        """
+        for name, value in values.items():
+            column = getattr(self, name)
+            length = len(column)
+            buffer = self._column_buffers.get(name)
+            if buffer is None or column.base is not buffer or length == len(buffer):
+                # allocate a new buffer with twice the capacity
+                buffer = numpy.empty(max(2 * length, 16), dtype = column.dtype)
+                buffer[:length] = column
+                self._column_buffers[name] = buffer
+            buffer[length] = value
+            setattr(self, name, buffer[:length + 1])
+
+    def _remove_from_columns(self, names: List[str], index: int) -> None:
+        """
+        Removes the value at the given index from each of the given array attributes by moving the last
+        value into its place (O(1), the arrays stay views of their buffers).
+
+        Args:
+            names (List[str]): the names of the array attributes
+            index (int): the index of the value to remove
+        """
+        for name in names:
+            column = getattr(self, name)
+            column[index] = column[-1]
+            setattr(self, name, column[:-1])
+
+    def _get_view(self, name: str, builder: Callable[[], Any]) -> Any:
+        """
+        Returns the cached derived view with the given name, building it first if it doesn't exist.
+
+        Args:
+            name (str): the name of the view
+            builder (Callable[[], Any]): function that builds the view
+
+        Returns:
+            Any: the cached view
+        """
+        view = self._views.get(name)
+        if view is None:
+            view = builder()
+            self._views[name] = view
+        return view
         
     def print_graph(self, picture_name: str = "", edge_labels: Dict[Tuple[int, int], str] | None = None, show_minimal_output: bool = False,
-                    highlight_edges = Tuple[int, int]) -> None:
+                    highlight_edges: List[Tuple[int, int]] | None = None, headless: bool = False, layout: str = "circular") -> None:
         """
         Prints the graph using the networkx graph representation and pyplot.
 
@@ -45,8 +524,15 @@ class Graph:
             picture_name (str, optional): The name to save the graph image as. Defaults to "".
             edge_labels (Dict[Tuple[int, int], str] | None, optional): The dictionary of edges to labels. Defaults to None.
             show_minimal_output (bool): Supresses print statements and edge labels from being printed on the graph. Defaults to False
-            highlight_edges (Tuple[int,int]): Highlights list of edges
+            highlight_edges (List[Tuple[int, int]] | None, optional): Highlights list of edges. Defaults to None.
+            headless (bool, optional): true = render the image without a window (see GraphRenderer): the layout and the drawing
+                of the graph are cached, large graphs are decimated and nothing is printed. Defaults to False.
+            layout (str, optional): the node layout of the headless mode, "circular" or "spring". Defaults to "circular".
         """
+        if headless:
+            GraphRenderer.render(self, picture_name, edge_labels, show_minimal_output, highlight_edges, layout)
+            return
+
         if(not show_minimal_output):
             print("Nodes on Graph:")
             print(f"|    {self.networkx_graph.nodes()}")
@@ -56,19 +542,23 @@ class Graph:
         else:
             line_width = 4
         
-        
+        # the layout is computed once and shared by every drawing call
+        positions = GraphRenderer.get_layout(self, "circular")
+        pos = dict(zip(self.nodes, positions))
+        color_map = self.get_color_map(len(self.nodes))
+
         #TODO: Alter size of nodes and lines with size of graph
         networkx.draw_networkx(self.networkx_graph, 
-            pos = networkx.circular_layout(self.networkx_graph), node_color = self.get_color_map(len(self.networkx_graph)),
+            pos = pos, node_color = [color_map[self.node_index[node]] for node in self.networkx_graph],
             with_labels = not show_minimal_output, node_size=100 if show_minimal_output else 300, arrows = not show_minimal_output)
         
         if edge_labels and not show_minimal_output:
-            networkx.draw_networkx_edge_labels(self.networkx_graph, edge_labels = edge_labels, pos = networkx.circular_layout(self.networkx_graph))
+            networkx.draw_networkx_edge_labels(self.networkx_graph, edge_labels = edge_labels, pos = pos)
 
-        if len(highlight_edges)>0:
+        if highlight_edges:
             networkx.draw_networkx_edges(
                 self.networkx_graph,
-                pos = networkx.circular_layout(self.networkx_graph),
+                pos = pos,
                 edgelist=highlight_edges,
                 width=line_width,
                 alpha=0.5,
@@ -143,14 +633,9 @@ class Graph:
         Returns:
             List[int]: a list of nodes (integer identifiers)
         """
-        incoming_nodes = []
-        # the list of incoming nodes is the corresponding column in the connections matrix
-        matrix_column = self.connection_matrix[:, self.nodes.index(node)]
-        # add every node with an outgoing edge to the current node
-        for i in range(len(matrix_column)):
-            if matrix_column[i] != 0:
-                incoming_nodes.append(i)
-        return incoming_nodes
+        # the incoming nodes are the row of the node in the transposed (predecessor) adjacency
+        neighbors = self.reverse_adjacency.get_neighbors(self.get_node_index(node))
+        return self._node_array[neighbors].tolist()
 
     def get_outgoing_nodes(self, node: int) -> List[int]:
         """
@@ -163,15 +648,90 @@ class Graph:
         Returns:
             List[int]: a list of nodes (integer identifiers)
         """
-        outgoing_nodes = []
-        # the list of outoing nodes is the corresponding row in the connections matrix
-        matrix_row = self.connection_matrix[self.nodes.index(node), :]
-        # add every node with an incoming edge from the current node
-        for i in range(len(matrix_row)):
-            if matrix_row[i] != 0:
-                outgoing_nodes.append(i)
-        return outgoing_nodes
+        # the outgoing nodes are the row of the node in the adjacency
+        neighbors = self.adjacency.get_neighbors(self.get_node_index(node))
+        return self._node_array[neighbors].tolist()
     
+    def get_node_index(self, node: int) -> int:
+        """
+        Returns the dense index (position in the sorted list of nodes) of the given node in O(1).
+
+        Args:
+            node (int): the node identifier
+
+        Returns:
+            int: the dense index of the node
+        """
+        return self.node_index[node]
+
+    def get_node_indices(self, nodes: numpy.ndarray) -> numpy.ndarray:
+        """
+        Returns the dense indices of an array of node identifiers, using one vectorized binary search
+        over the (sorted) node array.
+
+        Args:
+            nodes (numpy.ndarray): an array of node identifiers
+
+        Raises:
+            KeyError: if any of the nodes is not in the graph
+
+        Returns:
+            numpy.ndarray: the dense index of each node
+        """
+        nodes = numpy.asarray(nodes, dtype = numpy.int64)
+        # nodes added by add_edge are appended, so search through the sorting permutation of the node array
+        sorter = self._get_view("node_sorter", lambda: numpy.argsort(self._node_array, kind = "stable"))
+        positions = numpy.minimum(numpy.searchsorted(self._node_array, nodes, sorter = sorter), max(len(sorter) - 1, 0))
+        indices = sorter[positions] if len(sorter) > 0 else positions
+        found = self._node_array[indices] == nodes if len(sorter) > 0 else numpy.zeros(len(nodes), dtype = bool)
+        if not found.all():
+            raise KeyError(nodes[~found][0].item())
+        return indices
+
+    def get_edge_id(self, from_node: int, to_node: int) -> int:
+        """
+        Returns the edge id (position in the edge arrays) of the edge (from_node, to_node)
+
+        Args:
+            from_node (int): origin node of a directed edge
+            to_node (int): destination node of a directed edge
+
+        Raises:
+            KeyError: if the edge is not in the graph
+
+        Returns:
+            int: the edge id
+        """
+        position = self.adjacency.find_position(self.get_node_index(from_node), self.get_node_index(to_node))
+        if position == -1:
+            raise KeyError((from_node, to_node))
+        return int(self.adjacency.edge_ids[position])
+
+    def get_edge_ids(self, from_nodes: numpy.ndarray, to_nodes: numpy.ndarray) -> numpy.ndarray:
+        """
+        Returns the edge ids of many edges at once, using one vectorized binary search over the sorted
+        (from, to) keys of the adjacency.
+
+        Args:
+            from_nodes (numpy.ndarray): the origin node of each edge
+            to_nodes (numpy.ndarray): the destination node of each edge
+
+        Raises:
+            KeyError: if any of the edges is not in the graph
+
+        Returns:
+            numpy.ndarray: the edge id of each edge
+        """
+        keys = self.get_node_indices(from_nodes) * len(self.nodes) + self.get_node_indices(to_nodes)
+        edge_keys = self._get_view("edge_keys", self._gen_edge_keys)
+        positions = numpy.searchsorted(edge_keys, keys)
+        found = positions < len(edge_keys)
+        found[found] = edge_keys[positions[found]] == keys[found]
+        if not found.all():
+            missing = numpy.flatnonzero(~found)[0]
+            raise KeyError((int(numpy.asarray(from_nodes)[missing]), int(numpy.asarray(to_nodes)[missing])))
+        return self.adjacency.edge_ids[positions]
+
     def get_con_matrix_element(self, from_node: int, to_node: int) -> int:
         """
         Returns the matrix element M[from_node][to_node]
@@ -183,22 +743,37 @@ class Graph:
         Returns:
             int: the connection matrix element value at that position.
         """
-        return self.connection_matrix[self.nodes.index(from_node)][self.nodes.index(to_node)]
+        # look the edge up in the sparse adjacency, so the dense matrix is not built for a single element
+        position = self.adjacency.find_position(self.get_node_index(from_node), self.get_node_index(to_node))
+        return 1.0 if position != -1 else 0.0
     
-    def _initialize_networkx_graph(self) -> None:
+    def _gen_edge_list(self) -> List[Tuple[int, int]]:
+        """
+        Generates the list of (from, to) edges from the edge arrays.
+
+        Returns:
+            List[Tuple[int, int]]: the list of edges, in edge id order
+        """
+        return list(zip(self._node_array[self._edge_sources].tolist(), self._node_array[self._edge_targets].tolist()))
+
+    def _gen_networkx_graph(self) -> networkx.DiGraph:
         """
-        Initializes the networkx graph, adding the nodes and edges of the graph 
+        Generates the networkx graph, adding the nodes and edges of the graph 
         to the networkx object.
+
+        Returns:
+            networkx.DiGraph: the networkx representation of the graph
         """
-        self.networkx_graph = networkx.DiGraph()
+        networkx_graph = networkx.DiGraph()
         # Add nodes
-        self.networkx_graph.add_nodes_from(self.nodes)
+        networkx_graph.add_nodes_from(self.nodes)
         # Add edges
-        self.networkx_graph.add_edges_from(self.edges)
+        networkx_graph.add_edges_from(self.edges)
+        return networkx_graph
 
-    def _initialize_connection_matrix(self) -> None:
+    def _gen_connection_matrix(self) -> numpy.ndarray:
         """
-        Initializes the connection matrix representation of the graph using the defined edges
+        Generates the connection matrix representation of the graph using the defined edges
         for the graph.
 
         About Connection Matrix: 
@@ -215,10 +790,94 @@ class Graph:
                  2  [0, 0, 0]]
         """
         # initialize matrix to nxn 0 matrix
-        self.connection_matrix = Graph._gen_zero_n_square_matrix(self.edges)
+        connection_matrix = numpy.zeros((len(self.nodes), len(self.nodes)))
+
+        # fill every edge at once using the dense indices of the edge endpoints
+        connection_matrix[self._edge_sources, self._edge_targets] = 1
+        return connection_matrix
+
+    def _gen_topology(self) -> Tuple[bool, numpy.ndarray, numpy.ndarray]:
+        """
+        Generates the topological structure of the graph with a level synchronous version of Kahn's
+        algorithm: the nodes without remaining incoming edges form the next level, and removing the
+        edges of a whole level is done with vectorized operations on the adjacency.
+
+        Returns:
+            Tuple[bool, numpy.ndarray, numpy.ndarray]: (acyclic flag, dense indices in topological order, level of each node)
+        """
+        num_nodes = len(self.nodes)
+        adjacency = self.adjacency
+        in_degrees = numpy.bincount(adjacency.targets, minlength = num_nodes)
+        levels = numpy.full(num_nodes, -1, dtype = numpy.int64)
+        order = []
+
+        frontier = numpy.flatnonzero(in_degrees == 0)
+        level = 0
+        while len(frontier) > 0:
+            levels[frontier] = level
+            order.append(frontier)
+            # remove the outgoing edges of the current level
+            targets = adjacency.get_neighbors_of(frontier)
+            in_degrees -= numpy.bincount(targets, minlength = num_nodes)
+            candidates = numpy.unique(targets)
+            frontier = candidates[in_degrees[candidates] == 0]
+            level += 1
+
+        order = numpy.concatenate(order) if order else numpy.zeros(0, dtype = numpy.int64)
+        return (len(order) == num_nodes, order, levels)
+
+    def _gen_content_hash(self) -> str:
+        """
+        Generates the content hash of the graph (see get_content_hash). Every column is hashed as
+        little-endian 64 bit values, together with its name and kind, so the digest doesn't depend on
+        the dtype or byte order the arrays happen to have.
+
+        Returns:
+            str: the hexadecimal sha256 digest
+        """
+        digest = hashlib.sha256()
+        for name, column in self.get_canonical_edge_columns().items():
+            dtype = "<f8" if column.dtype.kind == "f" else "<i8"
+            digest.update(f"{name}:{dtype}:{len(column)};".encode())
+            digest.update(numpy.ascontiguousarray(column, dtype = dtype).tobytes())
+        return digest.hexdigest()
+
+    def _gen_edge_keys(self) -> numpy.ndarray:
+        """
+        Generates the key (from_index * n + to_index) of every entry of the adjacency. The adjacency is
+        sorted by row then column, so the keys are sorted and can be binary searched.
+
+        Returns:
+            numpy.ndarray: the sorted edge keys, aligned with adjacency.edge_ids
+        """
+        return self.adjacency.get_rows() * len(self.nodes) + self.adjacency.targets
+
+    def _gen_adjacency(self) -> CSRAdjacency:
+        """
+        Generates the compressed sparse row adjacency of the outgoing edges of the graph using the
+        defined edges for the graph.
 
-        for edge in self.edges:
-            self.connection_matrix[self.nodes.index(edge[0])][self.nodes.index(edge[1])] = 1
+            Example: list of edges --> [(0, 1), (0, 2), (1, 2)]
+                offsets = [0, 2, 3, 3]      (node i's neighbors are targets[offsets[i]:offsets[i + 1]])
+                targets = [1, 2, 2]
+        """
+        return CSRAdjacency(len(self.nodes), self._edge_sources, self._edge_targets)
+
+    @staticmethod
+    def _gen_pattern_matrix(adjacency: CSRAdjacency) -> sparse.csr_matrix:
+        """
+        Generates the scipy.sparse CSR matrix with a 1 for every edge of the adjacency, for the csgraph routines.
+        The matrix reuses the row pointer and column indices of the adjacency.
+
+        Args:
+            adjacency (CSRAdjacency): the adjacency (outgoing or incoming edges)
+
+        Returns:
+            sparse.csr_matrix: the nxn sparse matrix
+        """
+        num_nodes = adjacency.num_nodes
+        return sparse.csr_matrix((numpy.ones(len(adjacency.targets), dtype = numpy.int8), adjacency.targets, adjacency.offsets),
+                                 shape = (num_nodes, num_nodes))
 
     @staticmethod
     def get_nodes(edges: List[Tuple[int, int]]) -> List[int]:
@@ -231,15 +890,21 @@ class Graph:
         Returns:
             [List[Tuple[int, int]]]: a list of nodes in the graph with edges
         """
-        nodes = []
+        # numpy.unique removes the duplicates and sorts the nodes
+        return numpy.unique(Graph._gen_edge_array(edges)).tolist()
+
+    @staticmethod
+    def _gen_edge_array(edges: List[Tuple[int, int]]) -> numpy.ndarray:
+        """
+        Converts a collection of (from, to) edges into an Ex2 integer array
+
+        Args:
+            edges (List[Tuple[int, int]]): list of edges in the graph (node pairs)
 
-        for edge in edges:
-            for node in edge:
-                if node not in nodes:
-                    nodes.append(node)
-        # sort the nodes
-        nodes.sort()
-        return nodes
+        Returns:
+            numpy.ndarray: an Ex2 array, with the from nodes in column 0 and the to nodes in column 1
+        """
+        return numpy.array(list(edges), dtype = numpy.int64).reshape(-1, 2)
 
     @staticmethod
     def _gen_zero_n_square_matrix(edges: List[Tuple[int, int]]) -> numpy.ndarray:
@@ -256,40 +921,53 @@ class Graph:
         num_nodes = len(nodes)
         return numpy.zeros((num_nodes, num_nodes))
 
-    def get_arbitrary_graph(n: int):
+    @staticmethod
+    def get_arbitrary_graph(n: int, seed: int | numpy.random.Generator | None = None) -> "Graph":
         """Generates arbitrary WC graph with n nodes and no weights or costs
 
         Args:
             n (int): number of nodes
+            seed (int | numpy.random.Generator | None, optional): seed (or generator) of the random numbers. Defaults to None.
 
         Returns:
             Graph: arbitary WC graph with all (w,c) = (0,0)
         """
-        graphDict = {}
-        #Loop i range(0,n)
-        for i in range(0,n-1):
-            #Random Noe range(i,n) # of outgoing edges
-            N_oe = r.randint(1,n-i) if n-i>1 else 1
-            #print("i :", i, "\tN_oe: ", N_oe)
-            #Choose Noe unique nodes range(1,n) delta_o[]
-            delta_o = r.choice([*range(i+1,n)], N_oe, replace=False) if i!=n-1 else [n]
-            #For each j in delta_o[], add edge (i,j)
-            for j in delta_o:
-                #TODO: Add weights and cost generation -> can only do to a WCGraph
-                graphDict[i,j] = (0,0)
-            #If no incoming nodes
-            oneInNode = False
-            for k in range(0,i):
-                if((k,i) in graphDict):
-                    oneInNode = True
-                    break
-            if not oneInNode and i != 0:
-                #Choose node incoming n_in range(0,i-1)
-                n_in = r.randint(0,i-1) if i>1 else 0
-                #Add edge (n_in,i)
-                #TODO: Add weight and const
-                graphDict[n_in,i] = (0,0)
-            
-        graph = Graph(graphDict)
-        return graph
+        sources, targets = Graph._gen_forward_peak_edges(n, n, numpy.random.default_rng(seed))
+        return Graph.from_arrays(sources, targets)
+
+    @staticmethod
+    def _gen_forward_peak_edges(n: int, peak: int, rng: numpy.random.Generator) -> Tuple[numpy.ndarray, numpy.ndarray]:
+        """
+        Generates the edges of a random forward DAG with batched numpy calls: every node i < n - 1 gets a uniform
+        number of outgoing edges in [1, min(n - i - 1, peak)] to distinct nodes in the window (i, i + peak], and
+        every node without an incoming edge gets one from a node in the window [i - peak, i).
 
+        Args:
+            n (int): number of nodes
+            peak (int): max number of nodes ahead a node can have an edge to
+            rng (numpy.random.Generator): the random number generator
+
+        Returns:
+            Tuple[numpy.ndarray, numpy.ndarray]: the (sources, targets) arrays of the edges
+        """
+        rows = numpy.arange(max(n - 1, 0), dtype = numpy.int64)
+        # size of the forward window and number of outgoing edges of every node
+        num_forward = numpy.minimum(n - rows - 1, peak)
+        num_outgoing = rng.integers(1, num_forward + 1)
+
+        # choose the outgoing nodes without replacement: give every node in the window a random key and
+        # keep the num_outgoing nodes with the smallest keys
+        window_rows = numpy.repeat(rows, num_forward)
+        window_starts = numpy.cumsum(num_forward) - num_forward
+        window_offsets = numpy.arange(len(window_rows), dtype = numpy.int64) - window_starts[window_rows]
+        order = numpy.lexsort((rng.random(len(window_rows)), window_rows))
+        chosen = order[window_offsets < num_outgoing[window_rows]]
+        sources = window_rows[chosen]
+        targets = sources + 1 + window_offsets[chosen]
+
+        # connect every node without incoming edges (except the first) from a node at most peak nodes before it
+        in_degrees = numpy.bincount(targets, minlength = n)
+        missing = numpy.flatnonzero(in_degrees[1:] == 0) + 1
+        incoming = rng.integers(numpy.maximum(missing - peak, 0), missing)
+
+        return (numpy.concatenate((sources, incoming)), numpy.concatenate((targets, missing)))
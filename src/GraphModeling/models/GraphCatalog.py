@@ -0,0 +1,228 @@
+import os
+from collections import OrderedDict
+from typing import Dict, List, Tuple
+
+from .FrozenWCGraph import FrozenWCGraph
+from .WCGraph import WCGraph
+
+class GraphCatalog:
+    """
+    The GraphCatalog class manages the graphs saved in a directory (by default resources/SavedGraphs, like
+    WCGraph.save_to_json) and makes sure no file is parsed twice:
+
+        + the first time a JSON graph is loaded, a binary snapshot (see WCGraph.save_binary_file) is written
+            next to it. The snapshot stores the modification time and size of the JSON file, and is used instead
+            of the JSON file as long as the JSON file doesn't change.
+        + the last loaded graphs are kept in memory (least recently used are dropped first), so repeated
+            queries on the same graphs don't touch the disk at all.
+
+    The loaded graphs are FrozenWCGraph snapshots, since the same object is returned to every caller. Use
+    thaw() to get a copy that can be modified.
+
+    members:
+        + root (str): the directory of the graph files
+        + max_cached_graphs (int): the maximum number of graphs kept in memory
+    """
+
+    # extensions of the JSON graph files (see WCGraph.get_json_file_name) and of the binary snapshots
+    JSON_EXTENSIONS = (".json", ".json.gz", ".json.xz")
+    SNAPSHOT_EXTENSION = ".snapshot.npz"
+
+    def __init__(self, root: str = "resources/SavedGraphs", max_cached_graphs: int = 16) -> None:
+        """
+        Creates a new catalog of the graphs in the given directory.
+
+        Args:
+            root (str, optional): the directory of the graph files. Defaults to "resources/SavedGraphs".
+            max_cached_graphs (int, optional): the maximum number of graphs kept in memory. Defaults to 16.
+        """
+        self.root: str = root
+        self.max_cached_graphs: int = max_cached_graphs
+        # graph name -> (JSON file signature, graph), in order of use (most recent last)
+        self._cache: OrderedDict[str, Tuple[Tuple[int, int], FrozenWCGraph]] = OrderedDict()
+
+    def load(self, graph_name: str) -> FrozenWCGraph | None:
+        """
+        Loads the graph with the given name: from memory if it was loaded before and its file didn't change,
+        otherwise from its binary snapshot if it is up to date, otherwise from its JSON file (and a new
+        snapshot is written). If no file exists for the name, it returns None.
+
+        Args:
+            graph_name (str): the name of the graph used to save it
+
+        Returns:
+            FrozenWCGraph | None: the graph. Returns None if the file doesn't exist.
+        """
+        filename = self.get_file_name(graph_name)
+        if filename is None:
+            self._cache.pop(graph_name, None)
+            return None
+
+        signature = GraphCatalog._get_signature(filename)
+        cached = self._cache.get(graph_name)
+        if cached is not None and cached[0] == signature:
+            self._cache.move_to_end(graph_name)
+            return cached[1]
+
+        graph = self._load_snapshot(filename, signature)
+        if graph is None:
+            graph = FrozenWCGraph.from_graph(WCGraph.load_json_file(filename))
+            self._save_snapshot(graph, filename, signature)
+
+        self._put(graph_name, signature, graph)
+        return graph
+
+    def save(self, graph: WCGraph, graph_name: str, compression: str | None = None) -> FrozenWCGraph:
+        """
+        Saves the graph as JSON (see WCGraph.save_json_file) in the catalog directory, together with its
+        binary snapshot, and keeps it in memory.
+
+        Args:
+            graph (WCGraph): the graph
+            graph_name (str): the name of the graph
+            compression (str | None, optional): "gzip", "lzma" or None (uncompressed). Defaults to None.
+
+        Returns:
+            FrozenWCGraph: the frozen snapshot of the saved graph (the one returned by load from now on)
+        """
+        frozen = graph.freeze()
+        # remove the files of the graph saved with another compression, so the name stays unique
+        for existing in self._get_existing_files(graph_name):
+            os.remove(existing)
+            if os.path.exists(self.get_snapshot_file_name(existing)):
+                os.remove(self.get_snapshot_file_name(existing))
+
+        os.makedirs(self.root, exist_ok = True)
+        filename = os.path.join(self.root, os.path.basename(WCGraph.get_json_file_name(graph_name, compression)))
+        frozen.save_json_file(filename)
+        signature = GraphCatalog._get_signature(filename)
+        self._save_snapshot(frozen, filename, signature)
+        self._put(graph_name, signature, frozen)
+        return frozen
+
+    def list_graphs(self) -> List[Dict]:
+        """
+        Lists the graphs saved in the catalog directory with their metadata. The metadata is read from the
+        header of the binary snapshots (the snapshots that are missing or out of date are created first).
+
+        Returns:
+            List[Dict]: for each graph (sorted by name): {"name", "file", "num_nodes", "num_edges", "content_hash"}
+        """
+        if not os.path.isdir(self.root):
+            return []
+
+        graphs = []
+        names = sorted({ GraphCatalog._strip_json_extension(file) for file in os.listdir(self.root) if file.endswith(GraphCatalog.JSON_EXTENSIONS) })
+        for name in names:
+            filename = self.get_file_name(name)
+            if self._is_snapshot_valid(filename, GraphCatalog._get_signature(filename)):
+                header = WCGraph.read_binary_header(self.get_snapshot_file_name(filename))
+                num_nodes, num_edges, content_hash = header["num_nodes"], header["num_edges"], header["content_hash"]
+            else:
+                # loading the graph also writes its snapshot for the next listing
+                graph = self.load(name)
+                num_nodes, num_edges, content_hash = len(graph.nodes), len(graph.edge_weights), graph.get_content_hash()
+            graphs.append({ "name": name, "file": filename, "num_nodes": num_nodes, "num_edges": num_edges, "content_hash": content_hash })
+        return graphs
+
+    def clear_cache(self) -> None:
+        """Drops every graph kept in memory (the snapshot files are kept)."""
+        self._cache.clear()
+
+    def get_file_name(self, graph_name: str) -> str | None:
+        """
+        Returns the path of the JSON file of the graph with the given name (uncompressed, gzip or lzma).
+
+        Args:
+            graph_name (str): the name of the graph
+
+        Returns:
+            str | None: the path of the file, None if the graph has no file
+        """
+        existing = self._get_existing_files(graph_name)
+        return existing[0] if existing else None
+
+    def get_snapshot_file_name(self, filename: str) -> str:
+        """
+        Returns the path of the binary snapshot of a JSON graph file (in the same directory).
+
+        Args:
+            filename (str): the path of the JSON file
+
+        Returns:
+            str: the path of the snapshot
+        """
+        return GraphCatalog._strip_json_extension(filename) + GraphCatalog.SNAPSHOT_EXTENSION
+
+    def _get_existing_files(self, graph_name: str) -> List[str]:
+        """Returns the paths of the existing JSON files of the graph with the given name."""
+        base = os.path.join(self.root, "".join(graph_name.split(" ")))
+        return [base + extension for extension in GraphCatalog.JSON_EXTENSIONS if os.path.exists(base + extension)]
+
+    def _load_snapshot(self, filename: str, signature: Tuple[int, int]) -> FrozenWCGraph | None:
+        """
+        Loads the binary snapshot of a JSON graph file if it is up to date.
+
+        Args:
+            filename (str): the path of the JSON file
+            signature (Tuple[int, int]): the current (modification time, size) of the JSON file
+
+        Returns:
+            FrozenWCGraph | None: the graph, None if the snapshot is missing or out of date
+        """
+        if not self._is_snapshot_valid(filename, signature):
+            return None
+        # the snapshot was saved from a frozen graph, so its columns are mapped as they are, without a copy
+        return FrozenWCGraph.load_binary_file(self.get_snapshot_file_name(filename), memory_map = True)
+
+    def _is_snapshot_valid(self, filename: str, signature: Tuple[int, int]) -> bool:
+        """Returns true if the snapshot of the JSON file exists and was made from the file with the given signature."""
+        snapshot_filename = self.get_snapshot_file_name(filename)
+        if not os.path.exists(snapshot_filename):
+            return False
+        try:
+            header = WCGraph.read_binary_header(snapshot_filename)
+        except (ValueError, OSError):
+            return False
+        return header.get("metadata", {}).get("source_signature") == list(signature)
+
+    def _save_snapshot(self, graph: WCGraph, filename: str, signature: Tuple[int, int]) -> None:
+        """
+        Writes the binary snapshot of a JSON graph file. The snapshot is only an optimization, so it is
+        skipped if the directory can't be written.
+
+        Args:
+            graph (WCGraph): the graph loaded from the file
+            filename (str): the path of the JSON file
+            signature (Tuple[int, int]): the (modification time, size) of the JSON file
+        """
+        snapshot_filename = self.get_snapshot_file_name(filename)
+        temporary_filename = f"{snapshot_filename}.{os.getpid()}.tmp"
+        try:
+            # write to a temporary file first, so other processes never read a partial snapshot
+            graph.save_binary_file(temporary_filename, { "source_signature": list(signature) })
+            os.replace(temporary_filename, snapshot_filename)
+        except OSError:
+            if os.path.exists(temporary_filename):
+                os.remove(temporary_filename)
+
+    def _put(self, graph_name: str, signature: Tuple[int, int], graph: FrozenWCGraph) -> None:
+        """Keeps the graph in memory, dropping the least recently used graphs over max_cached_graphs."""
+        self._cache[graph_name] = (signature, graph)
+        self._cache.move_to_end(graph_name)
+        while len(self._cache) > self.max_cached_graphs:
+            self._cache.popitem(last = False)
+
+    @staticmethod
+    def _get_signature(filename: str) -> Tuple[int, int]:
+        """Returns the (modification time in ns, size) of the file, which changes whenever the file is rewritten."""
+        status = os.stat(filename)
+        return (status.st_mtime_ns, status.st_size)
+
+    @staticmethod
+    def _strip_json_extension(filename: str) -> str:
+        """Returns the file name without its JSON extension (.json, .json.gz or .json.xz)."""
+        for extension in sorted(GraphCatalog.JSON_EXTENSIONS, key = len, reverse = True):
+            if filename.endswith(extension):
+                return filename[:-len(extension)]
+        return filename
@@ -0,0 +1,308 @@
+import itertools
+import json
+import numpy
+
+from typing import IO, Dict, Iterator, List, Tuple
+
+from .WCGraph import WCGraph
+
+class GraphFormats:
+    """
+    The GraphFormats class reads and writes weight-constrained graphs in the standard benchmark formats:
+
+        + OR-Library rcsp (Beasley and Christofides): the resource constrained shortest path instances,
+            the first resource is used as the weight and the arc cost as the cost
+        + DIMACS shortest path (.gr): a pair of files with the same arcs, one with the weights
+            (e.g. travel times) and one with the costs (e.g. distances), like the 9th DIMACS challenge road networks
+        + networkx node-link JSON: every link has a "weight_cost" attribute [weight, cost], as read by
+            networkx.node_link_graph in the Lagrangian relaxation benchmark harness (evaluate_graphs in src/main.py)
+
+    The loaders read the files in chunks of lines and parse them with numpy, then build the graph with
+    WCGraph.from_arrays. Files compressed with gzip or lzma are read directly (see WCGraph.open_graph_file).
+    Parallel arcs are allowed by the formats, not by WCGraph: the dominated ones are dropped, the lowest weight
+    efficient one is kept as the edge, and every other efficient one goes through a new dummy node (numbered
+    after the largest node of the file) with a (0, 0) second edge, like GraphReducer.reduce_series_parallel.
+    Removing the dummy nodes from a path gives the path of the file, with the same weight and cost.
+    """
+
+    # number of lines parsed at once by the streaming loaders and written at once by the writers
+    CHUNK_SIZE = 65536
+
+    @staticmethod
+    def load_rcsp_file(filename: str, resource: int = 0) -> Tuple[WCGraph, Dict[str, int]]:
+        """
+        Loads an OR-Library rcsp instance. The file holds, separated by whitespace: the number of vertices n,
+        of arcs m and of resources K, the K lower and K upper resource limits, the K resources consumed at each
+        vertex, and for each arc its start and end vertex, its cost and the K resources it consumes. The path
+        goes from vertex 1 to vertex n.
+
+        The file is parsed in chunks of lines, but all its values are kept until the end, since the arcs section
+        only starts after the vertex sections, whose length is known from the header.
+
+        The resource consumed at a vertex is added to the weight of the arcs leaving it, and the resource of
+        the last vertex (n) is subtracted from the limits, so the weight of every path from 1 to n is unchanged.
+
+        Args:
+            filename (str): the path of the file
+            resource (int, optional): the resource used as the weight. Defaults to 0.
+
+        Raises:
+            ValueError: if the file ends before all the values of its sections were read
+
+        Returns:
+            Tuple[WCGraph, Dict[str, int]]: the graph and the problem: {"source", "destination", "min_weight", "max_weight"}
+        """
+        with WCGraph.open_graph_file(filename, "rb") as file:
+            values = numpy.concatenate(list(GraphFormats._iter_values(file)) or [numpy.empty(0)])
+
+        # split the values into the sections of the file
+        num_nodes, num_edges, num_resources = (int(value) for value in values[:3])
+        sections = numpy.cumsum([3, num_resources, num_resources, num_nodes * num_resources, num_edges * (3 + num_resources)])
+        if len(values) < sections[-1]:
+            raise ValueError(f"{filename} ended {sections[-1] - len(values)} values early")
+        lower_limits, upper_limits, node_resources, edges = (values[start:end] for start, end in zip(sections[:-1], sections[1:]))
+        node_resources = node_resources.reshape(num_nodes, num_resources)
+        edges = edges.reshape(num_edges, 3 + num_resources)
+
+        sources = edges[:, 0].astype(numpy.int64)
+        targets = edges[:, 1].astype(numpy.int64)
+        weights = GraphFormats._as_integers(edges[:, 3 + resource] + node_resources[sources - 1, resource])
+        costs = GraphFormats._as_integers(edges[:, 2])
+        problem = {
+            "source": 1,
+            "destination": num_nodes,
+            "min_weight": GraphFormats._as_integers(lower_limits[resource] - node_resources[num_nodes - 1, resource]).item(),
+            "max_weight": GraphFormats._as_integers(upper_limits[resource] - node_resources[num_nodes - 1, resource]).item(),
+        }
+        return (GraphFormats._build_graph(sources, targets, weights, costs), problem)
+
+    @staticmethod
+    def save_rcsp_file(graph: WCGraph, filename: str, source_node: int, destination_node: int, max_weight: int,
+                       min_weight: int = 0) -> numpy.ndarray:
+        """
+        Saves the graph as an OR-Library rcsp instance with one resource (the weight). The format requires
+        the path to go from vertex 1 to vertex n, so the nodes are renumbered: the source node becomes 1,
+        the destination node n, and the other nodes keep their order in between.
+
+        Args:
+            graph (WCGraph): the graph
+            filename (str): the path of the file (compressed if it ends with .gz or .xz)
+            source_node (int): the origin node of the path
+            destination_node (int): the destination node of the path
+            max_weight (int): the upper limit of the weight of the path
+            min_weight (int, optional): the lower limit of the weight of the path. Defaults to 0.
+
+        Returns:
+            numpy.ndarray: the original identifier of each vertex of the file (vertex i is at position i - 1)
+        """
+        source_index = graph.get_node_index(source_node)
+        destination_index = graph.get_node_index(destination_node)
+        others = numpy.setdiff1d(numpy.arange(len(graph.nodes)), [source_index, destination_index])
+        order = numpy.concatenate(([source_index], others, [destination_index]))
+        vertex_of_index = numpy.empty(len(order), dtype = numpy.int64)
+        vertex_of_index[order] = numpy.arange(1, len(order) + 1)
+
+        num_nodes = len(graph.nodes)
+        with WCGraph.open_graph_file(filename, "wb") as file:
+            file.write(f"{num_nodes} {len(graph.edge_weights)} 1\n{min_weight}\n{max_weight}\n".encode())
+            GraphFormats._write_rows(file, numpy.zeros((num_nodes, 1), dtype = numpy.int64))
+            GraphFormats._write_rows(file, numpy.column_stack((vertex_of_index[graph._edge_sources], vertex_of_index[graph._edge_targets],
+                                                               graph.edge_costs, graph.edge_weights)))
+        return graph._node_array[order]
+
+    @staticmethod
+    def load_dimacs_files(weight_filename: str, cost_filename: str) -> WCGraph:
+        """
+        Loads a graph from a pair of DIMACS shortest path (.gr) files with the same arcs in the same order,
+        e.g. the travel time (weight) and distance (cost) graphs of a 9th DIMACS challenge road network.
+        Every arc line is "a from to value", the other lines (comments "c", problem line "p sp n m") are skipped.
+
+        Args:
+            weight_filename (str): the path of the file with the weights
+            cost_filename (str): the path of the file with the costs
+
+        Raises:
+            ValueError: if the arcs of the two files don't match
+
+        Returns:
+            WCGraph: the graph
+        """
+        columns: List[List[numpy.ndarray]] = [[], [], [], []]
+        with WCGraph.open_graph_file(weight_filename, "rb") as weight_file, WCGraph.open_graph_file(cost_filename, "rb") as cost_file:
+            for weight_arcs, cost_arcs in itertools.zip_longest(GraphFormats._iter_dimacs_arcs(weight_file), GraphFormats._iter_dimacs_arcs(cost_file)):
+                if weight_arcs is None or cost_arcs is None or not numpy.array_equal(weight_arcs[:, :2], cost_arcs[:, :2]):
+                    raise ValueError(f"the arcs of {weight_filename} and {cost_filename} don't match")
+                for column, values in zip(columns, (weight_arcs[:, 0], weight_arcs[:, 1], weight_arcs[:, 2], cost_arcs[:, 2])):
+                    column.append(values)
+
+        sources, targets, weights, costs = (numpy.concatenate(column) if column else numpy.empty(0, dtype = numpy.int64) for column in columns)
+        return GraphFormats._build_graph(sources, targets, weights, costs)
+
+    @staticmethod
+    def save_dimacs_files(graph: WCGraph, weight_filename: str, cost_filename: str) -> numpy.ndarray:
+        """
+        Saves the graph as a pair of DIMACS shortest path (.gr) files, one with the weights and one with the
+        costs. The format numbers the nodes from 1 to n, so node nodes[i] is written as i + 1.
+
+        Args:
+            graph (WCGraph): the graph
+            weight_filename (str): the path of the file with the weights (compressed if it ends with .gz or .xz)
+            cost_filename (str): the path of the file with the costs (compressed if it ends with .gz or .xz)
+
+        Returns:
+            numpy.ndarray: the original identifier of each node of the files (node i is at position i - 1)
+        """
+        for filename, values, name in ((weight_filename, graph.edge_weights, "weight"), (cost_filename, graph.edge_costs, "cost")):
+            with WCGraph.open_graph_file(filename, "wb") as file:
+                file.write(f"c {name} of each arc\np sp {len(graph.nodes)} {len(values)}\n".encode())
+                GraphFormats._write_rows(file, numpy.column_stack((graph._edge_sources + 1, graph._edge_targets + 1, values)), "a ")
+        return graph._node_array.copy()
+
+    @staticmethod
+    def load_node_link_file(filename: str, attribute: str = "weight_cost") -> WCGraph:
+        """
+        Loads a graph from a networkx node-link JSON file (networkx.node_link_data). The weight and cost of
+        each link are read from its attribute [weight, cost] (or from separate "weight" and "cost" attributes).
+
+        Args:
+            filename (str): the path of the file
+            attribute (str, optional): the link attribute with the [weight, cost] pair. Defaults to "weight_cost".
+
+        Returns:
+            WCGraph: the graph
+        """
+        with WCGraph.open_graph_file(filename, "rb") as file:
+            json_obj = json.load(file)
+        links = json_obj["links"] if "links" in json_obj else json_obj["edges"]
+
+        sources = numpy.array([link["source"] for link in links], dtype = numpy.int64)
+        targets = numpy.array([link["target"] for link in links], dtype = numpy.int64)
+        if links and attribute in links[0]:
+            weights_costs = numpy.array([link[attribute] for link in links]).reshape(-1, 2)
+        else:
+            weights_costs = numpy.array([(link["weight"], link["cost"]) for link in links]).reshape(-1, 2)
+        return GraphFormats._build_graph(sources, targets, weights_costs[:, 0], weights_costs[:, 1])
+
+    @staticmethod
+    def save_node_link_file(graph: WCGraph, filename: str, attribute: str = "weight_cost") -> None:
+        """
+        Saves the graph as networkx node-link JSON, with the [weight, cost] of each link in the given attribute,
+        e.g. the ./graphs/wc_graph_{n}.json files read by the Lagrangian relaxation benchmark harness
+        (evaluate_graphs in src/main.py). The links are written in chunks.
+
+        Args:
+            graph (WCGraph): the graph
+            filename (str): the path of the file (compressed if it ends with .gz or .xz)
+            attribute (str, optional): the link attribute with the [weight, cost] pair. Defaults to "weight_cost".
+        """
+        columns = graph.get_canonical_edge_columns()
+        with WCGraph.open_graph_file(filename, "wb") as file:
+            file.write(b'{"directed": true, "multigraph": false, "graph": {}, "nodes": [')
+            file.write(", ".join(f'{{"id": {node}}}' for node in graph.nodes).encode())
+            file.write(b'], "links": [')
+            for start in range(0, len(columns["src"]), GraphFormats.CHUNK_SIZE):
+                chunk = zip(*(columns[name][start:start + GraphFormats.CHUNK_SIZE].tolist() for name in ("src", "dst", "edge_weights", "edge_costs")))
+                links = (f'{{"{attribute}": [{weight}, {cost}], "source": {source}, "target": {target}}}' for source, target, weight, cost in chunk)
+                file.write(((", " if start > 0 else "") + ", ".join(links)).encode())
+            file.write(b"]}")
+
+    @staticmethod
+    def _build_graph(sources: numpy.ndarray, targets: numpy.ndarray, weights: numpy.ndarray, costs: numpy.ndarray) -> WCGraph:
+        """
+        Builds the graph from the edge columns. Of the parallel arcs, only the Pareto-efficient ones are kept:
+        the one with the lowest weight is the edge, the others are split through a new dummy node each.
+
+        Args:
+            sources (numpy.ndarray): the origin node of each edge
+            targets (numpy.ndarray): the destination node of each edge
+            weights (numpy.ndarray): the weight of each edge
+            costs (numpy.ndarray): the cost of each edge
+
+        Returns:
+            WCGraph: the graph
+        """
+        order = numpy.lexsort((costs, weights, targets, sources))
+        sources, targets, weights, costs = sources[order], targets[order], weights[order], costs[order]
+        # the first arc of every (from, to) group is the lowest one
+        first = numpy.ones(len(sources), dtype = bool)
+        first[1:] = (sources[1:] != sources[:-1]) | (targets[1:] != targets[:-1])
+        if numpy.all(first):
+            return WCGraph.from_arrays(sources, targets, weights, costs)
+
+        # an arc after the first of its group is efficient if it is cheaper than every arc with a lower (or the same) weight
+        efficient = first.copy()
+        lowest_cost = None
+        for position in numpy.flatnonzero(~first | numpy.append(~first[1:], False)).tolist():
+            if first[position] or costs[position] < lowest_cost:
+                efficient[position] = True
+                lowest_cost = costs[position]
+        dummy = numpy.flatnonzero(efficient & ~first)
+        dummy_nodes = numpy.arange(len(dummy)) + max(sources.max(), targets.max()) + 1
+
+        return WCGraph.from_arrays(numpy.concatenate((sources[first], sources[dummy], dummy_nodes)),
+                                   numpy.concatenate((targets[first], dummy_nodes, targets[dummy])),
+                                   numpy.concatenate((weights[first], weights[dummy], numpy.zeros(len(dummy), dtype = weights.dtype))),
+                                   numpy.concatenate((costs[first], costs[dummy], numpy.zeros(len(dummy), dtype = costs.dtype))))
+
+    @staticmethod
+    def _iter_dimacs_arcs(file: IO[bytes]) -> Iterator[numpy.ndarray]:
+        """
+        Parses the arc lines ("a from to value") of a DIMACS file in chunks of CHUNK_SIZE arcs (the last one
+        may be smaller), so the chunks of two files with the same arcs line up even if their other lines differ.
+
+        Args:
+            file (IO[bytes]): the opened file
+
+        Yields:
+            numpy.ndarray: the (from, to, value) rows of a chunk of arcs
+        """
+        pending = numpy.empty((0, 3))
+        while True:
+            lines = list(itertools.islice(file, GraphFormats.CHUNK_SIZE))
+            arcs = b" ".join(line[1:] for line in lines if line.startswith(b"a"))
+            if arcs:
+                pending = numpy.concatenate((pending, numpy.array(arcs.split()).astype(numpy.float64).reshape(-1, 3)))
+            while len(pending) >= GraphFormats.CHUNK_SIZE or (not lines and len(pending) > 0):
+                yield GraphFormats._as_integers(pending[:GraphFormats.CHUNK_SIZE])
+                pending = pending[GraphFormats.CHUNK_SIZE:]
+            if not lines:
+                return
+
+    @staticmethod
+    def _iter_values(file: IO[bytes]) -> Iterator[numpy.ndarray]:
+        """
+        Parses a file of whitespace separated numbers in chunks of lines.
+
+        Args:
+            file (IO[bytes]): the opened file
+
+        Yields:
+            numpy.ndarray: the values of a chunk of lines
+        """
+        while True:
+            lines = list(itertools.islice(file, GraphFormats.CHUNK_SIZE))
+            if not lines:
+                return
+            yield numpy.array(b" ".join(lines).split()).astype(numpy.float64)
+
+    @staticmethod
+    def _as_integers(values: numpy.ndarray) -> numpy.ndarray:
+        """Returns the values as int64 if they are all whole numbers, unchanged otherwise."""
+        values = numpy.asarray(values)
+        if values.dtype.kind == "f" and numpy.all(numpy.isfinite(values)) and numpy.all(values == numpy.floor(values)):
+            return values.astype(numpy.int64)
+        return values
+
+    @staticmethod
+    def _write_rows(file: IO[bytes], rows: numpy.ndarray, prefix: str = "") -> None:
+        """
+        Writes the rows of a 2D array as lines of space separated values, in chunks.
+
+        Args:
+            file (IO[bytes]): the opened file
+            rows (numpy.ndarray): the rows
+            prefix (str, optional): text written at the start of every line. Defaults to "".
+        """
+        for start in range(0, len(rows), GraphFormats.CHUNK_SIZE):
+            lines = (prefix + " ".join(map(str, row)) for row in rows[start:start + GraphFormats.CHUNK_SIZE].tolist())
+            file.write(("\n".join(lines) + "\n").encode())
@@ -0,0 +1,204 @@
+from typing import Tuple
+import numpy
+from scipy import spatial
+
+from .WCGraph import WCGraph
+
+class GraphGenerator:
+    """
+    The GraphGenerator class generates large weight-constrained graphs of different topologies for
+    scaling tests. Every generator builds the edge arrays with vectorized numpy operations and creates
+    the WCGraph directly from the arrays, so graphs with 10^5 - 10^6 nodes take seconds.
+
+    The weights and costs of the edges can be:
+        + "correlated": the cost grows with the weight
+        + "uncorrelated": the cost and weight are independent
+        + "anti-correlated": the cost shrinks when the weight grows (the hardest case for label setting,
+            since many labels are efficient)
+    """
+
+    CORRELATIONS = ("correlated", "uncorrelated", "anti-correlated")
+
+    @staticmethod
+    def get_grid_graph(rows: int, columns: int, correlation: str = "uncorrelated", min_value: int = 1, max_value: int = 100,
+                       seed: int | numpy.random.Generator | None = None) -> WCGraph:
+        """
+        Generates a 2D grid graph with edges in both directions between horizontally and vertically
+        adjacent nodes. Node r * columns + c is the node in row r and column c.
+
+        Args:
+            rows (int): number of rows in the grid
+            columns (int): number of columns in the grid
+            correlation (str, optional): correlation of the weights and costs. Defaults to "uncorrelated".
+            min_value (int, optional): minimum weight and cost. Defaults to 1.
+            max_value (int, optional): maximum weight and cost. Defaults to 100.
+            seed (int | numpy.random.Generator | None, optional): seed (or generator) of the random numbers. Defaults to None.
+
+        Returns:
+            WCGraph: the grid graph
+        """
+        rng = numpy.random.default_rng(seed)
+        nodes = numpy.arange(rows * columns, dtype = numpy.int64).reshape(rows, columns)
+
+        # horizontal and vertical neighbor pairs
+        horizontal = (nodes[:, :-1].ravel(), nodes[:, 1:].ravel())
+        vertical = (nodes[:-1, :].ravel(), nodes[1:, :].ravel())
+        sources = numpy.concatenate((horizontal[0], vertical[0], horizontal[1], vertical[1]))
+        targets = numpy.concatenate((horizontal[1], vertical[1], horizontal[0], vertical[0]))
+
+        weights, costs = GraphGenerator.get_weights_costs(len(sources), correlation, min_value, max_value, rng)
+        return WCGraph.from_arrays(sources, targets, weights, costs)
+
+    @staticmethod
+    def get_layered_graph(num_layers: int, width: int, degree: int = 3, correlation: str = "uncorrelated", min_value: int = 1,
+                          max_value: int = 100, seed: int | numpy.random.Generator | None = None) -> WCGraph:
+        """
+        Generates a layered DAG: a source node (0), num_layers layers of width nodes and a sink node
+        (num_layers * width + 1). The source connects to every node of the first layer, every node of the
+        last layer connects to the sink, and every other node has up to degree edges to random nodes of the
+        next layer. Every node of a layer has at least one incoming edge.
+
+        Args:
+            num_layers (int): number of layers between the source and the sink
+            width (int): number of nodes in each layer
+            degree (int, optional): number of edges from a node to the next layer. Defaults to 3.
+            correlation (str, optional): correlation of the weights and costs. Defaults to "uncorrelated".
+            min_value (int, optional): minimum weight and cost. Defaults to 1.
+            max_value (int, optional): maximum weight and cost. Defaults to 100.
+            seed (int | numpy.random.Generator | None, optional): seed (or generator) of the random numbers. Defaults to None.
+
+        Raises:
+            ValueError: if num_layers or width is smaller than 1
+
+        Returns:
+            WCGraph: the layered graph
+        """
+        if num_layers < 1 or width < 1:
+            raise ValueError(f"a layered graph needs at least one layer of one node, got num_layers = {num_layers} and width = {width}")
+
+        rng = numpy.random.default_rng(seed)
+        sink = num_layers * width + 1
+        layer_nodes = numpy.arange(1, sink, dtype = numpy.int64)
+        inner_nodes = layer_nodes[:(num_layers - 1) * width]
+
+        # random edges to the next layer (duplicates are removed below)
+        random_sources = numpy.repeat(inner_nodes, degree)
+        next_layer_start = ((random_sources - 1) // width + 1) * width + 1
+        random_targets = next_layer_start + rng.integers(0, width, len(random_sources))
+
+        # one guaranteed incoming edge for every node after the first layer
+        covered_targets = layer_nodes[width:]
+        covered_sources = ((covered_targets - 1) // width - 1) * width + 1 + rng.integers(0, width, len(covered_targets))
+
+        sources = numpy.concatenate((numpy.zeros(width, dtype = numpy.int64), random_sources, covered_sources, layer_nodes[-width:]))
+        targets = numpy.concatenate((layer_nodes[:width], random_targets, covered_targets, numpy.full(width, sink)))
+        sources, targets = GraphGenerator._remove_duplicate_edges(sources, targets)
+
+        weights, costs = GraphGenerator.get_weights_costs(len(sources), correlation, min_value, max_value, rng)
+        return WCGraph.from_arrays(sources, targets, weights, costs)
+
+    @staticmethod
+    def get_road_graph(num_nodes: int, num_neighbors: int = 3, correlation: str = "correlated", min_value: int = 1, max_value: int = 100,
+                       seed: int | numpy.random.Generator | None = None) -> WCGraph:
+        """
+        Generates a sparse geometric ("road-like") graph: the nodes are random points in the unit square,
+        and every node has edges in both directions to its num_neighbors nearest points. The weight of an
+        edge is proportional to its length (scaled to [min_value, max_value]) and the cost is drawn from the
+        weight with the given correlation.
+
+        Args:
+            num_nodes (int): number of nodes
+            num_neighbors (int, optional): number of nearest neighbors each node is connected to. Defaults to 3.
+            correlation (str, optional): correlation of the weights and costs. Defaults to "correlated".
+            min_value (int, optional): minimum weight and cost. Defaults to 1.
+            max_value (int, optional): maximum weight and cost. Defaults to 100.
+            seed (int | numpy.random.Generator | None, optional): seed (or generator) of the random numbers. Defaults to None.
+
+        Returns:
+            WCGraph: the road-like graph
+        """
+        rng = numpy.random.default_rng(seed)
+        points = rng.random((num_nodes, 2))
+
+        # the first neighbor returned by the tree is the point itself
+        distances, neighbors = spatial.cKDTree(points).query(points, k = num_neighbors + 1)
+        sources = numpy.repeat(numpy.arange(num_nodes, dtype = numpy.int64), num_neighbors)
+        targets = neighbors[:, 1:].ravel().astype(numpy.int64)
+        lengths = distances[:, 1:].ravel()
+
+        # add the reverse direction of every edge, then drop the duplicates (mutual nearest neighbors)
+        sources, targets, lengths = numpy.concatenate((sources, targets)), numpy.concatenate((targets, sources)), numpy.concatenate((lengths, lengths))
+        _, unique_positions = numpy.unique(sources * num_nodes + targets, return_index = True)
+        sources, targets, lengths = sources[unique_positions], targets[unique_positions], lengths[unique_positions]
+
+        weights = numpy.rint(min_value + (max_value - min_value) * lengths / max(lengths.max(initial = 0), 1e-12)).astype(numpy.int64)
+        costs = GraphGenerator.get_correlated_costs(weights, correlation, min_value, max_value, rng)
+        return WCGraph.from_arrays(sources, targets, weights, costs)
+
+    @staticmethod
+    def get_weights_costs(size: int, correlation: str = "uncorrelated", min_value: int = 1, max_value: int = 100,
+                          rng: numpy.random.Generator | None = None) -> Tuple[numpy.ndarray, numpy.ndarray]:
+        """
+        Generates uniform random weights in [min_value, max_value] and the corresponding costs with the given correlation.
+
+        Args:
+            size (int): number of weight-cost pairs
+            correlation (str, optional): correlation of the weights and costs. Defaults to "uncorrelated".
+            min_value (int, optional): minimum weight and cost. Defaults to 1.
+            max_value (int, optional): maximum weight and cost. Defaults to 100.
+            rng (numpy.random.Generator | None, optional): the random number generator. Defaults to None.
+
+        Returns:
+            Tuple[numpy.ndarray, numpy.ndarray]: integer arrays of the weights and costs
+        """
+        rng = numpy.random.default_rng(rng)
+        weights = rng.integers(min_value, max_value + 1, size)
+        return (weights, GraphGenerator.get_correlated_costs(weights, correlation, min_value, max_value, rng))
+
+    @staticmethod
+    def get_correlated_costs(weights: numpy.ndarray, correlation: str, min_value: int, max_value: int,
+                             rng: numpy.random.Generator) -> numpy.ndarray:
+        """
+        Generates a cost for every weight: the weight (correlated) or its mirror in [min_value, max_value]
+        (anti-correlated) plus uniform noise of 10% of the range, or an independent uniform value (uncorrelated).
+
+        Args:
+            weights (numpy.ndarray): the weights
+            correlation (str): "correlated", "uncorrelated" or "anti-correlated"
+            min_value (int): minimum cost
+            max_value (int): maximum cost
+            rng (numpy.random.Generator): the random number generator
+
+        Raises:
+            ValueError: if the correlation is unknown
+
+        Returns:
+            numpy.ndarray: integer array of the costs
+        """
+        if correlation not in GraphGenerator.CORRELATIONS:
+            raise ValueError(f"unknown correlation '{correlation}', expected one of {GraphGenerator.CORRELATIONS}")
+
+        if correlation == "uncorrelated":
+            return rng.integers(min_value, max_value + 1, len(weights))
+
+        base = weights if correlation == "correlated" else min_value + max_value - weights
+        spread = max((max_value - min_value) // 10, 1)
+        noise = rng.integers(-spread, spread + 1, len(weights))
+        return numpy.clip(base + noise, min_value, max_value).astype(numpy.int64)
+
+    @staticmethod
+    def _remove_duplicate_edges(sources: numpy.ndarray, targets: numpy.ndarray) -> Tuple[numpy.ndarray, numpy.ndarray]:
+        """
+        Removes duplicate (from, to) pairs, keeping the first occurrence.
+
+        Args:
+            sources (numpy.ndarray): the origin node of each edge
+            targets (numpy.ndarray): the destination node of each edge
+
+        Returns:
+            Tuple[numpy.ndarray, numpy.ndarray]: the unique (sources, targets)
+        """
+        num_nodes = max(sources.max(initial = 0), targets.max(initial = 0)) + 1
+        _, unique_positions = numpy.unique(sources * num_nodes + targets, return_index = True)
+        unique_positions.sort()
+        return (sources[unique_positions], targets[unique_positions])
@@ -0,0 +1,232 @@
+import hashlib
+import networkx
+import numpy
+from collections import OrderedDict
+from matplotlib import image
+from matplotlib.axes import Axes
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.collections import LineCollection
+from matplotlib.figure import Figure
+
+from typing import Any, Dict, List, Tuple
+
+class GraphRenderer:
+    """
+    The GraphRenderer class draws graphs without a display (print_graph(headless = True)), e.g. to render
+    many images in a batch job:
+
+        + the node positions are computed once per graph content (see Graph.get_content_hash) and layout, and cached
+        + every edge is drawn by one LineCollection instead of one artist per edge
+        + past MAX_DRAWN_EDGES edges, a fixed sample of the edges is drawn; node and edge labels are only drawn
+            up to MAX_LABELED_NODES nodes and MAX_EDGE_LABELS edges
+        + the drawing of the graph (base image) is cached, and the highlighted edges are drawn on top of a copy of it,
+            so rendering the same graph with different highlighted paths only draws the paths
+
+    Both caches keep the MAX_CACHED_GRAPHS most recently used graphs.
+    """
+
+    MAX_DRAWN_EDGES = 20000
+    MAX_LABELED_NODES = 200
+    MAX_EDGE_LABELS = 500
+    MAX_CACHED_GRAPHS = 8
+
+    # (content hash, layout) -> node positions aligned with nodes
+    _layouts: "OrderedDict[Tuple[str, str], numpy.ndarray]" = OrderedDict()
+    # (content hash, layout, digest of the edge labels and node order, options) -> (figure, axes, background of the drawn graph)
+    _base_images: "OrderedDict[Tuple, Tuple[Figure, Axes, Any]]" = OrderedDict()
+
+    @staticmethod
+    def render(graph: Any, picture_name: str = "", edge_labels: Dict[Tuple[int, int], str] | None = None, show_minimal_output: bool = False,
+               highlight_edges: List[Tuple[int, int]] | None = None, layout: str = "circular", size: Tuple[float, float] = (8, 8),
+               dpi: int = 100) -> numpy.ndarray:
+        """
+        Renders the graph to an image, without opening a window.
+
+        Args:
+            graph (Graph): the graph
+            picture_name (str, optional): The name to save the graph image as (.png is added if it has no extension). Defaults to "".
+            edge_labels (Dict[Tuple[int, int], str] | None, optional): The dictionary of edges to labels. Defaults to None.
+            show_minimal_output (bool, optional): Supresses node and edge labels and arrows. Defaults to False.
+            highlight_edges (List[Tuple[int, int]] | None, optional): the edges drawn on top of the graph. Defaults to None.
+            layout (str, optional): "circular" or "spring". Defaults to "circular".
+            size (Tuple[float, float], optional): the size of the image in inches. Defaults to (8, 8).
+            dpi (int, optional): the resolution of the image. Defaults to 100.
+
+        Returns:
+            numpy.ndarray: the RGBA image (height x width x 4)
+        """
+        figure, axes, background = GraphRenderer._get_base_image(graph, edge_labels, show_minimal_output, layout, size, dpi)
+        canvas = figure.canvas
+        canvas.restore_region(background)
+
+        if highlight_edges:
+            positions = GraphRenderer.get_layout(graph, layout)
+            indices = graph.get_node_indices(numpy.asarray(highlight_edges).ravel()).reshape(-1, 2)
+            overlay = LineCollection(positions[indices], linewidths = 4 if show_minimal_output else 8, colors = "tab:red", alpha = 0.5)
+            axes.add_collection(overlay, autolim = False)
+            axes.draw_artist(overlay)
+            overlay.remove()
+
+        picture = numpy.asarray(canvas.buffer_rgba()).copy()
+        if picture_name != "":
+            image.imsave(picture_name if "." in picture_name.rsplit("/", 1)[-1] else f"{picture_name}.png", picture)
+        return picture
+
+    @staticmethod
+    def get_layout(graph: Any, layout: str = "circular") -> numpy.ndarray:
+        """
+        Returns the position of every node, computed once per graph content and layout.
+
+        Args:
+            graph (Graph): the graph
+            layout (str, optional): "circular" (the nodes on a circle, in order) or "spring" (networkx.spring_layout). Defaults to "circular".
+
+        Raises:
+            ValueError: if the layout is unknown
+
+        Returns:
+            numpy.ndarray: the (x, y) position of each node, aligned with nodes
+        """
+        key = (graph.get_content_hash(), layout)
+        positions = GraphRenderer._layouts.get(key)
+        if positions is None:
+            positions = GraphRenderer._gen_layout(graph, layout)
+            GraphRenderer._put(GraphRenderer._layouts, key, positions)
+        else:
+            GraphRenderer._layouts.move_to_end(key)
+
+        # the cached positions follow the sorted node identifiers, which don't depend on the dense indices (see Graph.reorder_nodes)
+        return positions[numpy.searchsorted(numpy.sort(graph._node_array), graph._node_array)]
+
+    @staticmethod
+    def clear_cache() -> None:
+        """Drops every cached layout and base image."""
+        GraphRenderer._layouts.clear()
+        GraphRenderer._base_images.clear()
+
+    @staticmethod
+    def _gen_layout(graph: Any, layout: str) -> numpy.ndarray:
+        """
+        Computes the position of every node.
+
+        Args:
+            graph (Graph): the graph
+            layout (str): "circular" or "spring"
+
+        Raises:
+            ValueError: if the layout is unknown
+
+        Returns:
+            numpy.ndarray: the (x, y) position of each node, in increasing order of node identifier
+        """
+        num_nodes = len(graph.nodes)
+        if layout == "circular":
+            # same positions as networkx.circular_layout, without building the networkx graph
+            angles = 2 * numpy.pi * numpy.arange(num_nodes) / max(num_nodes, 1)
+            return numpy.column_stack((numpy.cos(angles), numpy.sin(angles)))
+        if layout == "spring":
+            positions = networkx.spring_layout(graph.networkx_graph, seed = 0)
+            return numpy.array([positions[node] for node in sorted(graph.nodes)]).reshape(-1, 2)
+        raise ValueError(f"unknown layout '{layout}', expected 'circular' or 'spring'")
+
+    @staticmethod
+    def _get_base_image(graph: Any, edge_labels: Dict[Tuple[int, int], str] | None, show_minimal_output: bool, layout: str,
+                        size: Tuple[float, float], dpi: int) -> Tuple[Figure, Axes, Any]:
+        """
+        Returns the figure with the graph drawn on it and a copy of its pixels, drawing it the first time.
+
+        Args:
+            graph (Graph): the graph
+            edge_labels (Dict[Tuple[int, int], str] | None): The dictionary of edges to labels
+            show_minimal_output (bool): Supresses node and edge labels and arrows
+            layout (str): the name of the layout
+            size (Tuple[float, float]): the size of the image in inches
+            dpi (int): the resolution of the image
+
+        Returns:
+            Tuple[Figure, Axes, Any]: the figure, its axes and the saved background (see FigureCanvasAgg.copy_from_bbox)
+        """
+        key = (graph.get_content_hash(), layout, GraphRenderer._gen_drawing_digest(graph, edge_labels), show_minimal_output, tuple(size), dpi)
+        base = GraphRenderer._base_images.get(key)
+        if base is not None:
+            GraphRenderer._base_images.move_to_end(key)
+            return base
+
+        figure = Figure(figsize = size, dpi = dpi)
+        canvas = FigureCanvasAgg(figure)
+        axes = figure.add_axes((0, 0, 1, 1))
+        axes.set_axis_off()
+        axes.set_xlim(-1.1, 1.1)
+        axes.set_ylim(-1.1, 1.1)
+        GraphRenderer._draw_graph(axes, graph, edge_labels, show_minimal_output, GraphRenderer.get_layout(graph, layout))
+
+        canvas.draw()
+        base = (figure, axes, canvas.copy_from_bbox(figure.bbox))
+        GraphRenderer._put(GraphRenderer._base_images, key, base)
+        return base
+
+    @staticmethod
+    def _gen_drawing_digest(graph: Any, edge_labels: Dict[Tuple[int, int], str] | None) -> str:
+        """
+        Generates a digest of what the drawing depends on besides the content of the graph: the text of the
+        edge labels, and the node order (the colors of the nodes follow their dense index, see Graph.reorder_nodes).
+
+        Args:
+            graph (Graph): the graph
+            edge_labels (Dict[Tuple[int, int], str] | None): The dictionary of edges to labels
+
+        Returns:
+            str: the hexadecimal sha256 digest
+        """
+        digest = hashlib.sha256(numpy.ascontiguousarray(graph._node_array, dtype = "<i8").tobytes())
+        digest.update(repr(sorted(edge_labels.items()) if edge_labels is not None else None).encode())
+        return digest.hexdigest()
+
+    @staticmethod
+    def _draw_graph(axes: Axes, graph: Any, edge_labels: Dict[Tuple[int, int], str] | None, show_minimal_output: bool,
+                    positions: numpy.ndarray) -> None:
+        """
+        Draws the nodes, edges and labels of the graph with batched artists, decimating large graphs.
+
+        Args:
+            axes (Axes): the axes to draw on
+            graph (Graph): the graph
+            edge_labels (Dict[Tuple[int, int], str] | None): The dictionary of edges to labels
+            show_minimal_output (bool): Supresses node and edge labels and arrows
+            positions (numpy.ndarray): the position of each node, aligned with nodes
+        """
+        num_nodes = len(graph.nodes)
+        edge_ids = numpy.arange(len(graph._edge_sources))
+        if len(edge_ids) > GraphRenderer.MAX_DRAWN_EDGES:
+            # always the same sample, so the images of the same graph are comparable
+            edge_ids = numpy.sort(numpy.random.default_rng(0).choice(len(edge_ids), GraphRenderer.MAX_DRAWN_EDGES, replace = False))
+        starts = positions[graph._edge_sources[edge_ids]]
+        ends = positions[graph._edge_targets[edge_ids]]
+
+        is_small = not show_minimal_output and num_nodes <= GraphRenderer.MAX_LABELED_NODES
+        axes.add_collection(LineCollection(numpy.stack((starts, ends), axis = 1), linewidths = 1 if num_nodes <= 1000 else 0.2,
+                                           colors = "black", alpha = 1 if num_nodes <= 1000 else 0.3, zorder = 1))
+        if is_small and len(edge_ids) <= GraphRenderer.MAX_EDGE_LABELS:
+            # arrow heads just before the destination node
+            directions = ends - starts
+            axes.quiver(*(starts + 0.8 * directions).T, *(0.12 * directions).T, angles = "xy", scale_units = "xy", scale = 1,
+                        width = 0.004, headwidth = 5, zorder = 2)
+
+        node_size = 300 if is_small else (100 if num_nodes <= 1000 else max(20000 / num_nodes, 0.5))
+        axes.scatter(positions[:, 0], positions[:, 1], s = node_size, c = graph.get_color_map(num_nodes), zorder = 3, linewidths = 0)
+
+        if is_small:
+            for node, (x, y) in zip(graph.nodes, positions.tolist()):
+                axes.text(x, y, str(node), ha = "center", va = "center", fontsize = 9, zorder = 4)
+            if edge_labels and len(edge_labels) <= GraphRenderer.MAX_EDGE_LABELS:
+                for (from_node, to_node), label in edge_labels.items():
+                    x, y = (positions[graph.get_node_index(from_node)] + positions[graph.get_node_index(to_node)]) / 2
+                    axes.text(x, y, label, ha = "center", va = "center", fontsize = 7, zorder = 4,
+                              bbox = { "boxstyle": "round", "fc": "white", "ec": "none", "alpha": 0.8 })
+
+    @staticmethod
+    def _put(cache: OrderedDict, key: Tuple, value: Any) -> None:
+        """Adds a value to one of the caches, dropping the least recently used values over MAX_CACHED_GRAPHS."""
+        cache[key] = value
+        while len(cache) > GraphRenderer.MAX_CACHED_GRAPHS:
+            cache.popitem(last = False)
@@ -1,24 +1,45 @@
-from asyncio import constants
-from copyreg import constructor
+import gzip
 import json
+import itertools
+import lzma
 import numpy
+import re
+import zipfile
 from os.path import exists
 from numpy import random as r
+from scipy import sparse
+from scipy.sparse import csgraph
 
-from typing import Dict, List, Tuple
+from typing import IO, Dict, Iterator, List, Tuple
 
 from .Graph import Graph
+from .GraphRenderer import GraphRenderer
 
 class WCGraph(Graph):
     """Weight-Constrained Graph extends the normal graph, adding functionality specific to 
     the weight-constrained problem.
 
     members: 
-        + weight_matrix (numpy.ndarray): matrix of the weights for each edge
-        + cost_matrix (numpy.ndarray): matrix of the costs for each edge
+        + weight_matrix (numpy.ndarray | sparse.csr_matrix): matrix of the weights for each edge
+        + cost_matrix (numpy.ndarray | sparse.csr_matrix): matrix of the costs for each edge
+        + sparse_wc_matricies (bool): true = the weight and cost matricies are scipy.sparse CSR matricies
         + wc_edges ( Dict[Tuple[int, int], Tuple[int, int]]): dictionary of edges to (weight, cost)
+        + edge_weights (numpy.ndarray): the weight of each edge, indexed by edge id (position in edges)
+        + edge_costs (numpy.ndarray): the cost of each edge, indexed by edge id (position in edges)
+
+    Like the views of Graph, wc_edges and the weight and cost matricies are derived from the edge arrays,
+    built on first access and cached until the graph changes.
     """
 
+    # columns of the columnar JSON format and the file extension of each compression (see save_json_file)
+    JSON_COLUMNS = ("src", "dst", "weight", "cost")
+    JSON_COMPRESSION_EXTENSIONS = { None: "", "gzip": ".gz", "lzma": ".xz" }
+    JSON_CHUNK_SIZE = 65536
+
+    # name and version of the binary graph file format (see save_binary_file)
+    BINARY_FORMAT = "wcgraph"
+    BINARY_FORMAT_VERSION = 1
+
     def __init__(self, edges: Dict[Tuple[int, int], Tuple[int, int]], initialize_wc_matricies: bool = False) -> None:
         """Creates a new instance of a Weight-Constrained Graph using a dictionary of edges to weights and costs.
 
@@ -26,21 +47,243 @@ class WCGraph(Graph):
             edges (Mapping): a dictionary of edges to their weights and costs {(from, to): (weight, cost)}
             initialize_wc_matricies (bool): boolean flag, true = initialize weight and cost matricies.
         """
-        
-        self.wc_edges = edges
-        self.weight_matrix: numpy.ndarray | None = None
-        self.cost_matrix: numpy.ndarray | None = None
+        # copy the dictionary, so the mutation methods never change the caller's object
+        wc_edges = dict(edges)
+        # convert the dictionary into edge columns and build the graph in bulk
+        edge_array = Graph._gen_edge_array(wc_edges.keys())
+        wc_array = numpy.array(list(wc_edges.values())).reshape(-1, 2)
+        self._initialize_from_wc_arrays(edge_array[:, 0], edge_array[:, 1], wc_array[:, 0], wc_array[:, 1], initialize_wc_matricies)
+        self._views["wc_edges"] = wc_edges
+        self._views["edges"] = list(wc_edges)
+
+    @classmethod
+    def from_arrays(cls, sources: numpy.ndarray, targets: numpy.ndarray | None = None, weights: numpy.ndarray | None = None,
+                    costs: numpy.ndarray | None = None, initialize_wc_matricies: bool = False) -> "WCGraph":
+        """
+        Creates a new Weight-Constrained Graph directly from edge columns. Nodes are found with numpy.unique
+        and every internal structure is built with bulk numpy operations, so no per-edge Python loop is needed.
+
+        The edges can either be given as four arrays, or as a single structured array with the fields
+        "src", "dst", "weight" and "cost" passed as sources. The (from, to) pairs are expected to be unique.
+
+        Args:
+            sources (numpy.ndarray): the origin node of each edge (or a structured array of the edges)
+            targets (numpy.ndarray | None): the destination node of each edge
+            weights (numpy.ndarray | None): the weight of each edge
+            costs (numpy.ndarray | None): the cost of each edge
+            initialize_wc_matricies (bool): boolean flag, true = initialize weight and cost matricies.
+
+        Returns:
+            WCGraph: the weight-constrained graph with the given edges
+        """
+        if sources.dtype.names is not None:
+            sources, targets, weights, costs = sources["src"], sources["dst"], sources["weight"], sources["cost"]
+        sources = numpy.asarray(sources, dtype = numpy.int64)
+        targets = numpy.asarray(targets, dtype = numpy.int64)
+        # copy the weights and costs, so updating an edge doesn't write into the caller's arrays
+        weights = numpy.array(weights)
+        costs = numpy.array(costs)
+
+        graph = cls.__new__(cls)
+        graph._initialize_from_wc_arrays(sources, targets, weights, costs, initialize_wc_matricies)
+        return graph
+
+    def _initialize_from_wc_arrays(self, sources: numpy.ndarray, targets: numpy.ndarray, weights: numpy.ndarray, costs: numpy.ndarray,
+                                   initialize_wc_matricies: bool, node_array: numpy.ndarray | None = None) -> None:
+        """
+        Initializes the base graph structures and the weight and cost columns from edge arrays.
+
+        Args:
+            sources (numpy.ndarray): the origin node of each edge (its dense index if node_array is given)
+            targets (numpy.ndarray): the destination node of each edge (its dense index if node_array is given)
+            weights (numpy.ndarray): the weight of each edge
+            costs (numpy.ndarray): the cost of each edge
+            initialize_wc_matricies (bool): boolean flag, true = initialize weight and cost matricies.
+            node_array (numpy.ndarray | None, optional): the sorted node identifiers, if the endpoints are already
+                dense indices. Defaults to None (the nodes are found from the endpoints).
+        """
+        self.edge_weights: numpy.ndarray = weights
+        self.edge_costs: numpy.ndarray = costs
+        self.sparse_wc_matricies: bool = False
 
         # Initialize the base class Graph
-        super(WCGraph, self).__init__(edges.keys())
+        if node_array is None:
+            self._initialize_from_arrays(sources, targets)
+        else:
+            self._initialize_from_indexed_arrays(node_array, sources, targets)
 
         # Generate Weight and Cost Matricies
         if initialize_wc_matricies:
-            self.generate_weight_cost_matricies();
+            self.generate_weight_cost_matricies()
+
+    def add_edge(self, from_node: int, to_node: int, weight: int = 0, cost: int = 0) -> None:
+        """
+        Adds the edge (from_node, to_node) with the given weight and cost to the graph. If the edge already
+        exists, its weight and cost are updated instead. Costs amortized O(1).
+
+        Args:
+            from_node (int): origin node of the directed edge
+            to_node (int): destination node of the directed edge
+            weight (int, optional): the weight of the edge. Defaults to 0.
+            cost (int, optional): the cost of the edge. Defaults to 0.
+
+        Raises:
+            TypeError: if the weight or the cost is a float and the edge columns hold integers
+        """
+        self._check_edge_values(weight, cost)
+        if (from_node, to_node) in self._get_edge_id_map():
+            self.update_edge(from_node, to_node, weight, cost)
+            return
+
+        self._insert_edge(from_node, to_node, { "edge_weights": weight, "edge_costs": cost })
+        if "wc_edges" in self._views:
+            self._views["wc_edges"][(from_node, to_node)] = (weight, cost)
+        self._update_wc_matricies(from_node, to_node, weight, cost)
+
+    def remove_edge(self, from_node: int, to_node: int) -> None:
+        """
+        Removes the edge (from_node, to_node) from the graph. Costs O(1).
+
+        Args:
+            from_node (int): origin node of the directed edge
+            to_node (int): destination node of the directed edge
+
+        Raises:
+            KeyError: if the edge is not in the graph
+        """
+        self._delete_edge(from_node, to_node)
+        if "wc_edges" in self._views:
+            del self._views["wc_edges"][(from_node, to_node)]
+        self._update_wc_matricies(from_node, to_node, 0, 0)
+
+    def update_edge(self, from_node: int, to_node: int, weight: int, cost: int) -> None:
+        """
+        Changes the weight and cost of an existing edge. Costs O(1), the topology views (adjacency,
+        topological order) stay valid.
+
+        Args:
+            from_node (int): origin node of the directed edge
+            to_node (int): destination node of the directed edge
+            weight (int): the new weight of the edge
+            cost (int): the new cost of the edge
+
+        Raises:
+            KeyError: if the edge is not in the graph
+            TypeError: if the weight or the cost is a float and the edge columns hold integers
+        """
+        self._check_edge_values(weight, cost)
+        edge_id = self._get_edge_id_map()[(from_node, to_node)]
+        self.edge_weights[edge_id] = weight
+        self.edge_costs[edge_id] = cost
+
+        if "wc_edges" in self._views:
+            self._views["wc_edges"][(from_node, to_node)] = (weight, cost)
+        self._update_wc_matricies(from_node, to_node, weight, cost)
+        self._drop_views("content_hash")
+        self.version += 1
+
+    def freeze(self) -> "WCGraph":
+        """
+        Returns an immutable snapshot of the graph (see FrozenWCGraph), that can be hashed and used as a cache key.
+
+        Returns:
+            FrozenWCGraph: the frozen snapshot of the current state of the graph
+        """
+        from .FrozenWCGraph import FrozenWCGraph
+        return FrozenWCGraph.from_graph(self)
+
+    def get_induced_subgraph(self, nodes: numpy.ndarray | List[int], edge_mask: numpy.ndarray | None = None) -> "WCGraph":
+        """
+        Returns the weight-constrained subgraph induced by the given nodes: the nodes and every edge between
+        two of them, with their weights and costs (see Graph.get_induced_subgraph).
+
+        Args:
+            nodes (numpy.ndarray | List[int]): the node identifiers of the subgraph
+            edge_mask (numpy.ndarray | None, optional): boolean mask over the edge ids, only the selected edges
+                between the nodes are kept. Defaults to None (every edge between the nodes).
+
+        Raises:
+            KeyError: if any of the nodes is not in the graph
+
+        Returns:
+            WCGraph: a new graph, sharing no data with this one
+        """
+        node_array, edge_ids, edge_sources, edge_targets = self._gen_induced_arrays(nodes, edge_mask)
+        subgraph = WCGraph.__new__(WCGraph)
+        subgraph._initialize_from_wc_arrays(edge_sources, edge_targets, self.edge_weights[edge_ids], self.edge_costs[edge_ids], False, node_array)
+        return subgraph
+
+    def _get_edge_column_names(self) -> List[str]:
+        return super(WCGraph, self)._get_edge_column_names() + ["edge_weights", "edge_costs"]
+
+    def _check_edge_values(self, weight: int, cost: int) -> None:
+        """
+        Makes sure the weight and cost of an edge can be stored in the edge columns without losing their
+        fractional part, so the columns and the wc_edges view always hold the same values (like WCGraphBuilder).
+
+        Args:
+            weight (int): the weight of the edge
+            cost (int): the cost of the edge
+
+        Raises:
+            TypeError: if the weight or the cost is a float and its column holds integers
+        """
+        for name, value, column in (("weight", weight, self.edge_weights), ("cost", cost, self.edge_costs)):
+            value_dtype = numpy.asarray(value).dtype
+            if not numpy.can_cast(value_dtype, column.dtype, casting = "same_kind"):
+                raise TypeError(f"the {name} {value} of type {value_dtype} can't be stored in the {column.dtype} edge columns "
+                                f"without losing precision")
+
+    def _update_wc_matricies(self, from_node: int, to_node: int, weight: int, cost: int) -> None:
+        """
+        Updates the element of an edge in the cached weight and cost matricies (if they were built). Dense
+        matricies are updated in place if the edge is in them, otherwise the matricies are dropped and
+        rebuilt on their next access.
+
+        Args:
+            from_node (int): origin node of the directed edge
+            to_node (int): destination node of the directed edge
+            weight (int): the new weight of the edge
+            cost (int): the new cost of the edge
+        """
+        for name, value in (("weight_matrix", weight), ("cost_matrix", cost)):
+            matrix = self._views.get(name)
+            if matrix is None:
+                continue
+            from_index = self.node_index[from_node]
+            to_index = self.node_index[to_node]
+            if isinstance(matrix, numpy.ndarray) and max(from_index, to_index) < len(matrix):
+                matrix[from_index, to_index] = value
+            elif not isinstance(matrix, numpy.ndarray) and "adjacency" in self._views:
+                # same sparsity pattern as the adjacency: overwrite the stored value
+                matrix.data[self.adjacency.find_position(from_index, to_index)] = value
+            else:
+                self._drop_views(name)
+
+    @property
+    def wc_edges(self) -> Dict[Tuple[int, int], Tuple[int, int]]:
+        """The dictionary of edges to (weight, cost), built from the edge arrays on first access."""
+        return self._get_view("wc_edges", self._gen_wc_edges)
+
+    @property
+    def weight_matrix(self) -> numpy.ndarray | sparse.csr_matrix:
+        """The nxn weight matrix, built on first access (see generate_weight_cost_matricies)."""
+        return self._get_view("weight_matrix", lambda: self._gen_wc_matrix(self.edge_weights))
+
+    @property
+    def cost_matrix(self) -> numpy.ndarray | sparse.csr_matrix:
+        """The nxn cost matrix, built on first access (see generate_weight_cost_matricies)."""
+        return self._get_view("cost_matrix", lambda: self._gen_wc_matrix(self.edge_costs))
     
-    def get_arbitrary_graph(n: int, mean_weight: int, mean_cost: int, std_weight:int=1, std_cost:int=1, peak: int=5) -> Graph:
+    @staticmethod
+    def get_arbitrary_graph(n: int, mean_weight: int, mean_cost: int, std_weight:int=1, std_cost:int=1, peak: int=5,
+                            seed: int | numpy.random.Generator | None = None) -> "WCGraph":
         """Generates arbitrary WC graph with n nodes with normally distributed weights and costs
 
+        Every node gets at least one outgoing edge (to one of the next peak nodes) and every node but the
+        first at least one incoming edge, so every node is on a path from node 0 to node n - 1. The edges,
+        weights and costs are drawn with batched numpy calls, so graphs with millions of edges take seconds.
+
         Args:
             n (int): number of nodes
             mean_weight (int): mean weight
@@ -48,36 +291,15 @@ class WCGraph(Graph):
             std_weight (int): standard deviation of weight
             std_cost (int): standard deviation of cost
             peak (int): max number of nodes ahead a node can have an edge to
+            seed (int | numpy.random.Generator | None): seed (or generator) of the random numbers, the same seed gives the same graph
 
         Returns:
-            Graph: arbitary WC graph with (w,c) normally distributed
-        """
-        graphDict = {}
-        #Loop i range(0,n)
-        for i in range(0,n-1):
-            #Random Noe range(i,n) # of outgoing edges
-            n_forward = min(n-i-1, peak)
-            N_oe = r.randint(1,n_forward+1) if n_forward > 1 else 1 #num outgoing edges
-            # print("i:", i, "\tn_forward:", n_forward, "\tN_oe:", N_oe)
-            #Choose Noe unique nodes range(1,n) delta_o[]
-            #TODO: Peaking variable happens here
-            delta_o = r.choice([*range(i+1,min(n-1,i+peak)+1)], N_oe, replace=False) if i!=n-1 else [n]
-            #For each j in delta_o[], add edge (i,j)
-            for j in delta_o:
-                graphDict[i,j] = WCGraph.get_random_weight_cost(mean_weight, mean_cost, std_weight=std_weight, std_cost=std_cost)
-            #If no incoming nodes
-            oneInNode = False
-            for k in range(0,i):
-                if((k,i) in graphDict):
-                    oneInNode = True
-                    break
-            if not oneInNode and i != 0:
-                #Choose node incoming n_in range(0,i-1)
-                n_in = r.randint(max(0,i-peak),i-1) if i>1 else 0
-                #Add edge (n_in,i)
-                graphDict[n_in,i] = WCGraph.get_random_weight_cost(mean_weight, mean_cost, std_weight=std_weight, std_cost=std_cost)
-            
-        return WCGraph(graphDict)
+            WCGraph: arbitary WC graph with (w,c) normally distributed
+        """
+        rng = numpy.random.default_rng(seed)
+        sources, targets = Graph._gen_forward_peak_edges(n, peak, rng)
+        weights, costs = WCGraph.get_random_weights_costs(len(sources), mean_weight, mean_cost, std_weight, std_cost, rng)
+        return WCGraph.from_arrays(sources, targets, weights, costs)
     
     def get_weight(self, from_node: int, to_node: int) -> int:
         """Returns the weight of the edge (from_node, to_node)
@@ -103,26 +325,150 @@ class WCGraph(Graph):
         """
         return self.wc_edges[(from_node, to_node)][1]
 
-    def find_wc_paths(self, weight: int, source_node: int | None = None, destination_node: int | None = None) -> List[List[int]]:
+    def find_wc_paths(self, weight: int, source_node: int | None = None, destination_node: int | None = None,
+                      max_paths: int | None = None, max_depth: int | None = None) -> List[List[int]]:
         """Creates a list of each path in the graph that follows the weight constraint.
 
         Args:
             weight (int): the weight constraint for the paths
             source_node (int | None): source node of the path (Default: None - replaced with the first node in the graph)
             destination_node (int | None): destination node of the path (Default: None - replaced with the last node in the graph)
+            max_paths (int | None): the maximum number of paths to find (Default: None - no limit)
+            max_depth (int | None): the maximum number of edges in a path (Default: None - no limit)
 
         Returns:
             List[List[int]]: a list of paths that follow the weight constraint
         """
-        wc_paths = []
+        return list(self.iter_wc_paths(weight, source_node, destination_node, max_paths, max_depth))
 
-        for path in self.get_simple_paths(source_node, destination_node):
-            path_weight_cost = self.calc_path_weight_cost(path)
-            if path_weight_cost[0] <= weight:
-                wc_paths.append(path)
+    def iter_wc_paths(self, weight: int, source_node: int | None = None, destination_node: int | None = None,
+                      max_paths: int | None = None, max_depth: int | None = None) -> Iterator[List[int]]:
+        """
+        Generates each simple path in the graph that follows the weight constraint, using a depth first
+        search over the adjacency. The search carries the weight of the current partial path and prunes a
+        branch as soon as its weight plus the minimum weight from the branch to the destination exceeds the
+        constraint (weights are assumed to be non-negative), so infeasible subtrees are never explored and
+        only the current path is held in memory.
+
+        Args:
+            weight (int): the weight constraint for the paths
+            source_node (int | None): source node of the path (Default: None - replaced with the first node in the graph)
+            destination_node (int | None): destination node of the path (Default: None - replaced with the last node in the graph)
+            max_paths (int | None): the maximum number of paths to generate (Default: None - no limit)
+            max_depth (int | None): the maximum number of edges in a path (Default: None - no limit)
+
+        Yields:
+            List[int]: a path (list of nodes) from the source to the destination with a total weight <= weight
+        """
+        if source_node is None:
+            source_node = self.nodes[0]
+
+        if destination_node is None:
+            destination_node = self.nodes[-1]
+
+        if source_node == destination_node or max_paths == 0:
+            return
+
+        adjacency = self.adjacency
+        source = self.get_node_index(source_node)
+        destination = self.get_node_index(destination_node)
+        # lower bound of the weight still needed to reach the destination from each node (inf if unreachable)
+        weights_to_destination = self.calc_min_weights(destination_node, to_node = True).tolist()
+
+        def branches(index: int) -> Iterator[Tuple[int, int]]:
+            # the (neighbor, edge weight) pairs of a node, read from its adjacency row
+            start, end = adjacency.offsets[index], adjacency.offsets[index + 1]
+            return zip(adjacency.targets[start:end].tolist(), self.edge_weights[adjacency.edge_ids[start:end]].tolist())
+
+        path = [source]
+        path_weights = [0]
+        on_path = { source }
+        stack = [branches(source)]
+        num_paths = 0
+
+        while stack:
+            branch = next(stack[-1], None)
+            if branch is None:
+                # every branch of the last node was explored: backtrack
+                stack.pop()
+                on_path.discard(path.pop())
+                path_weights.pop()
+                continue
+
+            next_node, edge_weight = branch
+            total_weight = path_weights[-1] + edge_weight
+            num_edges = len(path)
+            if total_weight + weights_to_destination[next_node] > weight or next_node in on_path:
+                continue
+
+            if next_node == destination:
+                if max_depth is None or num_edges <= max_depth:
+                    yield self._node_array[path + [destination]].tolist()
+                    num_paths += 1
+                    if max_paths is not None and num_paths >= max_paths:
+                        return
+            elif max_depth is None or num_edges < max_depth:
+                path.append(next_node)
+                path_weights.append(total_weight)
+                on_path.add(next_node)
+                stack.append(branches(next_node))
+
+    def calc_min_weights(self, node: int, to_node: bool = False) -> numpy.ndarray:
+        """
+        Calculates the minimum path weight between the given node and every node in the graph (Dijkstra on
+        the sparse weight matrix).
+
+        Args:
+            node (int): the node identifier
+            to_node (bool, optional): false = weights of the paths from the node, true = weights of the
+                paths to the node. Defaults to False.
+
+        Returns:
+            numpy.ndarray: the minimum weight for each node (indexed by dense index), inf if there is no path
+        """
+        return self._calc_min_values(self.edge_weights, node, to_node)
+
+    def calc_min_costs(self, node: int, to_node: bool = False) -> numpy.ndarray:
+        """
+        Calculates the minimum path cost (ignoring the weights) between the given node and every node in the
+        graph (Dijkstra on the sparse cost matrix).
+
+        Args:
+            node (int): the node identifier
+            to_node (bool, optional): false = costs of the paths from the node, true = costs of the
+                paths to the node. Defaults to False.
+
+        Returns:
+            numpy.ndarray: the minimum cost for each node (indexed by dense index), inf if there is no path
+        """
+        return self._calc_min_values(self.edge_costs, node, to_node)
+
+    def find_min_weight_path(self, source_node: int, destination_node: int) -> List[int]:
+        """
+        Finds a path with the minimum weight from the source to the destination (Dijkstra).
+
+        Args:
+            source_node (int): the source node
+            destination_node (int): the destination node
+
+        Returns:
+            List[int]: the nodes of the path, an empty list if there is no path
+        """
+        return self._find_min_path(self.edge_weights, source_node, destination_node)
+
+    def find_min_cost_path(self, source_node: int, destination_node: int) -> List[int]:
+        """
+        Finds a path with the minimum cost (ignoring the weights) from the source to the destination (Dijkstra).
+
+        Args:
+            source_node (int): the source node
+            destination_node (int): the destination node
+
+        Returns:
+            List[int]: the nodes of the path, an empty list if there is no path
+        """
+        return self._find_min_path(self.edge_costs, source_node, destination_node)
 
-        return wc_paths
-    
     def find_lowest_cost_path(self, paths: List[List[int]]) -> List[int]:
         """
         Finds the path with the lowest cost given a list of paths.
@@ -136,13 +482,9 @@ class WCGraph(Graph):
         lowest_cost_path = []
 
         if len(paths) > 0:
-            lowest_cost_path = paths[0]
-            lowest_cost = self.calc_path_weight_cost(paths[0])[1]
-            for path in paths:
-                path_weight_cost = self.calc_path_weight_cost(path)
-                if path_weight_cost[1] < lowest_cost:
-                    lowest_cost_path = path
-                    lowest_cost = path_weight_cost[1]
+            _, path_costs = self.calc_paths_weight_cost(paths)
+            # argmin returns the first path with the lowest cost
+            lowest_cost_path = paths[int(numpy.argmin(path_costs))]
 
         return lowest_cost_path
 
@@ -165,26 +507,112 @@ class WCGraph(Graph):
 
         return (total_weight, total_cost)
 
-    def print_graph(self, picture_name: str = "", show_minimal_output: bool = False, highlight_edges = []) -> None:
+    def calc_paths_weight_cost(self, paths: List[List[int]] | numpy.ndarray, offsets: numpy.ndarray | None = None) -> Tuple[numpy.ndarray, numpy.ndarray]:
+        """
+        Calculates the total weight and cost of many paths at once with vectorized numpy operations.
+
+        The paths can be given as a list of paths (lists of nodes), or flattened: one array with the nodes
+        of every path concatenated, and an offsets array of length num_paths + 1, so path p is
+        nodes[offsets[p]:offsets[p + 1]].
+
+            Example: [[0, 1, 4], [0, 3, 4]] --> nodes = [0, 1, 4, 0, 3, 4], offsets = [0, 3, 6]
+
+        Args:
+            paths (List[List[int]] | numpy.ndarray): the list of paths, or the flattened nodes of the paths
+            offsets (numpy.ndarray | None, optional): the start of each path in the flattened nodes. Defaults to None (paths is a list).
+
+        Raises:
+            KeyError: if a path uses an edge that is not in the graph
+
+        Returns:
+            Tuple[numpy.ndarray, numpy.ndarray]: the total weight and total cost of each path
+        """
+        if offsets is None:
+            lengths = numpy.fromiter((len(path) for path in paths), dtype = numpy.int64, count = len(paths))
+            offsets = numpy.zeros(len(paths) + 1, dtype = numpy.int64)
+            numpy.cumsum(lengths, out = offsets[1:])
+            nodes = numpy.fromiter(itertools.chain.from_iterable(paths), dtype = numpy.int64, count = offsets[-1])
+        else:
+            nodes = numpy.asarray(paths, dtype = numpy.int64)
+            offsets = numpy.asarray(offsets, dtype = numpy.int64)
+
+        # every consecutive pair of nodes is an edge, except the pairs that cross from one path into the next
+        is_edge = numpy.ones(max(len(nodes) - 1, 0), dtype = bool)
+        path_ends = offsets[1:-1] - 1
+        is_edge[path_ends[(path_ends >= 0) & (path_ends < len(is_edge))]] = False
+        edge_ids = self.get_edge_ids(nodes[:-1][is_edge], nodes[1:][is_edge])
+
+        # number of edges of each path, and the start of each path in the list of edges
+        edge_counts = numpy.maximum(numpy.diff(offsets) - 1, 0)
+        edge_offsets = numpy.zeros(len(edge_counts) + 1, dtype = numpy.int64)
+        numpy.cumsum(edge_counts, out = edge_offsets[1:])
+
+        # segment sums via the cumulative sums (exact for integer weights and costs)
+        weight_sums = numpy.concatenate(([0], numpy.cumsum(self.edge_weights[edge_ids])))
+        cost_sums = numpy.concatenate(([0], numpy.cumsum(self.edge_costs[edge_ids])))
+        path_weights = weight_sums[edge_offsets[1:]] - weight_sums[edge_offsets[:-1]]
+        path_costs = cost_sums[edge_offsets[1:]] - cost_sums[edge_offsets[:-1]]
+
+        return (path_weights, path_costs)
+
+    def print_graph(self, picture_name: str = "", show_minimal_output: bool = False, highlight_edges: List[Tuple[int, int]] | None = None,
+                    headless: bool = False, layout: str = "circular") -> None:
         """
         Prints the graph with (weight, cost) labels for each edge
 
         Args:
             picture_name (str, optional): The name of the file to save the picture to. Defaults to "".
             show_minimal_output (bool): Supresses print statements and edge labels from being printed on the graph
-            highlight_edges: 
+            highlight_edges (List[Tuple[int, int]] | None, optional): Highlights list of edges. Defaults to None.
+            headless (bool, optional): true = render the image without a window (see Graph.print_graph). Defaults to False.
+            layout (str, optional): the node layout of the headless mode, "circular" or "spring". Defaults to "circular".
         """
-        edge_labels = {}
+        edge_labels = None
 
-        for edge, constraints in self.wc_edges.items():
-            edge_labels[edge] = f"{constraints[0]}, {constraints[1]}"
+        # the labels are not drawn with minimal output, nor by the headless mode for large graphs
+        if not show_minimal_output and (not headless or len(self.edge_weights) <= GraphRenderer.MAX_EDGE_LABELS):
+            edge_labels = {}
+            for edge, constraints in self.wc_edges.items():
+                edge_labels[edge] = f"{constraints[0]}, {constraints[1]}"
 
-        super(WCGraph, self).print_graph(picture_name, edge_labels, show_minimal_output, highlight_edges)
+        super(WCGraph, self).print_graph(picture_name, edge_labels, show_minimal_output, highlight_edges, headless, layout)
     
-    def save_to_json(self, graph_name: str):
-        json_object = self._gen_json_object()
-        with open(WCGraph.get_json_file_name(graph_name), "w") as file:
-            json.dump(json_object, file)
+    def save_to_json(self, graph_name: str, compression: str | None = None) -> None:
+        """
+        Saves the graph as columnar JSON (see save_json_file) under the given graph name.
+
+        Args:
+            graph_name (str): name of the graph used to save the graph
+            compression (str | None, optional): "gzip", "lzma" or None (uncompressed). Defaults to None.
+        """
+        self.save_json_file(WCGraph.get_json_file_name(graph_name, compression))
+
+    def save_json_file(self, filename: str, legacy: bool = False) -> None:
+        """
+        Saves the graph to a JSON file with one array per edge column:
+        {"src": [...], "dst": [...], "weight": [...], "cost": [...]}. The columns are written in chunks,
+        so no JSON object is built for the whole graph. The file is compressed with gzip if the filename
+        ends with .gz and with lzma if it ends with .xz.
+
+        Args:
+            filename (str): the path of the file
+            legacy (bool, optional): true = write the legacy format with one object per edge (see _gen_json_object). Defaults to False.
+        """
+        with WCGraph.open_graph_file(filename, "wb") as file:
+            if legacy:
+                file.write(json.dumps(self._gen_json_object()).encode())
+                return
+
+            columns = { "src": self._node_array[self._edge_sources], "dst": self._node_array[self._edge_targets],
+                        "weight": self.edge_weights, "cost": self.edge_costs }
+            file.write(b"{")
+            for position, (name, values) in enumerate(columns.items()):
+                file.write(f'{", " if position > 0 else ""}"{name}": ['.encode())
+                for start in range(0, len(values), WCGraph.JSON_CHUNK_SIZE):
+                    chunk = values[start:start + WCGraph.JSON_CHUNK_SIZE].tolist()
+                    file.write(((", " if start > 0 else "") + ", ".join(map(str, chunk))).encode())
+                file.write(b"]")
+            file.write(b"}")
 
     def get_cost_matrix_element(self, from_node: int, to_node: int) -> int:
         """
@@ -197,7 +625,7 @@ class WCGraph(Graph):
         Returns:
             int: the cost matrix element value at that position.
         """
-        return self.cost_matrix[self.nodes.index(from_node)][self.nodes.index(to_node)]
+        return self.cost_matrix[self.get_node_index(from_node), self.get_node_index(to_node)]
     
     def get_weight_matrix_element(self, from_node: int, to_node: int) -> int:
         """
@@ -210,20 +638,122 @@ class WCGraph(Graph):
         Returns:
             int: the weight matrix element value at that position.
         """
-        return self.weight_matrix[self.nodes.index(from_node)][self.nodes.index(to_node)]
+        return self.weight_matrix[self.get_node_index(from_node), self.get_node_index(to_node)]
 
-    def generate_weight_cost_matricies(self):
+    def generate_weight_cost_matricies(self, sparse_matricies: bool = False) -> Tuple[numpy.ndarray | sparse.csr_matrix, numpy.ndarray | sparse.csr_matrix]:
         """
         Generates the weight and cost matrices based on the weights and costs associated with each pair
         in the dictionary wc_edges
+
+        Args:
+            sparse_matricies (bool, optional): true = generate scipy.sparse CSR matricies (with the integer dtype of
+                the weights and costs) instead of dense nxn matricies. Defaults to False.
+
+        Returns:
+            Tuple[numpy.ndarray | sparse.csr_matrix, numpy.ndarray | sparse.csr_matrix]: the (weight, cost) matricies
+        """
+        self.sparse_wc_matricies = sparse_matricies
+        self._views["weight_matrix"] = self._gen_wc_matrix(self.edge_weights)
+        self._views["cost_matrix"] = self._gen_wc_matrix(self.edge_costs)
+        return (self._views["weight_matrix"], self._views["cost_matrix"])
+
+    def get_lagrangian_cost_matrix(self, alpha: float) -> sparse.csr_matrix:
+        """
+        Returns the sparse Lagrangian relaxed cost matrix C + alpha * W, computed in one pass over the edges.
+
+        Args:
+            alpha (float): the Lagrange multiplier of the weight constraint
+
+        Returns:
+            sparse.csr_matrix: the nxn matrix of the relaxed cost of each edge
+        """
+        return self._gen_sparse_matrix(self.edge_costs + alpha * self.edge_weights)
+
+    def _gen_wc_matrix(self, values: numpy.ndarray) -> numpy.ndarray | sparse.csr_matrix:
+        """
+        Generates an nxn matrix with the given value of each edge at M[from_node][to_node]. The matrix
+        is sparse if sparse_wc_matricies is set, dense otherwise.
+
+        Args:
+            values (numpy.ndarray): the value of each edge, indexed by edge id
+
+        Returns:
+            numpy.ndarray | sparse.csr_matrix: the matrix
         """
+        if self.sparse_wc_matricies:
+            return self._gen_sparse_matrix(values)
+
         # initialize matrix to nxn 0 matrix
-        self.weight_matrix = Graph._gen_zero_n_square_matrix(self.edges)
-        self.cost_matrix = Graph._gen_zero_n_square_matrix(self.edges)
+        matrix = numpy.zeros((len(self.nodes), len(self.nodes)))
 
-        for edge, constraints in self.wc_edges.items():
-            self.weight_matrix[self.nodes.index(edge[0])][self.nodes.index(edge[1])] = constraints[0]
-            self.cost_matrix[self.nodes.index(edge[0])][self.nodes.index(edge[1])] = constraints[1]
+        # fill every edge at once using the dense indices of the edge endpoints
+        matrix[self._edge_sources, self._edge_targets] = values
+        return matrix
+
+    def _gen_sparse_matrix(self, values: numpy.ndarray) -> sparse.csr_matrix:
+        """
+        Generates a scipy.sparse CSR matrix with the given value of each edge at M[from_node][to_node]. The
+        matrix reuses the row pointer and column indices of the graph's adjacency, so no sorting is needed.
+
+        Args:
+            values (numpy.ndarray): the value of each edge, indexed by edge id
+
+        Returns:
+            sparse.csr_matrix: the nxn sparse matrix
+        """
+        adjacency = self.adjacency
+        num_nodes = len(self.nodes)
+        return sparse.csr_matrix((values[adjacency.edge_ids], adjacency.targets, adjacency.offsets), shape = (num_nodes, num_nodes))
+
+    def _calc_min_values(self, values: numpy.ndarray, node: int, to_node: bool) -> numpy.ndarray:
+        """
+        Calculates the minimum sum of the given edge values along a path between the given node and every node.
+
+        Args:
+            values (numpy.ndarray): the (non-negative) value of each edge, indexed by edge id
+            node (int): the node identifier
+            to_node (bool): false = paths from the node, true = paths to the node
+
+        Returns:
+            numpy.ndarray: the minimum sum for each node (indexed by dense index), inf if there is no path
+        """
+        matrix = self._gen_sparse_matrix(values)
+        if to_node:
+            matrix = matrix.transpose().tocsr()
+        return csgraph.dijkstra(matrix, directed = True, indices = self.get_node_index(node))
+
+    def _find_min_path(self, values: numpy.ndarray, source_node: int, destination_node: int) -> List[int]:
+        """
+        Finds a path with the minimum sum of the given edge values from the source to the destination.
+
+        Args:
+            values (numpy.ndarray): the (non-negative) value of each edge, indexed by edge id
+            source_node (int): the source node
+            destination_node (int): the destination node
+
+        Returns:
+            List[int]: the nodes of the path, an empty list if there is no path
+        """
+        source, destination = self.get_node_index(source_node), self.get_node_index(destination_node)
+        distances, predecessors = csgraph.dijkstra(self._gen_sparse_matrix(values), directed = True, indices = source,
+                                                   return_predecessors = True)
+        if numpy.isinf(distances[destination]):
+            return []
+
+        # walk the predecessors back from the destination
+        path = [destination]
+        while path[-1] != source:
+            path.append(int(predecessors[path[-1]]))
+        return self._node_array[path[::-1]].tolist()
+
+    def _gen_wc_edges(self) -> Dict[Tuple[int, int], Tuple[int, int]]:
+        """
+        Generates the dictionary of edges to (weight, cost) from the edge arrays.
+
+        Returns:
+            Dict[Tuple[int, int], Tuple[int, int]]: dictionary of edges to (weight, cost)
+        """
+        return dict(zip(self._gen_edge_list(), zip(self.edge_weights.tolist(), self.edge_costs.tolist())))
     
     def _gen_json_object(self) -> json:
         """
@@ -242,7 +772,8 @@ class WCGraph(Graph):
     @staticmethod
     def load_json_graph(graph_name: str) -> None | Graph:
         """
-        Loads a WCGraph object from the given file. If the file doesn't exist, it returns None.
+        Loads a WCGraph object from the given file. If the file doesn't exist, it returns None. Both the
+        columnar and the legacy (one object per edge) format are read, uncompressed or compressed.
 
         Args:
             graph_name (str): the name of the graph (not the full file location, just the name of the graph used to save it)
@@ -250,39 +781,414 @@ class WCGraph(Graph):
         Returns:
             None | Graph: the graph object representing that graph. Returns None if file doesn't exist.
         """
-        graph: WCGraph | None = None
-        filename = WCGraph.get_json_file_name(graph_name)
-
-        if exists(filename):
-            wc_edges = {}
-            with open(filename, 'r') as file:
-                json_obj = json.load(file)
-                for edge in json_obj:
-                    # convert the string representation of the nodes to a tuple of integer values
-                    nodes = [int(node) for node in edge.split(" ")]
-                    new_edge = tuple(nodes)
-                    # combine the weights and costs into a tuple
-                    new_constraints = (json_obj[edge]["weight"], json_obj[edge]["cost"])
-                    # add the edge-constraint pair to the dictionary of edges to constraints
-                    wc_edges[new_edge] = new_constraints
-            graph = WCGraph(wc_edges)
+        for compression in (None, "gzip", "lzma"):
+            filename = WCGraph.get_json_file_name(graph_name, compression)
+            if exists(filename):
+                return WCGraph.load_json_file(filename)
+        return None
+
+    @staticmethod
+    def load_json_file(filename: str) -> "WCGraph":
+        """
+        Loads a WCGraph object from a JSON file written by save_json_file. The format (columnar or legacy)
+        and the compression (gzip, lzma or none) are detected from the content of the file.
+
+        Args:
+            filename (str): the path of the file
+
+        Returns:
+            WCGraph: the graph
+        """
+        with WCGraph.open_graph_file(filename, "rb") as file:
+            json_obj = json.load(file)
+
+        if not WCGraph._is_columnar_json(json_obj):
+            return WCGraph(WCGraph._parse_legacy_json_object(json_obj))
+        return WCGraph.from_arrays(numpy.asarray(json_obj["src"]), numpy.asarray(json_obj["dst"]),
+                                   numpy.asarray(json_obj["weight"]), numpy.asarray(json_obj["cost"]))
+
+    @staticmethod
+    def iter_json_edge_chunks(filename: str, chunk_size: int = 65536) -> Iterator[Tuple[numpy.ndarray, numpy.ndarray, numpy.ndarray, numpy.ndarray]]:
+        """
+        Reads the edges of a JSON graph file in chunks, without parsing (or holding) the whole document.
+        For the columnar format, a first pass finds where each column starts, then the four columns are
+        read side by side, each through its own stream, and parsed with numpy. Legacy files (which are
+        small) are parsed as a whole and then split into chunks. Both formats yield the edges in the order
+        of the file.
+
+        Args:
+            filename (str): the path of the file
+            chunk_size (int, optional): the number of edges in each chunk (the last one may be smaller). Defaults to 65536.
+
+        Raises:
+            ValueError: if the columns of a columnar file don't have the same length
+
+        Yields:
+            Tuple[numpy.ndarray, numpy.ndarray, numpy.ndarray, numpy.ndarray]: the (sources, targets, weights, costs) of a chunk of edges
+        """
+        with WCGraph.open_graph_file(filename, "rb") as file:
+            is_columnar = WCGraph._is_columnar_json_start(file.read(256))
+
+        if not is_columnar:
+            with WCGraph.open_graph_file(filename, "rb") as file:
+                wc_edges = WCGraph._parse_legacy_json_object(json.load(file))
+            edges = numpy.array(list(wc_edges.keys()), dtype = numpy.int64).reshape(-1, 2)
+            weights_costs = numpy.array(list(wc_edges.values())).reshape(-1, 2)
+            for start in range(0, len(edges), chunk_size):
+                yield (edges[start:start + chunk_size, 0], edges[start:start + chunk_size, 1],
+                       weights_costs[start:start + chunk_size, 0], weights_costs[start:start + chunk_size, 1])
+            return
+
+        offsets = WCGraph._find_json_column_offsets(filename)
+        files = [WCGraph.open_graph_file(filename, "rb") for _ in WCGraph.JSON_COLUMNS]
+        try:
+            readers = []
+            for file, name in zip(files, WCGraph.JSON_COLUMNS):
+                file.seek(offsets[name])
+                readers.append(WCGraph._iter_json_column(file, chunk_size))
+            # a column that ends early (or late) is a truncated file, not a shorter graph
+            for chunk in itertools.zip_longest(*readers):
+                if any(values is None for values in chunk) or len(set(len(values) for values in chunk)) > 1:
+                    raise ValueError(f"the columns of {filename} don't have the same length")
+                yield chunk
+        finally:
+            for file in files:
+                file.close()
+
+    @staticmethod
+    def _is_columnar_json(json_obj: Dict) -> bool:
+        """Returns true if the parsed JSON object is in the columnar format."""
+        return all(name in json_obj for name in WCGraph.JSON_COLUMNS)
+
+    @staticmethod
+    def _is_columnar_json_start(start: bytes) -> bool:
+        """Returns true if the first key of the JSON document (given by its first bytes) is a column name."""
+        match = re.match(rb'\s*\{\s*"([^"]*)"', start)
+        return match is not None and match.group(1).decode() in WCGraph.JSON_COLUMNS
+
+    @staticmethod
+    def _parse_legacy_json_object(json_obj: Dict) -> Dict[Tuple[int, int], Tuple[int, int]]:
+        """
+        Converts a JSON object of the legacy format ({"from to": {"weight": w, "cost": c}}) to a dictionary of edges.
+
+        Args:
+            json_obj (Dict): the parsed JSON object
+
+        Returns:
+            Dict[Tuple[int, int], Tuple[int, int]]: dictionary of edges to (weight, cost)
+        """
+        wc_edges = {}
+        for edge in json_obj:
+            # convert the string representation of the nodes to a tuple of integer values
+            nodes = [int(node) for node in edge.split(" ")]
+            new_edge = tuple(nodes)
+            # combine the weights and costs into a tuple
+            new_constraints = (json_obj[edge]["weight"], json_obj[edge]["cost"])
+            # add the edge-constraint pair to the dictionary of edges to constraints
+            wc_edges[new_edge] = new_constraints
+        return wc_edges
+
+    @staticmethod
+    def _find_json_column_offsets(filename: str) -> Dict[str, int]:
+        """
+        Scans a columnar JSON file (without parsing it) for the position right after the opening bracket of each column.
+
+        Args:
+            filename (str): the path of the file
+
+        Raises:
+            ValueError: if a column is missing
+
+        Returns:
+            Dict[str, int]: the (uncompressed) position of the first value of each column
+        """
+        pattern = re.compile(rb'"(' + b"|".join(name.encode() for name in WCGraph.JSON_COLUMNS) + rb')"\s*:\s*\[')
+        offsets = {}
+        position = 0
+        tail = b""
+        with WCGraph.open_graph_file(filename, "rb") as file:
+            while len(offsets) < len(WCGraph.JSON_COLUMNS):
+                block = file.read(1 << 20)
+                if not block:
+                    break
+                # keep the end of the previous block, in case a key is split between two blocks
+                text = tail + block
+                for match in pattern.finditer(text):
+                    offsets.setdefault(match.group(1).decode(), position - len(tail) + match.end())
+                tail = text[-32:]
+                position += len(block)
+
+        missing = [name for name in WCGraph.JSON_COLUMNS if name not in offsets]
+        if missing:
+            raise ValueError(f"{filename} has no column {missing}")
+        return offsets
+
+    @staticmethod
+    def _iter_json_column(file: IO[bytes], chunk_size: int) -> Iterator[numpy.ndarray]:
+        """
+        Parses the values of a JSON array of numbers in chunks, starting from the current position of the file
+        (right after the opening bracket) and stopping at the closing bracket.
+
+        Args:
+            file (IO[bytes]): the file, positioned at the first value of the array
+            chunk_size (int): the number of values in each chunk (the last one may be smaller)
+
+        Yields:
+            numpy.ndarray: the values of a chunk (int64 if every value is an integer, float64 otherwise)
+        """
+        pending = []
+        num_pending = 0
+        carry = b""
+        done = False
+        while not done:
+            block = file.read(1 << 16)
+            end = block.find(b"]")
+            done = end >= 0 or not block
+            text = carry + (block[:end] if end >= 0 else block)
+            if not done:
+                # the last number may continue in the next block
+                cut = text.rfind(b",")
+                text, carry = text[:cut + 1], text[cut + 1:]
+
+            values = numpy.array(text.replace(b",", b" ").split())
+            if len(values) > 0:
+                try:
+                    pending.append(values.astype(numpy.int64))
+                except ValueError:
+                    pending.append(values.astype(numpy.float64))
+                num_pending += len(values)
+
+            while num_pending >= chunk_size or (done and num_pending > 0):
+                values = numpy.concatenate(pending)
+                yield values[:chunk_size]
+                pending = [values[chunk_size:]]
+                num_pending = len(pending[0])
 
+    @staticmethod
+    def open_graph_file(filename: str, mode: str) -> IO[bytes]:
+        """
+        Opens a (possibly compressed) graph file in binary mode. When writing, the compression is chosen
+        by the extension (.gz = gzip, .xz = lzma); when reading, it is detected from the first bytes of the file.
+
+        Args:
+            filename (str): the path of the file
+            mode (str): "rb" or "wb"
+
+        Returns:
+            IO[bytes]: the opened file
+        """
+        if mode == "rb":
+            with open(filename, "rb") as file:
+                magic = file.read(6)
+            is_gzip = magic.startswith(b"\x1f\x8b")
+            is_lzma = magic.startswith(b"\xfd7zXZ\x00")
+        else:
+            is_gzip = filename.endswith(".gz")
+            is_lzma = filename.endswith(".xz")
+
+        # the default (maximum) compression levels are several times slower for a few percent smaller files
+        if is_gzip:
+            return gzip.open(filename, mode, compresslevel = 6)
+        if is_lzma:
+            return lzma.open(filename, mode, preset = 3 if mode == "wb" else None)
+        return open(filename, mode)
+
+    def save_to_binary(self, graph_name: str) -> None:
+        """
+        Saves the graph in the binary format (see save_binary_file) under the given graph name.
+
+        Args:
+            graph_name (str): name of the graph used to save the graph
+        """
+        self.save_binary_file(WCGraph.get_binary_file_name(graph_name))
+
+    def save_binary_file(self, filename: str, metadata: Dict | None = None) -> None:
+        """
+        Saves the graph to an uncompressed .npz file. The file holds a small JSON header (format version,
+        node and edge counts, content hash) and one .npy member per column: the node identifiers, the dense
+        index of both endpoints of every edge, and the weights and costs. Loading the file needs no parsing
+        and the columns can be memory-mapped (see load_binary_file).
+
+        Args:
+            filename (str): the path of the file (should end with .npz)
+            metadata (Dict | None, optional): JSON serializable data stored in the header under "metadata". Defaults to None.
+        """
+        header = {
+            "format": WCGraph.BINARY_FORMAT,
+            "version": WCGraph.BINARY_FORMAT_VERSION,
+            "num_nodes": len(self.nodes),
+            "num_edges": len(self._edge_sources),
+            "content_hash": self.get_content_hash(),
+            "metadata": metadata or {},
+        }
+        with open(filename, "wb") as file:
+            numpy.savez(file, header = numpy.array(json.dumps(header)), nodes = self._node_array, src = self._edge_sources,
+                        dst = self._edge_targets, weight = self.edge_weights, cost = self.edge_costs)
+
+    @staticmethod
+    def load_binary_graph(graph_name: str, memory_map: bool = False) -> "None | WCGraph":
+        """
+        Loads a WCGraph object saved with save_to_binary. If the file doesn't exist, it returns None.
+
+        Args:
+            graph_name (str): the name of the graph used to save it
+            memory_map (bool, optional): true = memory-map the columns instead of reading them (see load_binary_file). Defaults to False.
+
+        Returns:
+            None | WCGraph: the graph. Returns None if file doesn't exist.
+        """
+        filename = WCGraph.get_binary_file_name(graph_name)
+        return WCGraph.load_binary_file(filename, memory_map) if exists(filename) else None
+
+    @classmethod
+    def load_binary_file(cls, filename: str, memory_map: bool = False) -> "WCGraph":
+        """
+        Loads a WCGraph object from a file written by save_binary_file. The columns are used as the edge
+        arrays of the graph directly, so only the node index is built.
+
+        With memory_map, the columns are mapped copy-on-write instead of read: opening even a very large
+        graph is almost instant, the pages are read on first access and shared through the OS cache by every
+        process that maps the same file. Changing the graph only changes the private copy, never the file.
+
+        Args:
+            filename (str): the path of the file
+            memory_map (bool, optional): true = memory-map the columns. Defaults to False.
+
+        Raises:
+            ValueError: if the file is not a binary graph file of a supported version
+
+        Returns:
+            WCGraph: the graph
+        """
+        header = WCGraph.read_binary_header(filename)
+        if memory_map:
+            columns = WCGraph._memory_map_npz(filename)
+        else:
+            with numpy.load(filename) as file:
+                columns = { name: file[name] for name in file.files }
+
+        graph = cls.__new__(cls)
+        graph._initialize_from_wc_arrays(columns["src"], columns["dst"], columns["weight"], columns["cost"], False, columns["nodes"])
+        # the hash was computed from the same columns when the file was saved
+        graph._views["content_hash"] = header["content_hash"]
         return graph
 
     @staticmethod
-    def get_json_file_name(graph_name: str) -> str:
+    def read_binary_header(filename: str) -> Dict:
+        """
+        Reads the header of a binary graph file, without reading the columns.
+
+        Args:
+            filename (str): the path of the file
+
+        Raises:
+            ValueError: if the file is not a binary graph file of a supported version
+
+        Returns:
+            Dict: the header, with the keys format, version, num_nodes, num_edges, content_hash and metadata
+        """
+        with numpy.load(filename) as file:
+            header = json.loads(str(file["header"])) if "header" in file.files else {}
+        if header.get("format") != WCGraph.BINARY_FORMAT or header.get("version", 0) > WCGraph.BINARY_FORMAT_VERSION:
+            raise ValueError(f"{filename} is not a supported binary graph file")
+        return header
+
+    @staticmethod
+    def _memory_map_npz(filename: str) -> Dict[str, numpy.ndarray]:
+        """
+        Memory-maps (copy-on-write) every member of an uncompressed .npz file. numpy.load ignores
+        mmap_mode for .npz files, so the offset of each .npy member inside the zip archive is found by hand.
+
+        Args:
+            filename (str): the path of the .npz file
+
+        Raises:
+            ValueError: if a member of the archive is compressed
+
+        Returns:
+            Dict[str, numpy.ndarray]: the memory-mapped array of each member, keyed by member name (without .npy)
+        """
+        arrays = {}
+        with zipfile.ZipFile(filename) as archive, open(filename, "rb") as file:
+            for info in archive.infolist():
+                if info.compress_type != zipfile.ZIP_STORED:
+                    raise ValueError(f"{filename} is compressed and can't be memory-mapped")
+
+                # skip the local file header (30 bytes + file name + extra field) to reach the .npy data
+                file.seek(info.header_offset + 26)
+                name_length, extra_length = numpy.frombuffer(file.read(4), dtype = "<u2")
+                file.seek(info.header_offset + 30 + int(name_length) + int(extra_length))
+
+                version = numpy.lib.format.read_magic(file)
+                read_header = numpy.lib.format.read_array_header_1_0 if version == (1, 0) else numpy.lib.format.read_array_header_2_0
+                shape, fortran_order, dtype = read_header(file)
+                name = info.filename[:-len(".npy")] if info.filename.endswith(".npy") else info.filename
+                if len(shape) == 0 or 0 in shape:
+                    # numpy.memmap can't map empty or 0-d arrays, they are tiny anyway
+                    file.seek(info.header_offset + 30 + int(name_length) + int(extra_length))
+                    arrays[name] = numpy.lib.format.read_array(file)
+                else:
+                    arrays[name] = numpy.memmap(filename, dtype = dtype, mode = "c", offset = file.tell(), shape = shape,
+                                                order = "F" if fortran_order else "C")
+        return arrays
+
+    @staticmethod
+    def get_binary_file_name(graph_name: str) -> str:
+        """
+        Given the name of a graph, this function returns the full path location to the corresponding
+        binary file (relative to the base project folder).
+
+        Args:
+            graph_name (str): name of the graph used to save the graph
+
+        Returns:
+            str: the full file path, relative to the base project folder
+        """
+        filename = "".join(graph_name.split(" "))
+        return f"resources/SavedGraphs/{filename}.npz"
+
+    @staticmethod
+    def get_json_file_name(graph_name: str, compression: str | None = None) -> str:
         """
         Given the name of a graph, this function returns the full path location to the
         corresponding file (relative to the base project folder).
 
         Args:
             graph_name (str): name of the graph used to save the graph
+            compression (str | None, optional): "gzip" (.json.gz), "lzma" (.json.xz) or None (.json). Defaults to None.
+
+        Raises:
+            ValueError: if the compression is unknown
 
         Returns:
             str: the full file path, relative to the base project folder
         """
+        if compression not in WCGraph.JSON_COMPRESSION_EXTENSIONS:
+            raise ValueError(f"unknown compression '{compression}', expected one of {list(WCGraph.JSON_COMPRESSION_EXTENSIONS)}")
         filename = "".join(graph_name.split(" "))
-        return f"resources/SavedGraphs/{filename}.json"
+        return f"resources/SavedGraphs/{filename}.json{WCGraph.JSON_COMPRESSION_EXTENSIONS[compression]}"
+
+    @staticmethod
+    def get_random_weights_costs(size: int, mean_weight: int, mean_cost: int, std_weight: int = 1, std_cost: int = 1,
+                                 rng: numpy.random.Generator | None = None) -> Tuple[numpy.ndarray, numpy.ndarray]:
+        """Generates arrays of random weights and costs in one batch (same distribution as get_random_weight_cost)
+
+        Args:
+            size (int): the number of weight-cost pairs
+            mean_weight (int): mean weight in normal distribution
+            mean_cost (int): mean cost in normal distribution
+            std_weight (int, optional): standard deviation of weight. Defaults to 1.
+            std_cost (int, optional): standard deviation of cost. Defaults to 1.
+            rng (numpy.random.Generator | None, optional): the random number generator. Defaults to None (a new unseeded generator).
+
+        Returns:
+            Tuple[numpy.ndarray, numpy.ndarray]: integer arrays of the weights and costs (all >= 1)
+        """
+        if rng is None:
+            rng = numpy.random.default_rng()
+        weights = numpy.maximum(numpy.floor(rng.normal(mean_weight, std_weight, size)), 1).astype(numpy.int64)
+        costs = numpy.maximum(numpy.floor(rng.normal(mean_cost, std_cost, size)), 1).astype(numpy.int64)
+        return (weights, costs)
 
     @staticmethod
     #TODO: Maybe turn this into a lambda function inside of the arbitrary graph generatork
@@ -0,0 +1,195 @@
+import itertools
+import numpy
+
+from typing import Iterable, Tuple
+
+from .WCGraph import WCGraph
+
+class WCGraphBuilder:
+    """
+    The WCGraphBuilder class builds a WCGraph from edges that arrive one at a time or in chunks (e.g. while
+    reading a file or running a generator), without an intermediate dictionary of edges. The edges are
+    appended to typed buffers whose capacity doubles when they are full, and finalize() hands the buffers
+    (trimmed to their length) to the graph, converting the node identifiers to dense indices in place, so
+    the peak memory stays close to the size of the final graph.
+
+    The (from, to) pairs are expected to be unique, like for WCGraph.from_arrays. The weights and costs must fit
+    the types of the buffers: float values are refused by the integer buffers (the default) instead of being
+    truncated, so a builder for float weights or costs needs weight_dtype or cost_dtype set to a float type.
+
+    members:
+        + num_edges (int): the number of edges added so far
+    """
+
+    # number of edges converted from node identifiers to dense indices at once by finalize
+    CHUNK_SIZE = 1 << 20
+
+    def __init__(self, capacity: int = 65536, weight_dtype: numpy.dtype = numpy.int64, cost_dtype: numpy.dtype = numpy.int64) -> None:
+        """
+        Creates a new, empty builder.
+
+        Args:
+            capacity (int, optional): the initial number of edges the buffers can hold. Defaults to 65536.
+            weight_dtype (numpy.dtype, optional): the type of the weights. Defaults to numpy.int64.
+            cost_dtype (numpy.dtype, optional): the type of the costs. Defaults to numpy.int64.
+        """
+        self._allocate(capacity, weight_dtype, cost_dtype)
+
+    def __len__(self) -> int:
+        return self.num_edges
+
+    def add_edge(self, from_node: int, to_node: int, weight: int, cost: int) -> None:
+        """
+        Appends one edge. Costs amortized O(1).
+
+        Args:
+            from_node (int): origin node of the directed edge
+            to_node (int): destination node of the directed edge
+            weight (int): the weight of the edge
+            cost (int): the cost of the edge
+
+        Raises:
+            TypeError: if the weight or the cost is a float and its buffer holds integers
+        """
+        self._check_values(weight, cost)
+        self._reserve(self.num_edges + 1)
+        position = self.num_edges
+        self._sources[position] = from_node
+        self._targets[position] = to_node
+        self._weights[position] = weight
+        self._costs[position] = cost
+        self.num_edges += 1
+
+    def add_edges(self, edges: Iterable[Tuple[int, int, int, int]], batch_size: int = 65536) -> None:
+        """
+        Appends the edges of an iterable of (from, to, weight, cost) tuples. The iterable is consumed in batches
+        of batch_size edges, each converted to arrays at once, so at most one batch exists as Python objects.
+
+        Args:
+            edges (Iterable[Tuple[int, int, int, int]]): the edges
+            batch_size (int, optional): the number of edges converted at once. Defaults to 65536.
+        """
+        iterator = iter(edges)
+        while True:
+            batch = list(itertools.islice(iterator, batch_size))
+            if not batch:
+                return
+            sources, targets, weights, costs = zip(*batch)
+            self.add_arrays(numpy.array(sources), numpy.array(targets), numpy.array(weights), numpy.array(costs))
+
+    def add_arrays(self, sources: numpy.ndarray, targets: numpy.ndarray, weights: numpy.ndarray, costs: numpy.ndarray) -> None:
+        """
+        Appends a chunk of edges given as columns.
+
+        Args:
+            sources (numpy.ndarray): the origin node of each edge
+            targets (numpy.ndarray): the destination node of each edge
+            weights (numpy.ndarray): the weight of each edge
+            costs (numpy.ndarray): the cost of each edge
+
+        Raises:
+            ValueError: if the columns don't have the same length
+            TypeError: if the weights or the costs are floats and their buffer holds integers
+        """
+        count = len(sources)
+        if not len(targets) == len(weights) == len(costs) == count:
+            raise ValueError("the edge columns must have the same length")
+        self._check_values(weights, costs)
+
+        self._reserve(self.num_edges + count)
+        chunk = slice(self.num_edges, self.num_edges + count)
+        self._sources[chunk] = sources
+        self._targets[chunk] = targets
+        self._weights[chunk] = weights
+        self._costs[chunk] = costs
+        self.num_edges += count
+
+    def add_chunks(self, chunks: Iterable[Tuple[numpy.ndarray, numpy.ndarray, numpy.ndarray, numpy.ndarray]]) -> None:
+        """
+        Appends every chunk of an iterable of (sources, targets, weights, costs) columns, e.g. the chunks of
+        WCGraph.iter_json_edge_chunks.
+
+        Args:
+            chunks (Iterable[Tuple[numpy.ndarray, numpy.ndarray, numpy.ndarray, numpy.ndarray]]): the chunks of edges
+        """
+        for sources, targets, weights, costs in chunks:
+            self.add_arrays(sources, targets, weights, costs)
+
+    def finalize(self, initialize_wc_matricies: bool = False) -> WCGraph:
+        """
+        Builds the graph from the edges added so far. The buffers are shrunk to the number of edges and
+        become the columns of the graph without a copy, so the builder is left empty.
+
+        Args:
+            initialize_wc_matricies (bool, optional): true = initialize weight and cost matricies. Defaults to False.
+
+        Returns:
+            WCGraph: the graph with the added edges
+        """
+        columns = (self._sources, self._targets, self._weights, self._costs)
+        for buffer in columns:
+            # shrink in place, the memory after the last edge is given back
+            buffer.resize(self.num_edges, refcheck = False)
+        self._allocate(1, self._weights.dtype, self._costs.dtype)
+
+        # find the nodes from each column separately (instead of both at once like WCGraph.from_arrays),
+        # then replace the node identifiers by their dense index in place, chunk by chunk
+        sources, targets, weights, costs = columns
+        node_array = numpy.union1d(numpy.unique(sources), numpy.unique(targets))
+        for column in (sources, targets):
+            for start in range(0, len(column), WCGraphBuilder.CHUNK_SIZE):
+                chunk = column[start:start + WCGraphBuilder.CHUNK_SIZE]
+                chunk[:] = numpy.searchsorted(node_array, chunk)
+
+        graph = WCGraph.__new__(WCGraph)
+        graph._initialize_from_wc_arrays(sources, targets, weights, costs, initialize_wc_matricies, node_array)
+        return graph
+
+    def _check_values(self, weights: numpy.ndarray | int, costs: numpy.ndarray | int) -> None:
+        """
+        Makes sure the weights and costs can be stored in their buffers without losing their fractional part.
+
+        Args:
+            weights (numpy.ndarray | int): the weights (or the weight of one edge)
+            costs (numpy.ndarray | int): the costs (or the cost of one edge)
+
+        Raises:
+            TypeError: if the weights or the costs are floats and their buffer holds integers
+        """
+        for name, values, buffer in (("weights", weights, self._weights), ("costs", costs, self._costs)):
+            values_dtype = numpy.asarray(values).dtype
+            if not numpy.can_cast(values_dtype, buffer.dtype, casting = "same_kind"):
+                raise TypeError(f"the {name} of type {values_dtype} can't be stored in a buffer of type {buffer.dtype} "
+                                f"without losing precision, create the builder with a matching {name[:-1]}_dtype")
+
+    def _allocate(self, capacity: int, weight_dtype: numpy.dtype, cost_dtype: numpy.dtype) -> None:
+        """
+        Allocates new, empty buffers.
+
+        Args:
+            capacity (int): the number of edges the buffers can hold
+            weight_dtype (numpy.dtype): the type of the weights
+            cost_dtype (numpy.dtype): the type of the costs
+        """
+        capacity = max(capacity, 1)
+        self.num_edges: int = 0
+        self._sources: numpy.ndarray = numpy.empty(capacity, dtype = numpy.int64)
+        self._targets: numpy.ndarray = numpy.empty(capacity, dtype = numpy.int64)
+        self._weights: numpy.ndarray = numpy.empty(capacity, dtype = weight_dtype)
+        self._costs: numpy.ndarray = numpy.empty(capacity, dtype = cost_dtype)
+
+    def _reserve(self, size: int) -> None:
+        """
+        Makes sure the buffers can hold size edges, doubling their capacity as many times as needed.
+
+        Args:
+            size (int): the number of edges the buffers must be able to hold
+        """
+        capacity = len(self._sources)
+        if size <= capacity:
+            return
+        while capacity < size:
+            capacity *= 2
+        # the buffers are only referenced by the builder, so they can be grown in place
+        for buffer in (self._sources, self._targets, self._weights, self._costs):
+            buffer.resize(capacity, refcheck = False)
@@ -9,7 +9,26 @@ from ..models.WCGraph import WCGraph
 
 import networkx
 
+def test_seeded_arbitrary_graph():
+    print("Seeded Arbitrary Graph:")
+    n, peak = 200, 10
+    graph = WCGraph.get_arbitrary_graph(n, 25, 50, std_weight = 5, std_cost = 5, peak = peak, seed = 4)
+    assert graph.get_content_hash() == WCGraph.get_arbitrary_graph(n, 25, 50, std_weight = 5, std_cost = 5, peak = peak, seed = 4).get_content_hash()
+    assert graph.get_content_hash() != WCGraph.get_arbitrary_graph(n, 25, 50, std_weight = 5, std_cost = 5, peak = peak, seed = 5).get_content_hash()
+
+    # forward edges within the peak window, no duplicates, every node on a path from 0 to n - 1
+    assert graph.nodes == list(range(n)) and len(set(graph.edges)) == len(graph.edges)
+    assert all(0 < to_node - from_node <= peak for from_node, to_node in graph.edges)
+    assert len(graph.get_reachable_nodes(0)) == n and len(graph.get_reachable_nodes(n - 1, reverse = True)) == n
+    assert graph.edge_weights.min() >= 1 and graph.edge_costs.min() >= 1
+
+    unweighted = Graph.get_arbitrary_graph(50, seed = 4)
+    assert unweighted.get_content_hash() == Graph.get_arbitrary_graph(50, seed = 4).get_content_hash()
+    assert len(unweighted.get_reachable_nodes(0)) == 50 and unweighted.is_acyclic()
+    print(f"|    nodes: {len(graph.nodes)}, edges: {len(graph.edges)}")
+
 def main():
+    test_seeded_arbitrary_graph()
     
     num_nodes = 1000
     peak = int(num_nodes*0.4)
@@ -0,0 +1,71 @@
+import numpy
+import os
+import tempfile
+
+from ..models.FrozenWCGraph import FrozenWCGraph
+from ..models.GraphCatalog import GraphCatalog
+from ..models.WCGraph import WCGraph
+from .WCGraphTest import get_test_graph
+
+def load_without_json(catalog: GraphCatalog, graph_name: str) -> FrozenWCGraph | None:
+    # loads the graph while the JSON files can't be parsed, so it must come from memory or from the snapshot
+    load_json_file = WCGraph.load_json_file
+    def refuse_json(filename: str):
+        raise AssertionError(f"{filename} was parsed")
+    try:
+        WCGraph.load_json_file = staticmethod(refuse_json)
+        return catalog.load(graph_name)
+    finally:
+        WCGraph.load_json_file = staticmethod(load_json_file)
+
+def test_catalog():
+    print("Graph Catalog:")
+    graph = get_test_graph()
+    with tempfile.TemporaryDirectory() as directory:
+        root = os.path.join(directory, "graphs")
+        catalog = GraphCatalog(root)
+        assert catalog.list_graphs() == [] and catalog.load("missing") is None
+
+        saved = catalog.save(graph, "small graph")
+        filename = os.path.join(root, "smallgraph.json")
+        assert catalog.get_file_name("small graph") == filename and os.path.exists(catalog.get_snapshot_file_name(filename))
+        assert isinstance(saved, FrozenWCGraph) and saved.wc_edges == graph.wc_edges
+
+        # the same object from memory, then from the snapshot for a new catalog
+        assert catalog.load("small graph") is saved
+        loaded = load_without_json(GraphCatalog(root), "small graph")
+        assert loaded == saved and loaded is not saved
+        # the snapshot columns are already canonical, so they are mapped read-only instead of copied
+        assert isinstance(loaded.edge_weights, numpy.memmap) and not loaded.edge_weights.flags.writeable
+
+        # a JSON file written by someone else is parsed (once) and gets a new snapshot
+        graph.add_edge(50, 60, 10, 10)
+        graph.save_json_file(filename)
+        assert catalog.load("small graph").wc_edges == graph.wc_edges
+        assert load_without_json(GraphCatalog(root), "small graph").wc_edges == graph.wc_edges
+
+        # a JSON file without a snapshot
+        WCGraph({ (0, 1): (1, 2) }).save_json_file(os.path.join(root, "other.json.gz"))
+        listing = GraphCatalog(root).list_graphs()
+        assert [(item["name"], item["num_nodes"], item["num_edges"]) for item in listing] == [("other", 2, 1), ("smallgraph", 6, 7)]
+        assert listing[1]["content_hash"] == graph.get_content_hash()
+        assert os.path.exists(os.path.join(root, "other.snapshot.npz"))
+
+        # saving with another compression replaces the file
+        catalog.save(graph, "small graph", compression = "lzma")
+        assert catalog.get_file_name("small graph") == filename + ".xz" and not os.path.exists(filename)
+
+        # only the most recently used graphs stay in memory
+        catalog = GraphCatalog(root, max_cached_graphs = 1)
+        first = catalog.load("other")
+        catalog.load("small graph")
+        assert list(catalog._cache) == ["small graph"] and catalog.load("other") is not first
+        catalog.clear_cache()
+        assert len(catalog._cache) == 0
+    print(f"|    {[item['name'] for item in listing]}")
+
+def main():
+    test_catalog()
+
+if __name__ == "__main__":
+    main()
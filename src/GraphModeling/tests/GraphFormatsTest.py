@@ -0,0 +1,112 @@
+import json
+import networkx
+import numpy
+import os
+import tempfile
+
+from ..models.GraphFormats import GraphFormats
+from ..models.WCGraph import WCGraph
+from .WCGraphTest import assert_raises, get_test_graph
+
+# 4 vertices, 5 arcs, 2 resources: the limits, the resources of each vertex, then "from to cost r1 r2" for each arc
+RCSP_INSTANCE = """4 5 2
+1 0
+20 30
+0 0
+2 1
+0 0
+1 1
+1 2 3 4 1
+1 3 1 6 2
+2 4 2 1 1
+3 4 5 2 2
+1 3 4 5 5
+"""
+
+def test_rcsp_file():
+    print("OR-Library rcsp:")
+    with tempfile.TemporaryDirectory() as directory:
+        filename = os.path.join(directory, "rcsp1.txt")
+        with open(filename, "w") as file:
+            file.write(RCSP_INSTANCE)
+
+        graph, problem = GraphFormats.load_rcsp_file(filename)
+        # the resource of a vertex is added to its outgoing arcs, the one of the last vertex taken off the limits,
+        # and the parallel arcs 1 -> 3 are both efficient, so the second one goes through the dummy node 5
+        assert graph.wc_edges == { (1, 2): (4, 3), (1, 3): (5, 4), (1, 5): (6, 1), (5, 3): (0, 0), (2, 4): (3, 2), (3, 4): (2, 5) }
+        assert problem == { "source": 1, "destination": 4, "min_weight": 0, "max_weight": 19 }
+        second_graph, second_problem = GraphFormats.load_rcsp_file(filename, resource = 1)
+        assert second_graph.wc_edges[(2, 4)] == (2, 2) and second_problem["max_weight"] == 29
+
+        # the source and destination become the first and last vertex
+        saved = os.path.join(directory, "saved.txt.gz")
+        vertices = GraphFormats.save_rcsp_file(get_test_graph(), saved, 30, 50, 12)
+        assert vertices.tolist() == [30, 10, 20, 40, 50]
+        loaded, problem = GraphFormats.load_rcsp_file(saved)
+        assert problem == { "source": 1, "destination": 5, "min_weight": 0, "max_weight": 12 }
+        assert { (vertices[from_node - 1], vertices[to_node - 1]): values for (from_node, to_node), values in loaded.wc_edges.items() } == get_test_graph().wc_edges
+
+        with open(filename, "w") as file:
+            file.write(RCSP_INSTANCE[:-10])
+        assert_raises(ValueError, lambda: GraphFormats.load_rcsp_file(filename))
+    print(f"|    {graph.wc_edges}")
+
+def test_parallel_arcs():
+    print("Parallel Arcs:")
+    # of the four arcs 0 -> 1, (4, 4) is dominated by (3, 3) and the duplicate (3, 3) is dropped
+    sources, targets = numpy.array([0, 0, 0, 0, 1, 0]), numpy.array([1, 1, 1, 1, 2, 2])
+    weights, costs = numpy.array([4, 3, 1, 3, 1, 9]), numpy.array([4, 3, 8, 3, 1, 9])
+    graph = GraphFormats._build_graph(sources, targets, weights, costs)
+    assert graph.wc_edges == { (0, 1): (1, 8), (0, 3): (3, 3), (3, 1): (0, 0), (0, 2): (9, 9), (1, 2): (1, 1) }
+
+    # every efficient path of the arcs is still found, and dropping the dummy node gives the path of the arcs
+    efficient = [(graph.calc_path_weight_cost(path), [node for node in path if node <= 2]) for path in ([0, 1, 2], [0, 3, 1, 2])]
+    assert efficient == [((2, 9), [0, 1, 2]), ((4, 4), [0, 1, 2])]
+    assert GraphFormats._build_graph(sources[4:], targets[4:], weights[4:], costs[4:]).wc_edges == { (1, 2): (1, 1), (0, 2): (9, 9) }
+    print(f"|    {graph.wc_edges}")
+
+def test_dimacs_files():
+    print("DIMACS:")
+    graph = get_test_graph()
+    with tempfile.TemporaryDirectory() as directory:
+        weight_filename, cost_filename = os.path.join(directory, "graph-t.gr"), os.path.join(directory, "graph-d.gr.xz")
+        nodes = GraphFormats.save_dimacs_files(graph, weight_filename, cost_filename)
+        with open(weight_filename) as file:
+            assert file.read().splitlines()[:3] == ["c weight of each arc", "p sp 5 6", "a 1 3 1"]
+
+        loaded = GraphFormats.load_dimacs_files(weight_filename, cost_filename)
+        assert { (nodes[from_node - 1], nodes[to_node - 1]): values for (from_node, to_node), values in loaded.wc_edges.items() } == graph.wc_edges
+
+        # the arcs of the two files must be the same
+        other_filename = os.path.join(directory, "other.gr")
+        GraphFormats.save_dimacs_files(WCGraph({ (0, 1): (1, 1) }), other_filename, os.path.join(directory, "other-d.gr"))
+        assert_raises(ValueError, lambda: GraphFormats.load_dimacs_files(weight_filename, other_filename))
+    print(f"|    nodes: {nodes}")
+
+def test_node_link_file():
+    print("Node-Link JSON:")
+    graph = get_test_graph()
+    with tempfile.TemporaryDirectory() as directory:
+        filename = os.path.join(directory, "graph.json")
+        GraphFormats.save_node_link_file(graph, filename)
+        assert GraphFormats.load_node_link_file(filename).wc_edges == graph.wc_edges
+
+        # the file is read by networkx, and the files written by networkx are read back
+        with open(filename) as file:
+            networkx_graph = networkx.node_link_graph(json.load(file), edges = "links")
+        assert networkx_graph.edges[30, 20]["weight_cost"] == [2, 5] and sorted(networkx_graph.nodes) == graph.nodes
+        for from_node, to_node, data in networkx_graph.edges(data = True):
+            data["weight"], data["cost"] = data.pop("weight_cost")
+        with open(filename, "w") as file:
+            json.dump(networkx.node_link_data(networkx_graph, edges = "links"), file)
+        assert GraphFormats.load_node_link_file(filename).wc_edges == graph.wc_edges
+    print(f"|    links: {networkx_graph.number_of_edges()}")
+
+def main():
+    test_rcsp_file()
+    test_parallel_arcs()
+    test_dimacs_files()
+    test_node_link_file()
+
+if __name__ == "__main__":
+    main()
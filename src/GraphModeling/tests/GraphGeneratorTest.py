@@ -0,0 +1,82 @@
+import numpy
+
+from ..models.GraphGenerator import GraphGenerator
+from ..models.WCGraph import WCGraph
+
+def assert_valid_edges(graph: WCGraph, min_value: int, max_value: int) -> None:
+    # no duplicate or self edges, and every weight and cost in [min_value, max_value]
+    assert len(set(graph.edges)) == len(graph.edges)
+    assert all(from_node != to_node for from_node, to_node in graph.edges)
+    for values in (graph.edge_weights, graph.edge_costs):
+        assert values.min() >= min_value and values.max() <= max_value
+
+def test_grid_graph():
+    print("Grid Graph:")
+    graph = GraphGenerator.get_grid_graph(3, 4, seed = 1)
+    assert len(graph.nodes) == 12
+    # 2 directions * (3 rows * 3 horizontal + 2 * 4 vertical neighbor pairs)
+    assert len(graph.edges) == 2 * (3 * 3 + 2 * 4)
+    assert sorted(graph.get_outgoing_nodes(5)) == [1, 4, 6, 9]
+    assert_valid_edges(graph, 1, 100)
+    print(f"|    nodes: {len(graph.nodes)}, edges: {len(graph.edges)}")
+
+def test_layered_graph():
+    print("Layered Graph:")
+    graph = GraphGenerator.get_layered_graph(4, 5, degree = 2, seed = 1)
+    sink = 4 * 5 + 1
+    assert graph.nodes == list(range(sink + 1))
+    assert graph.is_acyclic()
+    assert graph.get_outgoing_nodes(0) == [1, 2, 3, 4, 5] and graph.get_incoming_nodes(sink) == [16, 17, 18, 19, 20]
+    # every node is on a path from the source to the sink, one layer per level
+    assert (graph.get_node_levels() == numpy.concatenate(([0], numpy.repeat(numpy.arange(1, 5), 5), [5]))).all()
+    assert len(graph.get_reachable_nodes(0)) == sink + 1 and len(graph.get_reachable_nodes(sink, reverse = True)) == sink + 1
+    assert_valid_edges(graph, 1, 100)
+
+    for num_layers, width in ((0, 5), (4, 0), (-1, 3)):
+        try:
+            GraphGenerator.get_layered_graph(num_layers, width)
+            assert False, "a layered graph needs at least one layer of one node"
+        except ValueError:
+            pass
+    print(f"|    nodes: {len(graph.nodes)}, edges: {len(graph.edges)}")
+
+def test_road_graph():
+    print("Road Graph:")
+    graph = GraphGenerator.get_road_graph(200, num_neighbors = 3, seed = 1)
+    assert len(graph.nodes) == 200
+    # the edges go both ways
+    assert set(graph.edges) == { (to_node, from_node) for from_node, to_node in graph.edges }
+    assert_valid_edges(graph, 1, 100)
+    print(f"|    nodes: {len(graph.nodes)}, edges: {len(graph.edges)}")
+
+def test_correlations():
+    print("Weight / Cost Correlations:")
+    rng = numpy.random.default_rng(1)
+    coefficients = {}
+    for correlation in GraphGenerator.CORRELATIONS:
+        weights, costs = GraphGenerator.get_weights_costs(5000, correlation, rng = rng)
+        coefficients[correlation] = round(float(numpy.corrcoef(weights, costs)[0, 1]), 3)
+    assert coefficients["correlated"] > 0.9 and coefficients["anti-correlated"] < -0.9 and abs(coefficients["uncorrelated"]) < 0.1
+    try:
+        GraphGenerator.get_weights_costs(10, "inverse")
+        assert False, "the correlation must be known"
+    except ValueError:
+        pass
+    print(f"|    {coefficients}")
+
+def test_seeds():
+    print("Generator Seeds:")
+    for generate in (lambda seed: GraphGenerator.get_grid_graph(5, 5, seed = seed), lambda seed: GraphGenerator.get_layered_graph(3, 4, seed = seed),
+                     lambda seed: GraphGenerator.get_road_graph(50, seed = seed)):
+        assert generate(7).get_content_hash() == generate(7).get_content_hash()
+        assert generate(7).get_content_hash() != generate(8).get_content_hash()
+
+def main():
+    test_grid_graph()
+    test_layered_graph()
+    test_road_graph()
+    test_correlations()
+    test_seeds()
+
+if __name__ == "__main__":
+    main()
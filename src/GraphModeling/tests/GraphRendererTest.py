@@ -0,0 +1,60 @@
+from ..models.GraphRenderer import GraphRenderer
+from ..models.WCGraph import WCGraph
+
+def get_test_graph() -> WCGraph:
+    return WCGraph({
+        #edge    constraint
+        #s  t    w  c
+        (0, 1): (1, 1),
+        (1, 2): (2, 5),
+        (0, 3): (1, 1),
+        (1, 3): (2, 2),
+        (1, 4): (2, 8),
+        (2, 4): (1, 2),
+        (3, 4): (6, 2),
+    })
+
+def test_render():
+    print("Headless Rendering:")
+    GraphRenderer.clear_cache()
+    graph = get_test_graph()
+
+    image = GraphRenderer.render(graph, size = (4, 4), dpi = 50)
+    assert image.shape == (200, 200, 4)
+    # the same graph is drawn from the cache, the highlighted edges are drawn on top of it
+    assert (GraphRenderer.render(graph, size = (4, 4), dpi = 50) == image).all()
+    highlighted = GraphRenderer.render(graph, highlight_edges = [(0, 1), (1, 4)], size = (4, 4), dpi = 50)
+    assert (highlighted != image).any() and len(GraphRenderer._base_images) == 1
+    # the highlighted edges are not kept in the cached drawing
+    assert (GraphRenderer.render(graph, size = (4, 4), dpi = 50) == image).all()
+    print(f"|    image: {image.shape}")
+
+def test_render_cache_keys():
+    print("Rendering Cache Keys:")
+    GraphRenderer.clear_cache()
+    graph = get_test_graph()
+
+    # different label text gives a different drawing, the same text reuses it
+    first = GraphRenderer.render(graph, edge_labels = { (0, 1): "a" }, size = (4, 4), dpi = 50)
+    second = GraphRenderer.render(graph, edge_labels = { (0, 1): "b" }, size = (4, 4), dpi = 50)
+    assert (first != second).any()
+    assert (GraphRenderer.render(graph, edge_labels = { (0, 1): "a" }, size = (4, 4), dpi = 50) == first).all()
+    assert len(GraphRenderer._base_images) == 2
+
+    # reordering keeps the content hash and the layout, but the colors follow the node order
+    content_hash = graph.get_content_hash()
+    positions = { node: position.tolist() for node, position in zip(graph.nodes, GraphRenderer.get_layout(graph)) }
+    before = GraphRenderer.render(graph, size = (4, 4), dpi = 50)
+    graph.reorder_nodes("rcm")
+    assert graph.get_content_hash() == content_hash
+    assert { node: position.tolist() for node, position in zip(graph.nodes, GraphRenderer.get_layout(graph)) } == positions
+    after = GraphRenderer.render(graph, size = (4, 4), dpi = 50)
+    assert (before != after).any() and len(GraphRenderer._base_images) == 4
+    print(f"|    cached drawings: {len(GraphRenderer._base_images)}")
+
+def main():
+    test_render()
+    test_render_cache_keys()
+
+if __name__ == "__main__":
+    main()
@@ -12,7 +12,136 @@ def print_matrix(matrix: numpy.ndarray) -> None:
     for column in matrix:
         print(f"|    {column}")
 
+def assert_raises(error: type, function) -> None:
+    try:
+        function()
+    except error:
+        return
+    raise AssertionError(f"expected {error.__name__}")
+
+def get_test_graph() -> Graph:
+    # node identifiers that are not their dense index
+    return Graph([(10, 30), (30, 20), (10, 40), (30, 40), (20, 40), (40, 50)])
+
+def test_csr_adjacency():
+    print("CSR Adjacency:")
+    graph = get_test_graph()
+    adjacency = graph.adjacency
+
+    # the rows follow the dense order of the nodes [10, 20, 30, 40, 50], the neighbors are sorted in each row
+    assert adjacency.offsets.tolist() == [0, 2, 3, 5, 6, 6]
+    assert adjacency.targets.tolist() == [2, 3, 3, 1, 3, 4]
+    assert [graph.edges[edge_id] for edge_id in adjacency.edge_ids] == [(10, 30), (10, 40), (20, 40), (30, 20), (30, 40), (40, 50)]
+    assert graph.reverse_adjacency.get_neighbors(graph.get_node_index(40)).tolist() == [0, 1, 2]
+
+    assert graph.get_outgoing_nodes(30) == [20, 40] and graph.get_outgoing_nodes(50) == []
+    assert graph.get_incoming_nodes(40) == [10, 20, 30] and graph.get_incoming_nodes(10) == []
+    assert graph.get_con_matrix_element(10, 30) == 1 and graph.get_con_matrix_element(30, 10) == 0
+
+    # the dense matrix is only built on request, and agrees with the adjacency
+    assert "connection_matrix" not in graph._views
+    for from_node, to_node in graph.edges:
+        assert graph.connection_matrix[graph.get_node_index(from_node), graph.get_node_index(to_node)] == 1
+    assert graph.connection_matrix.sum() == len(graph.edges)
+    print(f"|    offsets: {adjacency.offsets}, targets: {adjacency.targets}")
+
+def test_node_index():
+    print("Node Index:")
+    graph = get_test_graph()
+    assert graph.node_index == { 10: 0, 20: 1, 30: 2, 40: 3, 50: 4 }
+    assert all(graph.get_node_index(node) == index for index, node in enumerate(graph.nodes))
+    assert graph.get_node_indices(numpy.array([50, 10, 30])).tolist() == [4, 0, 2]
+    assert graph.get_edge_id(20, 40) == graph.edges.index((20, 40))
+    assert graph.get_edge_ids(numpy.array([40, 10]), numpy.array([50, 30])).tolist() == [graph.edges.index((40, 50)), graph.edges.index((10, 30))]
+    assert_raises(KeyError, lambda: graph.get_node_index(11))
+    assert_raises(KeyError, lambda: graph.get_node_indices(numpy.array([10, 11])))
+    assert_raises(KeyError, lambda: graph.get_edge_id(10, 20))
+    assert_raises(KeyError, lambda: graph.get_edge_ids(numpy.array([10]), numpy.array([20])))
+
+    # a node added by add_edge is appended, and can still be found next to the sorted ones
+    graph.add_edge(5, 10)
+    assert graph.nodes == [10, 20, 30, 40, 50, 5] and graph.get_node_index(5) == 5
+    assert graph.get_node_indices(numpy.array([5, 50, 10])).tolist() == [5, 4, 0]
+    assert graph.get_outgoing_nodes(5) == [10] and graph.get_incoming_nodes(10) == [5]
+    print(f"|    {graph.node_index}")
+
+def test_from_arrays():
+    print("Graph From Arrays:")
+    graph = get_test_graph()
+    sources, targets = numpy.array(graph.edges).T
+    built = Graph.from_arrays(sources, targets)
+    assert built.nodes == graph.nodes and built.edges == graph.edges
+    assert built.get_content_hash() == graph.get_content_hash()
+    assert built.get_outgoing_nodes(30) == [20, 40]
+    print(f"|    nodes: {built.nodes}")
+
+def test_lazy_views():
+    print("Lazy Views:")
+    graph = get_test_graph()
+    # only the edge list given to the constructor exists at first
+    assert list(graph._views) == ["edges"] and graph.version == 0
+
+    # a view is built on its first access and then reused
+    adjacency = graph.adjacency
+    assert graph.adjacency is adjacency and "adjacency" in graph._views
+    assert "networkx_graph" not in graph._views and "connection_matrix" not in graph._views
+
+    # a change drops the stale views and increases the version, they are rebuilt with the new edge
+    graph.add_edge(50, 10)
+    assert "adjacency" not in graph._views and graph.version == 1
+    assert graph.adjacency is not adjacency and graph.get_outgoing_nodes(50) == [10]
+    assert (50, 10) in graph.edges and graph.networkx_graph.has_edge(50, 10)
+
+    graph.invalidate_views()
+    assert len(graph._views) == 0 and graph.version == 2
+    print(f"|    version: {graph.version}")
+
+def test_topology():
+    print("Topology:")
+    graph = get_test_graph()
+    assert graph.is_acyclic()
+    assert graph.get_topological_order().tolist() == [10, 30, 20, 40, 50]
+    # the levels are aligned with the nodes [10, 20, 30, 40, 50]
+    assert graph.get_node_levels().tolist() == [0, 2, 1, 3, 4]
+
+    # the topology is cached, and recomputed after a change: a cycle leaves the nodes on and after it out
+    graph.add_edge(40, 30)
+    assert not graph.is_acyclic()
+    assert graph.get_topological_order().tolist() == [10] and graph.get_node_levels().tolist() == [0, -1, -1, -1, -1]
+
+    graph = Graph([(0, 1), (1, 2), (2, 1), (2, 3), (4, 0)])
+    assert not graph.is_acyclic()
+    assert graph.get_topological_order().tolist() == [4, 0] and graph.get_node_levels().tolist() == [1, -1, -1, -1, 0]
+    print(f"|    order: {graph.get_topological_order()}, levels: {graph.get_node_levels()}")
+
+def test_reorder_nodes():
+    print("Reorder Nodes:")
+    graph = Graph([(0, 3), (3, 1), (1, 4), (0, 2), (2, 4), (5, 0)])
+    edges = sorted(graph.edges)
+    content_hash = graph.get_content_hash()
+    outgoing = { node: sorted(graph.get_outgoing_nodes(node)) for node in graph.nodes }
+
+    for method in ("bfs", "rcm", "topological"):
+        order = graph.reorder_nodes(method)
+        assert sorted(order.tolist()) == list(range(len(graph.nodes)))
+        # the node identifiers and the edges don't change, only the dense indices
+        assert sorted(graph.edges) == edges and graph.get_content_hash() == content_hash
+        assert all(graph.get_node_index(node) == index for index, node in enumerate(graph.nodes))
+        assert { node: sorted(graph.get_outgoing_nodes(node)) for node in graph.nodes } == outgoing
+        print(f"|    {method}: {graph.nodes}")
+
+    # in topological order, every edge goes from a lower to a higher dense index
+    assert all(graph.get_node_index(from_node) < graph.get_node_index(to_node) for from_node, to_node in graph.edges)
+    assert_raises(ValueError, lambda: Graph([(0, 1), (1, 0)]).reorder_nodes("topological"))
+
 def main():
+    test_csr_adjacency()
+    test_node_index()
+    test_from_arrays()
+    test_lazy_views()
+    test_topology()
+    test_reorder_nodes()
+
     x = [(0, 29), (29, 50), (50, 99), (0, 41), (41, 51), (51, 99), (0, 36), (36, 37), (37, 54), (54, 99), (0, 33), (33, 59), (59, 99), (0, 5), (5, 23), (23, 24), (24, 60), (60, 99), (36, 64), (64, 99), (59, 68), (68, 99), (0, 47), (47, 69), (69, 99), (0, 30), (30, 70), (70, 99), (36, 75), (75, 99), (33, 56), (56, 76), (76, 99), (36, 63), (63, 79), (79, 99), (63, 81), (81, 99), (75, 85), (85, 99), (47, 88), (88, 99), (47, 91), (91, 99), (64, 98), (98, 99)]
     graph = Graph(x)
 
@@ -0,0 +1,69 @@
+import numpy
+
+from ..models.WCGraph import WCGraph
+from ..models.WCGraphBuilder import WCGraphBuilder
+from .WCGraphTest import assert_raises
+
+def get_test_edges() -> dict:
+    return {
+        #edge      constraint
+        #s   t     w  c
+        (10, 30): (1, 1),
+        (30, 20): (2, 5),
+        (10, 40): (1, 1),
+        (30, 40): (2, 2),
+        (20, 40): (7, 2),
+        (40, 50): (6, 2),
+    }
+
+def test_build():
+    print("Graph Builder:")
+    edges = get_test_edges()
+    graph = WCGraph(edges)
+
+    # a capacity of one edge makes the buffers grow on the way
+    builder = WCGraphBuilder(capacity = 1)
+    rows = [(*edge, *values) for edge, values in edges.items()]
+    builder.add_edge(*rows[0])
+    builder.add_edges(rows[1:2])
+    columns = numpy.array(rows[2:]).T
+    builder.add_chunks([(columns[0][:2], columns[1][:2], columns[2][:2], columns[3][:2])])
+    builder.add_arrays(columns[0][2:], columns[1][2:], columns[2][2:], columns[3][2:])
+    assert len(builder) == len(edges)
+
+    built = builder.finalize()
+    assert built.wc_edges == edges and built.get_content_hash() == graph.get_content_hash()
+    # the builder is left empty and can be used again
+    assert len(builder) == 0 and builder.finalize().wc_edges == {}
+
+    assert_raises(ValueError, lambda: builder.add_arrays(numpy.array([1, 2]), numpy.array([2]), numpy.array([1, 1]), numpy.array([1, 1])))
+    print(f"|    nodes: {built.nodes}, edges: {len(built.edges)}")
+
+def test_value_types():
+    print("Graph Builder Types:")
+    # the integer buffers refuse floats instead of truncating them
+    builder = WCGraphBuilder()
+    assert_raises(TypeError, lambda: builder.add_edge(0, 1, 1.5, 2))
+    assert_raises(TypeError, lambda: builder.add_edge(0, 1, 1, 2.5))
+    assert_raises(TypeError, lambda: builder.add_arrays(numpy.array([0]), numpy.array([1]), numpy.array([1.5]), numpy.array([2])))
+    assert_raises(TypeError, lambda: builder.add_edges([(0, 1, 1, 2.5)]))
+    assert len(builder) == 0
+
+    # smaller integer types still fit
+    builder.add_arrays(numpy.array([0]), numpy.array([1]), numpy.array([3], dtype = numpy.int32), numpy.array([4], dtype = numpy.uint8))
+    assert builder.finalize().wc_edges == { (0, 1): (3, 4) }
+
+    # float buffers keep the fractional part
+    builder = WCGraphBuilder(weight_dtype = numpy.float64, cost_dtype = numpy.float64)
+    builder.add_edge(0, 1, 1.5, 2)
+    builder.add_arrays(numpy.array([1]), numpy.array([2]), numpy.array([0.25]), numpy.array([3.75]))
+    graph = builder.finalize()
+    assert graph.edge_weights.tolist() == [1.5, 0.25] and graph.edge_costs.tolist() == [2.0, 3.75]
+    print(f"|    {graph.wc_edges}")
+
+def main():
+    test_build()
+    test_value_types()
+
+if __name__ == "__main__":
+    main()
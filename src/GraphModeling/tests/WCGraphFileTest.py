@@ -0,0 +1,129 @@
+import numpy
+import os
+import tempfile
+
+from ..models.FrozenWCGraph import FrozenWCGraph
+from ..models.WCGraph import WCGraph
+from .WCGraphTest import assert_raises, get_test_graph
+
+def test_binary_file():
+    print("Binary Graph File:")
+    graph = get_test_graph()
+    with tempfile.TemporaryDirectory() as directory:
+        filename = os.path.join(directory, "graph.npz")
+        graph.save_binary_file(filename, metadata = { "source": "test" })
+
+        header = WCGraph.read_binary_header(filename)
+        assert header["num_nodes"] == 5 and header["num_edges"] == 6
+        assert header["content_hash"] == graph.get_content_hash() and header["metadata"] == { "source": "test" }
+
+        for memory_map in (False, True):
+            loaded = WCGraph.load_binary_file(filename, memory_map = memory_map)
+            assert loaded.wc_edges == graph.wc_edges and loaded.nodes == graph.nodes
+            assert loaded.get_outgoing_nodes(30) == [20, 40]
+            # the stored hash is the hash of the loaded columns
+            assert loaded.get_content_hash() == graph.get_content_hash()
+            loaded._views.pop("content_hash")
+            assert loaded.get_content_hash() == graph.get_content_hash()
+
+        # a memory-mapped graph is copy-on-write: changing it never changes the file
+        mapped = WCGraph.load_binary_file(filename, memory_map = True)
+        assert isinstance(mapped.edge_weights, numpy.memmap)
+        mapped.update_edge(10, 30, 9, 9)
+        assert mapped.wc_edges[(10, 30)] == (9, 9)
+        del mapped
+        assert WCGraph.load_binary_file(filename).wc_edges == graph.wc_edges
+
+        # a frozen graph is loaded from the columns as they are when they are canonical, and sorted otherwise
+        frozen_filename = os.path.join(directory, "frozen.npz")
+        graph.freeze().save_binary_file(frozen_filename)
+        for name, memory_map in ((frozen_filename, True), (frozen_filename, False), (filename, True)):
+            frozen = FrozenWCGraph.load_binary_file(name, memory_map = memory_map)
+            assert isinstance(frozen, FrozenWCGraph) and frozen == graph.freeze() and frozen.wc_edges == graph.wc_edges
+            assert not frozen.edge_weights.flags.writeable and not frozen._node_array.flags.writeable
+            assert frozen.get_canonical_edge_columns()["src"].tolist() == [10, 10, 20, 30, 30, 40]
+        assert isinstance(FrozenWCGraph.load_binary_file(frozen_filename, memory_map = True).edge_costs, numpy.memmap)
+        assert not isinstance(FrozenWCGraph.load_binary_file(filename, memory_map = True).edge_costs, numpy.memmap)
+
+        # an empty graph has no columns to map
+        empty = os.path.join(directory, "empty.npz")
+        WCGraph.from_arrays(numpy.array([], dtype = numpy.int64), numpy.array([], dtype = numpy.int64), numpy.array([]), numpy.array([])).save_binary_file(empty)
+        assert WCGraph.load_binary_file(empty, memory_map = True).wc_edges == {}
+
+        # other .npz files are refused
+        other = os.path.join(directory, "other.npz")
+        numpy.savez(other, values = numpy.arange(3))
+        assert_raises(ValueError, lambda: WCGraph.load_binary_file(other))
+        compressed = os.path.join(directory, "compressed.npz")
+        with numpy.load(filename) as file:
+            numpy.savez_compressed(compressed, **{ name: file[name] for name in file.files })
+        assert_raises(ValueError, lambda: WCGraph.load_binary_file(compressed, memory_map = True))
+    print(f"|   {header}")
+
+def get_chunk_edges(chunks) -> dict:
+    edges = {}
+    for sources, targets, weights, costs in chunks:
+        edges.update(zip(zip(sources.tolist(), targets.tolist()), zip(weights.tolist(), costs.tolist())))
+    return edges
+
+def test_json_file():
+    print("JSON Graph File:")
+    graph = get_test_graph()
+    large_graph = WCGraph.get_arbitrary_graph(3000, 25, 50, std_weight = 5, std_cost = 5, peak = 10, seed = 1)
+    chunk_size = WCGraph.JSON_CHUNK_SIZE
+    with tempfile.TemporaryDirectory() as directory:
+        for extension in ("json", "json.gz", "json.xz"):
+            filename = os.path.join(directory, f"graph.{extension}")
+            graph.save_json_file(filename)
+            # the compression is found from the content, not the name
+            moved = os.path.join(directory, "graph")
+            os.replace(filename, moved)
+            assert WCGraph.load_json_file(moved).wc_edges == graph.wc_edges
+
+            chunks = list(WCGraph.iter_json_edge_chunks(moved, chunk_size = 4))
+            assert [len(sources) for sources, _, _, _ in chunks] == [4, 2]
+            assert [sources.tolist() for sources, _, _, _ in chunks] == [[10, 30, 10, 30], [20, 40]]
+            assert get_chunk_edges(chunks) == graph.wc_edges
+
+            # the columns are written (and read back) over many chunks
+            try:
+                WCGraph.JSON_CHUNK_SIZE = 1000
+                large_graph.save_json_file(filename)
+            finally:
+                WCGraph.JSON_CHUNK_SIZE = chunk_size
+            assert WCGraph.load_json_file(filename).get_content_hash() == large_graph.get_content_hash()
+            assert get_chunk_edges(WCGraph.iter_json_edge_chunks(filename, chunk_size = 777)) == large_graph.wc_edges
+
+        # the columnar format, and the legacy format with one object per edge
+        filename = os.path.join(directory, "graph.json")
+        graph.save_json_file(filename)
+        with open(filename) as file:
+            assert file.read().startswith('{"src": [10, 30, 10, 30, 20, 40], "dst": [30, 20, 40, 40, 40, 50]')
+        graph.save_json_file(filename, legacy = True)
+        with open(filename) as file:
+            assert file.read().startswith('{"10 30": {"weight": 1, "cost": 1}')
+        assert WCGraph.load_json_file(filename).wc_edges == graph.wc_edges
+        # both formats give the edges in the order of the file
+        chunks = list(WCGraph.iter_json_edge_chunks(filename, chunk_size = 4))
+        assert [sources.tolist() for sources, _, _, _ in chunks] == [[10, 30, 10, 30], [20, 40]]
+        assert get_chunk_edges(chunks) == graph.wc_edges
+
+        # a column that is shorter than the others is refused, instead of cutting the other columns
+        graph.save_json_file(filename)
+        with open(filename) as file:
+            text = file.read()
+        with open(filename, "w") as file:
+            file.write(text.replace('"cost": [1, 5, 1, 2, 2, 2]', '"cost": [1, 5, 1, 2, 2]'))
+        assert_raises(ValueError, lambda: list(WCGraph.iter_json_edge_chunks(filename, chunk_size = 4)))
+        assert_raises(ValueError, lambda: list(WCGraph.iter_json_edge_chunks(filename, chunk_size = 3)))
+
+    assert WCGraph.get_json_file_name("a graph", "lzma") == "resources/SavedGraphs/agraph.json.xz"
+    assert_raises(ValueError, lambda: WCGraph.get_json_file_name("graph", "zip"))
+    print(f"|   edges: {len(large_graph.edges)}")
+
+def main():
+    test_binary_file()
+    test_json_file()
+
+if __name__ == "__main__":
+    main()
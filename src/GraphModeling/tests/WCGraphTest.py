@@ -1,4 +1,5 @@
 import numpy
+import pickle
 
 from collections.abc import Sequence
 
@@ -19,17 +20,22 @@ def print_matrix(matrix: numpy.ndarray) -> None:
         print("|  {0:2d}|{1}".format(node_num, row_str))
         node_num += 1
 
+def assert_raises(error: type, function) -> None:
+    try:
+        function()
+    except error:
+        return
+    raise AssertionError(f"expected {error.__name__}")
+
 def print_graph_details(graph: WCGraph):
     print("Connection Matrix")
     print_matrix(graph.connection_matrix)
 
-    if graph.weight_matrix:
-        print("Weight Matrix")
-        print_matrix(graph.weight_matrix)
+    print("Weight Matrix")
+    print_matrix(graph.weight_matrix)
 
-    if graph.cost_matrix:
-        print("Cost Matrix")
-        print_matrix(graph.cost_matrix)
+    print("Cost Matrix")
+    print_matrix(graph.cost_matrix)
 
 def test_graph(graph: WCGraph, weight):
     print_graph_details(graph)
@@ -48,7 +54,167 @@ def test_graph(graph: WCGraph, weight):
 
     graph.print_graph()
 
+def get_test_graph() -> WCGraph:
+    return WCGraph({
+        #edge      constraint
+        #s   t     w  c
+        (10, 30): (1, 1),
+        (30, 20): (2, 5),
+        (10, 40): (1, 1),
+        (30, 40): (2, 2),
+        (20, 40): (7, 2),
+        (40, 50): (6, 2),
+    })
+
+def test_sparse_matricies():
+    print("Sparse Weight / Cost Matricies:")
+    graph = get_test_graph()
+    dense_weights, dense_costs = graph.weight_matrix, graph.cost_matrix
+    weights, costs = graph.generate_weight_cost_matricies(sparse_matricies = True)
+
+    # same values as the dense matricies, with the integer type of the edges
+    assert (weights.toarray() == dense_weights).all() and (costs.toarray() == dense_costs).all()
+    assert weights.dtype == numpy.int64 and weights.nnz == len(graph.edges)
+    assert graph.get_weight_matrix_element(30, 20) == 2 and graph.get_cost_matrix_element(30, 20) == 5
+
+    # the sparse matricies follow the changes of the edges
+    graph.update_edge(30, 20, 4, 4)
+    graph.add_edge(50, 10, 3, 3)
+    assert graph.get_weight_matrix_element(30, 20) == 4 and graph.get_cost_matrix_element(50, 10) == 3
+    assert graph.weight_matrix.nnz == len(graph.edges)
+    print(f"|   nnz: {graph.weight_matrix.nnz}")
+
+def test_paths_weight_cost():
+    print("Batched Path Weight / Cost:")
+    graph = get_test_graph()
+    paths = [[10, 30, 20, 40], [10, 40], [10]]
+    weights, costs = graph.calc_paths_weight_cost(paths)
+    assert weights.tolist() == [10, 1, 0] and costs.tolist() == [8, 1, 0]
+    assert [graph.calc_path_weight_cost(path) for path in paths] == list(zip(weights.tolist(), costs.tolist()))
+
+    # the same paths, flattened
+    weights, costs = graph.calc_paths_weight_cost(numpy.array([10, 30, 20, 40, 10, 40]), numpy.array([0, 4, 6]))
+    assert weights.tolist() == [10, 1] and costs.tolist() == [8, 1]
+    assert_raises(KeyError, lambda: graph.calc_paths_weight_cost([[10, 30], [10, 20]]))
+    print(f"|   weights: {weights}, costs: {costs}")
+
+def test_wc_paths():
+    print("Weight Constrained Paths:")
+    graph = get_test_graph()
+    assert graph.find_wc_paths(20, 10, 50) == [[10, 30, 20, 40, 50], [10, 30, 40, 50], [10, 40, 50]]
+    assert graph.find_wc_paths(9, 10, 50) == [[10, 30, 40, 50], [10, 40, 50]]
+    assert graph.find_wc_paths(6, 10, 50) == [] and graph.find_wc_paths(20, 50, 10) == []
+    assert graph.find_wc_paths(20, 10, 50, max_paths = 1) == [[10, 30, 20, 40, 50]]
+    assert graph.find_wc_paths(20, 10, 50, max_depth = 2) == [[10, 40, 50]]
+
+    # the paths are generated one at a time
+    paths = graph.iter_wc_paths(20, 10, 50)
+    assert next(paths) == [10, 30, 20, 40, 50] and len(list(paths)) == 2
+
+    # the pruned search finds the same paths as filtering every simple path
+    graph = WCGraph.get_arbitrary_graph(12, 5, 5, std_weight = 3, std_cost = 3, peak = 4, seed = 3)
+    for weight in (10, 20, 30):
+        expected = [path for path in graph.get_simple_paths(0, 11) if graph.calc_path_weight_cost(path)[0] <= weight]
+        assert sorted(graph.find_wc_paths(weight, 0, 11)) == sorted(expected)
+    print(f"|   paths (W = 30): {len(expected)}")
+
+def test_from_arrays():
+    print("WCGraph From Arrays:")
+    edges = { (10, 30): (1, 1), (30, 20): (2, 5), (10, 40): (1, 1), (40, 50): (6, 2) }
+    graph = WCGraph(edges)
+    sources, targets, weights, costs = (numpy.array(column) for column in zip(*[(*edge, *values) for edge, values in edges.items()]))
+
+    built = WCGraph.from_arrays(sources, targets, weights, costs)
+    assert built.wc_edges == edges and built.get_content_hash() == graph.get_content_hash()
+    # the graph keeps its own copy of the weights and costs
+    built.update_edge(10, 30, 9, 9)
+    assert weights.tolist() == [1, 2, 1, 6] and built.wc_edges[(10, 30)] == (9, 9)
+
+    # the same edges as one structured array
+    records = numpy.zeros(len(edges), dtype = [("src", numpy.int64), ("dst", numpy.int64), ("weight", numpy.int64), ("cost", numpy.int64)])
+    records["src"], records["dst"], records["weight"], records["cost"] = sources, targets, weights, costs
+    assert WCGraph.from_arrays(records).get_content_hash() == graph.get_content_hash()
+    print(f"|   {built.wc_edges}")
+
+def test_edge_api():
+    print("Add / Remove / Update Edges:")
+    edges = { (0, 1): (1, 1), (1, 2): (2, 5), (0, 2): (4, 1) }
+    graph = WCGraph(edges)
+    graph.add_edge(2, 3, 1, 2)
+    graph.update_edge(0, 1, 3, 3)
+    graph.remove_edge(1, 2)
+
+    # the graph works on its own copy of the dictionary
+    assert edges == { (0, 1): (1, 1), (1, 2): (2, 5), (0, 2): (4, 1) }
+    assert graph.wc_edges == { (0, 1): (3, 3), (0, 2): (4, 1), (2, 3): (1, 2) }
+    assert sorted(graph.edges) == [(0, 1), (0, 2), (2, 3)]
+    assert graph.get_outgoing_nodes(0) == [1, 2] and graph.get_incoming_nodes(3) == [2]
+    # adding an existing edge updates it
+    graph.add_edge(0, 2, 5, 5)
+    assert graph.wc_edges[(0, 2)] == (5, 5) and len(graph.edge_weights) == 3
+    assert_raises(KeyError, lambda: graph.remove_edge(1, 2))
+
+    # floats are refused by the integer columns, instead of being truncated in the columns but not in wc_edges
+    assert_raises(TypeError, lambda: graph.add_edge(3, 4, 2.7, 3))
+    assert_raises(TypeError, lambda: graph.update_edge(0, 1, 1, 1.9))
+    assert_raises(TypeError, lambda: graph.add_edge(0, 1, 0.5, 1))
+    assert graph.wc_edges == { (0, 1): (3, 3), (0, 2): (5, 5), (2, 3): (1, 2) } and 4 not in graph.node_index
+    assert graph.calc_paths_weight_cost([[0, 2, 3]])[0].tolist() == [6]
+
+    # a graph with float values takes floats, and every view agrees with the columns
+    float_graph = WCGraph({ (0, 1): (1.0, 2.0) })
+    float_graph.add_edge(1, 2, 2.7, 3.5)
+    float_graph.update_edge(0, 1, 0.5, 1.9)
+    weights, costs = float_graph.calc_paths_weight_cost([[0, 1, 2]])
+    assert float_graph.wc_edges == { (0, 1): (0.5, 1.9), (1, 2): (2.7, 3.5) }
+    assert (weights[0], costs[0]) == (0.5 + 2.7, 1.9 + 3.5) and float_graph.freeze().wc_edges == float_graph.wc_edges
+    print(f"|   {graph.wc_edges}")
+
+def test_content_hash_and_freeze():
+    print("Content Hash / Frozen Graph:")
+    graph = WCGraph({ (0, 1): (1, 1), (1, 2): (2, 5), (0, 2): (4, 1) })
+    same_graph = WCGraph({ (0, 2): (4, 1), (1, 2): (2, 5), (0, 1): (1, 1) })
+    assert graph.get_content_hash() == same_graph.get_content_hash()
+
+    frozen = graph.freeze()
+    assert frozen == same_graph.freeze() and hash(frozen) == hash(same_graph.freeze())
+    assert pickle.loads(pickle.dumps(frozen)) == frozen
+
+    # the snapshot doesn't follow the changes of the graph, and changing an edge changes the hash
+    graph.update_edge(0, 1, 9, 9)
+    assert graph.get_content_hash() != frozen.get_content_hash()
+    assert frozen.get_weight(0, 1) == 1
+
+    # every way of changing the snapshot raises
+    def set_wc_edge():
+        frozen.wc_edges[(0, 1)] = (99, 99)
+
+    def set_edge_weight():
+        frozen.edge_weights[0] = 5
+
+    def set_weight_matrix_element():
+        frozen.weight_matrix[0, 1] = 5
+
+    for mutation in (lambda: frozen.add_edge(2, 3, 1, 1), lambda: frozen.remove_edge(0, 1), lambda: frozen.update_edge(0, 1, 2, 2), set_wc_edge,
+                     lambda: frozen.reorder_nodes("rcm"), frozen.invalidate_views, frozen.generate_weight_cost_matricies):
+        assert_raises(TypeError, mutation)
+    for mutation in (set_edge_weight, set_weight_matrix_element):
+        assert_raises(ValueError, mutation)
+    assert frozen.get_weight(0, 1) == 1 and frozen == same_graph.freeze()
+
+    thawed = frozen.thaw()
+    thawed.add_edge(2, 3, 1, 1)
+    assert len(frozen.edge_weights) == 3 and len(thawed.edge_weights) == 4
+    print(f"|   {frozen.get_content_hash()}")
+
 def main():
+    test_from_arrays()
+    test_sparse_matricies()
+    test_paths_weight_cost()
+    test_wc_paths()
+    test_edge_api()
+    test_content_hash_and_freeze()
+
     graph = WCGraph({
         #edge    constraint
         #s  t    w  c
@@ -0,0 +1,358 @@
+import numpy
+from collections import defaultdict
+from scipy.sparse import csgraph
+from typing import Dict, List, Tuple
+
+from src.GraphModeling.models.WCGraph import WCGraph
+
+class GraphReducer:
+    """
+    The GraphReducer class shrinks a weight-constrained graph before a label setting algorithm runs on it,
+    by removing the nodes and edges that can't be part of a path from the source to the destination. Every
+    reduction returns an induced subgraph (see WCGraph.get_induced_subgraph) with the original node
+    identifiers, so the paths found on the reduced graph are paths of the original graph.
+
+        + reachability (reduce_to_relevant_nodes): removes the nodes that are not reachable from the source
+            or can't reach the destination
+        + weight bounds (reduce_by_weight_bounds): removes the nodes and edges that are on no path from the
+            source to the destination within the maximum weight, and gives the minimum weight from every node
+            to the destination, so labels that can't reach the destination within the budget can be dropped
+        + series/parallel (reduce_series_parallel): merges chains of nodes with one incoming and one outgoing
+            edge into single edges, and keeps only the Pareto-efficient edges between the same two nodes.
+            The merged nodes are listed in an expansion map, see expand_path.
+        + Lagrangian costs (reduce_by_lagrangian_costs): removes the nodes and edges whose best path under the
+            relaxed costs cost + multiplier * weight can't beat a known upper bound on the cost (Beasley and
+            Christofides reduction)
+    """
+
+    @staticmethod
+    def get_relevant_nodes(graph: WCGraph, source_node: int, destination_node: int | None = None) -> numpy.ndarray:
+        """
+        Finds the nodes that can be on a path from the source to the destination: the nodes reachable from the
+        source (forward breadth first search) that can also reach the destination (backward breadth first search).
+        The source and the destination are always kept.
+
+        Args:
+            graph (WCGraph): the weight-constrained graph
+            source_node (int): the source node
+            destination_node (int | None, optional): the destination node. Defaults to None (only the forward search).
+
+        Raises:
+            KeyError: if the source or the destination is not in the graph
+
+        Returns:
+            numpy.ndarray: the node identifiers, sorted by dense index
+        """
+        relevant = numpy.zeros(len(graph.nodes), dtype = bool)
+        relevant[graph.get_node_indices(graph.get_reachable_nodes(source_node))] = True
+        if destination_node is not None:
+            reaches_destination = numpy.zeros(len(graph.nodes), dtype = bool)
+            reaches_destination[graph.get_node_indices(graph.get_reachable_nodes(destination_node, reverse = True))] = True
+            relevant &= reaches_destination
+            relevant[graph.get_node_index(destination_node)] = True
+        relevant[graph.get_node_index(source_node)] = True
+        return numpy.asarray(graph.nodes, dtype = numpy.int64)[relevant]
+
+    @staticmethod
+    def reduce_to_relevant_nodes(graph: WCGraph, source_node: int, destination_node: int | None = None) -> WCGraph:
+        """
+        Returns the subgraph induced by the nodes that can be on a path from the source to the destination
+        (see get_relevant_nodes). If every node is relevant, the graph itself is returned.
+
+        Args:
+            graph (WCGraph): the weight-constrained graph
+            source_node (int): the source node
+            destination_node (int | None, optional): the destination node. Defaults to None (only the forward search).
+
+        Returns:
+            WCGraph: the reduced graph
+        """
+        nodes = GraphReducer.get_relevant_nodes(graph, source_node, destination_node)
+        if len(nodes) == len(graph.nodes):
+            return graph
+        return graph.get_induced_subgraph(nodes)
+
+    @staticmethod
+    def get_weight_bounds(graph: WCGraph, source_node: int, destination_node: int) -> Tuple[numpy.ndarray, numpy.ndarray]:
+        """
+        Computes the minimum weight of a path from the source to every node, and from every node to the
+        destination (one forward and one reverse Dijkstra on the edge weights, see WCGraph.calc_min_weights).
+
+        Args:
+            graph (WCGraph): the weight-constrained graph
+            source_node (int): the source node
+            destination_node (int): the destination node
+
+        Returns:
+            Tuple[numpy.ndarray, numpy.ndarray]: the (from source, to destination) minimum weights, indexed by dense index
+                (inf if there is no path)
+        """
+        return (graph.calc_min_weights(source_node), graph.calc_min_weights(destination_node, to_node = True))
+
+    @staticmethod
+    def reduce_by_weight_bounds(graph: WCGraph, source_node: int, destination_node: int,
+                                max_weight: int) -> Tuple[WCGraph, numpy.ndarray, numpy.ndarray]:
+        """
+        Removes every edge (i, j) with d_s(i) + w_ij + d_t(j) > max_weight and every node i with
+        d_s(i) + d_t(i) > max_weight, where d_s and d_t are the minimum weights from the source and to the
+        destination (see get_weight_bounds). No path within the maximum weight uses them, and the unreachable
+        nodes are removed as well (their bounds are inf). The source and the destination are always kept.
+
+        The minimum weights of the kept edges don't change, since a minimum weight path through a kept node
+        only uses kept edges, so one pass is enough.
+
+        Args:
+            graph (WCGraph): the weight-constrained graph
+            source_node (int): the source node
+            destination_node (int): the destination node
+            max_weight (int): the maximum weight constraint
+
+        Returns:
+            Tuple[WCGraph, numpy.ndarray, numpy.ndarray]: the reduced graph (the graph itself if nothing is removed),
+                and the minimum weight from the source and to the destination of each of its nodes (aligned with its nodes)
+        """
+        from_source, to_destination = GraphReducer.get_weight_bounds(graph, source_node, destination_node)
+        node_mask = from_source + to_destination <= max_weight
+        node_mask[[graph.get_node_index(source_node), graph.get_node_index(destination_node)]] = True
+        columns = GraphReducer._get_indexed_edge_columns(graph)
+        edge_mask = from_source[columns["src_index"]] + columns["edge_weights"] + to_destination[columns["dst_index"]] <= max_weight
+
+        if node_mask.all() and edge_mask.all():
+            return (graph, from_source, to_destination)
+        reduced = GraphReducer._get_reduced_graph(graph, columns, node_mask, edge_mask)
+        return (reduced, from_source[node_mask], to_destination[node_mask])
+
+    @staticmethod
+    def reduce_series_parallel(graph: WCGraph, protected_nodes: List[int] | None = None) -> Tuple[WCGraph, Dict[Tuple[int, int], List[int]]]:
+        """
+        Reduces the graph with series and parallel reductions, repeated until neither applies:
+
+            + series: every chain u -> x_1 -> ... -> x_k -> v, where each x_i has exactly one incoming and one
+                outgoing edge, becomes one edge (u, v) with the summed weight and cost
+            + parallel: of the edges between the same two nodes (which the series reduction creates), only the
+                Pareto-efficient ones are kept (sorted by weight with strictly decreasing cost), the dominated
+                and duplicate edges are removed
+
+        Every path of the original graph has a path of the reduced graph with the same weight and cost, and
+        every efficient path of the original graph is kept. A WCGraph has at most one edge per (from, to)
+        pair, so when more than one parallel edge is efficient, the extra edges go through a new node
+        (identifiers after the largest node identifier): u -> d -> v with the weight and cost on (u, d).
+
+        Args:
+            graph (WCGraph): the weight-constrained graph
+            protected_nodes (List[int] | None, optional): nodes that are never merged away, e.g. the source and the destination.
+                Defaults to None (no protected nodes).
+
+        Returns:
+            Tuple[WCGraph, Dict[Tuple[int, int], List[int]]]: the reduced graph, and the expansion map: for each
+                edge (u, v) of the reduced graph that doesn't exist in the graph, the original nodes after u up
+                to v (see expand_path)
+        """
+        protected = set(protected_nodes) if protected_nodes is not None else set()
+        # each arc: (from, to, weight, cost, original nodes after from, None = [to])
+        columns = graph.get_canonical_edge_columns()
+        arcs = list(zip(columns["src"].tolist(), columns["dst"].tolist(), columns["edge_weights"].tolist(), columns["edge_costs"].tolist(),
+                        [None] * len(columns["src"])))
+        while True:
+            arcs = GraphReducer._reduce_parallel_arcs(arcs)
+            arcs, num_merged = GraphReducer._reduce_series_arcs(arcs, protected)
+            if num_merged == 0:
+                break
+
+        # the first (lowest weight) arc between two nodes is an edge, the other efficient arcs go through new nodes
+        edges: List[Tuple[int, int, int, int]] = []
+        expansion: Dict[Tuple[int, int], List[int]] = {}
+        next_node = max(graph.nodes, default = -1) + 1
+        seen = set()
+        for from_node, to_node, weight, cost, tail in arcs:
+            if (from_node, to_node) not in seen:
+                seen.add((from_node, to_node))
+                edges.append((from_node, to_node, weight, cost))
+                if tail is not None:
+                    expansion[(from_node, to_node)] = tail
+            else:
+                edges.append((from_node, next_node, weight, cost))
+                edges.append((next_node, to_node, 0, 0))
+                expansion[(from_node, next_node)] = tail if tail is not None else [to_node]
+                expansion[(next_node, to_node)] = []
+                next_node += 1
+
+        sources, targets, weights, costs = zip(*edges) if len(edges) > 0 else ((), (), (), ())
+        reduced = WCGraph.from_arrays(numpy.array(sources, dtype = numpy.int64), numpy.array(targets, dtype = numpy.int64),
+                                      numpy.array(weights, dtype = graph.edge_weights.dtype), numpy.array(costs, dtype = graph.edge_costs.dtype))
+        return (reduced, expansion)
+
+    @staticmethod
+    def expand_path(path: List[int], expansion: Dict[Tuple[int, int], List[int]]) -> List[int]:
+        """
+        Converts a path of a reduced graph back to the path of the original graph (see reduce_series_parallel).
+
+        Args:
+            path (List[int]): the nodes of the path in the reduced graph
+            expansion (Dict[Tuple[int, int], List[int]]): the expansion map of the reduced graph
+
+        Returns:
+            List[int]: the nodes of the path in the original graph
+        """
+        if len(path) == 0:
+            return []
+        expanded = [path[0]]
+        for edge in zip(path, path[1:]):
+            expanded.extend(expansion.get(edge, [edge[1]]))
+        return expanded
+
+    @staticmethod
+    def _reduce_parallel_arcs(arcs: List[Tuple]) -> List[Tuple]:
+        """
+        Keeps only the Pareto-efficient arcs between the same two nodes, sorted by weight (then cost).
+
+        Args:
+            arcs (List[Tuple]): the (from, to, weight, cost, tail) arcs
+
+        Returns:
+            List[Tuple]: the efficient arcs, grouped by (from, to)
+        """
+        groups: Dict[Tuple[int, int], List[Tuple]] = defaultdict(list)
+        for arc in arcs:
+            groups[(arc[0], arc[1])].append(arc)
+
+        efficient = []
+        for group in groups.values():
+            if len(group) == 1:
+                efficient.append(group[0])
+                continue
+            lowest_cost = float("inf")
+            for arc in sorted(group, key = lambda arc: (arc[2], arc[3])):
+                # an arc is efficient if it is cheaper than every arc with a lower (or the same) weight
+                if arc[3] < lowest_cost:
+                    efficient.append(arc)
+                    lowest_cost = arc[3]
+        return efficient
+
+    @staticmethod
+    def _reduce_series_arcs(arcs: List[Tuple], protected: set) -> Tuple[List[Tuple], int]:
+        """
+        Merges every chain of arcs through nodes with exactly one incoming and one outgoing arc into one arc.
+        Chains that come back to their first node are removed, since no path can use them.
+
+        Args:
+            arcs (List[Tuple]): the (from, to, weight, cost, tail) arcs
+            protected (set): the nodes that are never merged away
+
+        Returns:
+            Tuple[List[Tuple], int]: the remaining arcs, and the number of merged nodes
+        """
+        in_degree: Dict[int, int] = defaultdict(int)
+        outgoing: Dict[int, List[int]] = defaultdict(list)
+        for position, arc in enumerate(arcs):
+            outgoing[arc[0]].append(position)
+            in_degree[arc[1]] += 1
+
+        def is_inner(node: int) -> bool:
+            return node not in protected and in_degree[node] == 1 and len(outgoing[node]) == 1
+
+        reduced = []
+        num_merged = 0
+        for arc in arcs:
+            from_node = arc[0]
+            if is_inner(from_node):
+                # the arc is part of the chain of an earlier node
+                continue
+            to_node = arc[1]
+            if not is_inner(to_node):
+                reduced.append(arc)
+                continue
+
+            # follow the chain until a node that is not inner
+            weight, cost, tail = arc[2], arc[3], list(arc[4] if arc[4] is not None else [to_node])
+            while is_inner(to_node):
+                next_arc = arcs[outgoing[to_node][0]]
+                weight, cost, to_node = weight + next_arc[2], cost + next_arc[3], next_arc[1]
+                tail.extend(next_arc[4] if next_arc[4] is not None else [to_node])
+                num_merged += 1
+            if to_node != from_node:
+                reduced.append((from_node, to_node, weight, cost, tail))
+        return (reduced, num_merged)
+
+    @staticmethod
+    def reduce_by_lagrangian_costs(graph: WCGraph, source_node: int, destination_node: int, max_weight: int, multiplier: float,
+                                   upper_bound: float) -> WCGraph:
+        """
+        Removes the edges that can't be on a path cheaper than the upper bound, using the Lagrangian relaxation
+        of the weight constraint. For a multiplier u >= 0, every path P within the maximum weight W has
+            cost(P) >= cost(P) + u * (weight(P) - W) = relaxed(P) - u * W,    with relaxed = cost + u * weight
+        so with the minimum relaxed cost f from the source and b to the destination (one forward and one reverse
+        Dijkstra on WCGraph.get_lagrangian_cost_matrix), every feasible path through the edge (i, j) costs at least
+        f(i) + relaxed_ij + b(j) - u * W. The edge is removed if that is higher than the upper bound (e.g. the
+        cost of a known feasible path, which is never removed), and the same holds for the nodes.
+
+        Args:
+            graph (WCGraph): the weight-constrained graph (with non-negative weights and costs)
+            source_node (int): the source node
+            destination_node (int): the destination node
+            max_weight (int): the maximum weight constraint
+            multiplier (float): the Lagrange multiplier u of the weight constraint (>= 0)
+            upper_bound (float): an upper bound on the cost of the best path within the maximum weight
+
+        Raises:
+            ValueError: if the multiplier is negative
+
+        Returns:
+            WCGraph: the reduced graph (the graph itself if nothing is removed)
+        """
+        if multiplier < 0:
+            raise ValueError(f"the Lagrange multiplier must be non-negative, got {multiplier}")
+        if upper_bound == float("inf"):
+            return graph
+
+        relaxed_matrix = graph.get_lagrangian_cost_matrix(multiplier)
+        from_source = csgraph.dijkstra(relaxed_matrix, directed = True, indices = graph.get_node_index(source_node))
+        to_destination = csgraph.dijkstra(relaxed_matrix.transpose().tocsr(), directed = True, indices = graph.get_node_index(destination_node))
+
+        # lower bound of the cost of the paths through each node and edge, with a tolerance for the rounding of the relaxed costs
+        limit = upper_bound + multiplier * max_weight + 1e-9 * max(abs(upper_bound), 1)
+        columns = GraphReducer._get_indexed_edge_columns(graph)
+        relaxed_costs = columns["edge_costs"] + multiplier * columns["edge_weights"]
+        node_mask = from_source + to_destination <= limit
+        node_mask[[graph.get_node_index(source_node), graph.get_node_index(destination_node)]] = True
+        edge_mask = from_source[columns["src_index"]] + relaxed_costs + to_destination[columns["dst_index"]] <= limit
+
+        if node_mask.all() and edge_mask.all():
+            return graph
+        return GraphReducer._get_reduced_graph(graph, columns, node_mask, edge_mask)
+
+    @staticmethod
+    def _get_indexed_edge_columns(graph: WCGraph) -> Dict[str, numpy.ndarray]:
+        """
+        Returns the canonical edge columns of the graph (see get_canonical_edge_columns), with the dense index of
+        both endpoints of every edge ("src_index", "dst_index"), to look up the per node bounds of its endpoints.
+
+        Args:
+            graph (WCGraph): the weight-constrained graph
+
+        Returns:
+            Dict[str, numpy.ndarray]: the canonical edge columns and the dense index columns
+        """
+        columns = graph.get_canonical_edge_columns()
+        columns["src_index"] = graph.get_node_indices(columns["src"])
+        columns["dst_index"] = graph.get_node_indices(columns["dst"])
+        return columns
+
+    @staticmethod
+    def _get_reduced_graph(graph: WCGraph, columns: Dict[str, numpy.ndarray], node_mask: numpy.ndarray, edge_mask: numpy.ndarray) -> WCGraph:
+        """
+        Returns the subgraph of the selected nodes and edges.
+
+        Args:
+            graph (WCGraph): the weight-constrained graph
+            columns (Dict[str, numpy.ndarray]): the canonical edge columns of the graph
+            node_mask (numpy.ndarray): boolean mask over the dense indices of the nodes that are kept
+            edge_mask (numpy.ndarray): boolean mask over the canonical edge columns of the edges that are kept
+
+        Returns:
+            WCGraph: the subgraph
+        """
+        # get_induced_subgraph takes the mask in edge id order
+        edge_id_mask = numpy.zeros(len(edge_mask), dtype = bool)
+        edge_id_mask[graph.get_edge_ids(columns["src"], columns["dst"])] = edge_mask
+        return graph.get_induced_subgraph(numpy.asarray(graph.nodes, dtype = numpy.int64)[node_mask], edge_id_mask)
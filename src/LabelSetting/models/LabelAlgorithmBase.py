@@ -1,7 +1,8 @@
-from typing import Dict, Set
+from typing import Dict, List, Set, Tuple
 
 from ...GraphModeling.models.WCGraph import WCGraph
 from ...GraphModeling.models.Graph import Graph
+from .GraphReducer import GraphReducer
 from .NodeLabel import NodeLabel
 
 class LabelAlgorithmBase:
@@ -13,10 +14,47 @@ class LabelAlgorithmBase:
 
     v1 - calculates the paths from the source to the node for EVERY node in the graph. Inefficient but acccurate
 
+    Before the labels are created, the graph is reduced to the nodes and edges that can be on a path from the
+    source to the destination within the maximum weight (see GraphReducer.reduce_by_weight_bounds), so no label
+    is created or scanned for the other nodes. Without a destination, only the nodes that are not reachable
+    from the source are removed (see GraphReducer.reduce_to_relevant_nodes).
+
+    If bound_labels is set (off by default) and a destination is given, the labels are also bounded by cost: a
+    feasible path to the destination (the minimum cost path if it is within the maximum weight, otherwise the
+    minimum weight path) gives an upper bound on the cost of the best path, and the minimum cost from every
+    node to the destination a lower bound on the cost still to come. A label is discarded if its cost plus that
+    lower bound is higher than the upper bound, and the upper bound is lowered every time the destination gets
+    a cheaper label. The best path is still found, but the destination then only keeps the labels that are not
+    more expensive than it, instead of every efficient label.
+
+    If a lagrange_multiplier is set, the edges that can't be on a path cheaper than the upper bound under the
+    Lagrangian relaxed costs are removed as well (see GraphReducer.reduce_by_lagrangian_costs).
+
+    If reduce_series_parallel is set, the chains of the graph are also merged into single edges (see
+    GraphReducer.reduce_series_parallel). The labels are then only created for the nodes of the reduced graph,
+    and their paths are converted back to paths of the original graph with get_original_path.
+
+    The nodes removed by the reductions keep an empty NodeLabel (no labels and no incoming or outgoing nodes), so
+    node_labels has an entry for every node of the original graph.
+
     members:
-        + node_labels (Dict[int, NodeLabel]): a list of NodeLabl objects, one for each node in the graph
+        + node_labels (Dict[int, NodeLabel]): a list of NodeLabl objects, one for each node in the original graph (empty
+            for the nodes removed by the reductions)
         + source_node (int): index identifier of the source node
-        + graph (WCGraph): the weight-constrained graph
+        + destination_node (int | None): index identifier of the destination node, None = labels for every reachable node
+        + graph (WCGraph): the weight-constrained graph (the reduced graph once the algorithm ran)
+        + original_graph (WCGraph): the graph given to the algorithm, before any reduction
+        + reduce_graph (bool): true = reduce the graph before creating the labels
+        + min_weights_to_destination (Dict[int, float]): the minimum weight from each node of the reduced graph to the
+            destination, a label is only added if its weight plus this bound is within the maximum weight
+        + bound_labels (bool): true = discard the labels that can't improve the upper bound (needs a destination, off by default)
+        + min_costs_to_destination (Dict[int, float]): the minimum cost from each node of the reduced graph to the destination
+        + upper_bound (float): the cost of the best feasible path to the destination found so far (inf if none)
+        + incumbent_path (List[int]): the initial feasible path that gave the first upper bound, as a path of the original
+            graph (empty if none)
+        + lagrange_multiplier (float | None): the multiplier of the Lagrangian reduction, None = no Lagrangian reduction
+        + reduce_series_parallel (bool): true = merge the chains and parallel edges of the graph (off by default)
+        + expansion (Dict[Tuple[int, int], List[int]]): the expansion map of the merged edges (see GraphReducer.expand_path)
     """
     
     suppress_output = False
@@ -24,10 +62,25 @@ class LabelAlgorithmBase:
     def __init__(self) -> None:
         self.node_labels: Dict[int, NodeLabel] = {}
         self.graph: WCGraph = None
+        self.original_graph: WCGraph = None
         self.source_node: int = None
+        self.destination_node: int | None = None
         self.max_weight: int = None
+        self.reduce_graph: bool = True
+        self.min_weights_to_destination: Dict[int, float] = {}
+        self.bound_labels: bool = False
+        self.min_costs_to_destination: Dict[int, float] = {}
+        self.upper_bound: float = float("inf")
+        self.incumbent_path: List[int] = []
+        self.lagrange_multiplier: float | None = None
+        self.reduce_series_parallel: bool = False
+        self.expansion: Dict[Tuple[int, int], List[int]] = {}
 
     def _initialize_label_setup(self) -> None:
+        self._reduce_graph()
+        self._initialize_cost_bounds()
+        self._reduce_by_lagrangian_costs()
+
         for node_index in self.graph.nodes:
             # find the incoming and outgoing nodes of the current node
             incoming_nodes = self.graph.get_incoming_nodes(node_index)
@@ -37,10 +90,126 @@ class LabelAlgorithmBase:
             currentNodeLabel = NodeLabel(node_index, incoming_nodes, outgoing_nodes)
             if node_index == self.source_node:
                 # the source node as one label: (0, 0)
-                currentNodeLabel.add_label(0, 0, node_index)
-                currentNodeLabel.add_path([], 0)
+                currentNodeLabel.add_label(0, 0, node_index, [node_index])
             self.node_labels[node_index] = currentNodeLabel    
 
+        # the nodes removed by the reductions get an empty label (no incoming nodes, so they are never treated)
+        for node_index in self.original_graph.nodes:
+            if node_index not in self.node_labels:
+                self.node_labels[node_index] = NodeLabel(node_index, [], [])
+
+    def _reduce_graph(self) -> None:
+        """
+        Replaces the graph by its reduced graph (see GraphReducer) and keeps the minimum weight from each
+        remaining node to the destination, if a destination is given.
+        """
+        self.original_graph = self.graph
+        self.min_weights_to_destination = {}
+        self.expansion = {}
+        if not self.reduce_graph:
+            return
+
+        if self.destination_node is None:
+            self.graph = GraphReducer.reduce_to_relevant_nodes(self.graph, self.source_node)
+        else:
+            self.graph, _, to_destination = GraphReducer.reduce_by_weight_bounds(self.graph, self.source_node, self.destination_node,
+                                                                                 self.max_weight)
+            self.min_weights_to_destination = dict(zip(self.graph.nodes, to_destination.tolist()))
+
+        if self.reduce_series_parallel:
+            protected_nodes = [self.source_node] + ([self.destination_node] if self.destination_node is not None else [])
+            self.graph, self.expansion = GraphReducer.reduce_series_parallel(self.graph, protected_nodes)
+
+    def get_original_path(self, path: List[int]) -> List[int]:
+        """
+        Converts a path found on the reduced graph (e.g. NodeLabel.paths) to the path of the original graph,
+        adding back the nodes of the merged chains.
+
+        Args:
+            path (List[int]): the nodes of the path in the reduced graph
+
+        Returns:
+            List[int]: the nodes of the path in the original graph
+        """
+        return GraphReducer.expand_path(path, self.expansion)
+
+    def _is_within_weight_bound(self, node: int, weight: int) -> bool:
+        """
+        Checks if a label with the given weight at the given node can still reach the destination within the
+        maximum weight: weight + (minimum weight from the node to the destination) <= max_weight.
+
+        Args:
+            node (int): the node of the label
+            weight (int): the weight of the label
+
+        Returns:
+            bool: true if the label can be part of a path within the maximum weight
+        """
+        return weight + self.min_weights_to_destination.get(node, 0) <= self.max_weight
+
+    def _initialize_cost_bounds(self) -> None:
+        """
+        Finds the initial upper bound (the cost of a feasible path to the destination), if the labels are bounded
+        or the Lagrangian reduction needs it, and the minimum cost from every node to the destination if the
+        labels are bounded. Without a destination (or if bound_labels is not set), every label is kept.
+        """
+        self.min_costs_to_destination = {}
+        self.upper_bound = float("inf")
+        self.incumbent_path = []
+        if self.destination_node is None or not (self.bound_labels or self.lagrange_multiplier is not None):
+            return
+
+        if self.bound_labels:
+            to_destination = self.graph.calc_min_costs(self.destination_node, to_node = True)
+            self.min_costs_to_destination = dict(zip(self.graph.nodes, to_destination.tolist()))
+
+        # the minimum cost path is the best path if it is feasible, otherwise fall back on the minimum weight path
+        for path in (self.graph.find_min_cost_path(self.source_node, self.destination_node),
+                     self.graph.find_min_weight_path(self.source_node, self.destination_node)):
+            if len(path) > 0:
+                weight, cost = self.graph.calc_path_weight_cost(path)
+                if weight <= self.max_weight and cost < self.upper_bound:
+                    self.upper_bound = cost
+                    # the path was found on the reduced graph, the merged chains are added back
+                    self.incumbent_path = self.get_original_path(path)
+
+    def _reduce_by_lagrangian_costs(self) -> None:
+        """
+        Removes the edges that can't beat the upper bound under the Lagrangian relaxed costs, if a multiplier,
+        a destination and an upper bound are known. The bounds found before stay valid lower bounds.
+        """
+        if self.lagrange_multiplier is None or not self.reduce_graph or self.upper_bound == float("inf"):
+            return
+        self.graph = GraphReducer.reduce_by_lagrangian_costs(self.graph, self.source_node, self.destination_node, self.max_weight,
+                                                             self.lagrange_multiplier, self.upper_bound)
+
+    def _is_within_cost_bound(self, node: int, cost: int) -> bool:
+        """
+        Checks if a label with the given cost at the given node can still lead to a path to the destination
+        that is not more expensive than the upper bound: cost + (minimum cost from the node to the destination) <= upper_bound.
+        Labels as expensive as the upper bound are kept, so the best path always gets a label at the destination.
+
+        Args:
+            node (int): the node of the label
+            cost (int): the cost of the label
+
+        Returns:
+            bool: true if the label can be part of a path that is not more expensive than the upper bound (always true
+                if bound_labels is not set)
+        """
+        return not self.bound_labels or cost + self.min_costs_to_destination.get(node, 0) <= self.upper_bound
+
+    def _update_upper_bound(self, node: int, cost: int) -> None:
+        """
+        Lowers the upper bound if the given label is a cheaper (feasible) label of the destination.
+
+        Args:
+            node (int): the node of the new label
+            cost (int): the cost of the new label
+        """
+        if self.bound_labels and node == self.destination_node and cost < self.upper_bound:
+            self.upper_bound = cost
+
     def _get_remaining_label_indicies(self) -> Set[int]:
         """
         Returns a set of the union of all label indicies that have not yet been treated: 
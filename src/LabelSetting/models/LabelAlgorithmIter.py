@@ -5,7 +5,7 @@ from src.LabelSetting.models.NodeLabel import NodeLabel
 
 
 class LabelAlgorithmIter(LabelAlgorithmBase):
-    def run_algorithm(self, graph: WCGraph, source_node: int, max_weight: int):
+    def run_algorithm(self, graph: WCGraph, source_node: int, max_weight: int, destination_node: int | None = None):
         """
         Runs the Label Setting Algorithm on the given weight-constrained graph with the given source node.
 
@@ -16,9 +16,11 @@ class LabelAlgorithmIter(LabelAlgorithmBase):
             graph (WCGraph): the weight-constrained graph
             source_node (int): the index that defines the source node
             max_weight (itn): the maximum weight constraint
+            destination_node (int | None, optional): the destination node, the nodes that can't reach it are skipped. Defaults to None.
         """
         self.graph = graph
         self.source_node = source_node
+        self.destination_node = destination_node
         self.max_weight = max_weight 
 
         # Step 0: Initialize the labels
@@ -50,17 +52,17 @@ class LabelAlgorithmIter(LabelAlgorithmBase):
                 for j_out in current_node.outgoing_nodes:
                     w_i_j = self.graph.wc_edges[i, j_out][0]       # the weight of edge (i, j)
                     total_weight = W_k_i + w_i_j
-                    if total_weight <= self.max_weight:
+                    if self._is_within_weight_bound(j_out, total_weight):
                         c_i_j = self.graph.wc_edges[i, j_out][1]   # cost of the edge (i, j)
                         total_cost = C_k_i + c_i_j
-                        if not self.node_labels[j_out].is_label_dominated(total_weight, total_cost):
-                            # add the label to the next node: j
-                            self.node_labels[j_out].add_label(total_weight, total_cost, current_node.node_index)
-                            # add the corresponding path from the source node to node j
+                        if self._is_within_cost_bound(j_out, total_cost) and not self.node_labels[j_out].is_label_dominated(total_weight, total_cost):
+                            # the path from the source node to node j
                             path_s_i = self.node_labels[k_in].get_lowest_weight_path()  # path from source node s to current node i
                             if current_node.node_index != self.source_node:
                                 path_s_i += [current_node.node_index]
-                            self.node_labels[j_out].add_path(path_s_i, current_node.node_index)
+                            # add the label to the next node: j
+                            self.node_labels[j_out].add_label(total_weight, total_cost, current_node.node_index, path_s_i + [j_out])
+                            self._update_upper_bound(j_out, total_cost)
 
                 current_node.treated_nodes.append(k_in)
             else:
@@ -12,7 +12,7 @@ class LabelAlgorithmRec(LabelAlgorithmBase):
         super().__init__()
         self.min_percent_remain: float = 0.9
 
-    def run_algorithm(self, graph: WCGraph, source_node: int, max_weight: int):
+    def run_algorithm(self, graph: WCGraph, source_node: int, max_weight: int, destination_node: int | None = None):
         """
         Runs the Label Setting Algorithm on the given weight-constrained graph with the given source node.
 
@@ -22,10 +22,12 @@ class LabelAlgorithmRec(LabelAlgorithmBase):
             graph (WCGraph): the weight-constrained graph
             source_node (int): the index that defines the source node
             max_weight (int): the maximum weight constraint
+            destination_node (int | None, optional): the destination node, the nodes that can't reach it are skipped. Defaults to None.
             min_percent_remain (float): the minimum percentage of remaining nodes to switch searching method
         """
         self.graph = graph
         self.source_node = source_node
+        self.destination_node = destination_node
         self.max_weight = max_weight 
 
         # Step 0: Initialize the labels
@@ -67,7 +69,7 @@ class LabelAlgorithmRec(LabelAlgorithmBase):
                 else:
                     # current node is the source node, so no incoming nodes exists (that we care about)
                     k_in = current_node.node_index
-                    k_label = current_node.labels[0]
+                    k_label = current_node.get_lowest_weight_label()[1]
                     W_k_i = k_label[0]
                     C_k_i = k_label[1]
 
@@ -75,17 +77,17 @@ class LabelAlgorithmRec(LabelAlgorithmBase):
                 for j_out in current_node.outgoing_nodes:
                     w_i_j = self.graph.wc_edges[i, j_out][0]       # the weight of edge (i, j)
                     total_weight = W_k_i + w_i_j
-                    if total_weight <= self.max_weight:
+                    if self._is_within_weight_bound(j_out, total_weight):
                         c_i_j = self.graph.wc_edges[i, j_out][1]   # cost of the edge (i, j)
                         total_cost = C_k_i + c_i_j
-                        if not self.node_labels[j_out].is_label_dominated(total_weight, total_cost):
-                            # add the label to the next node (j) and remove that node from treated lists
-                            self.node_labels[j_out].add_label(total_weight, total_cost, current_node.node_index)
-                            # add the corresponding path from the source node to node j
+                        if self._is_within_cost_bound(j_out, total_cost) and not self.node_labels[j_out].is_label_dominated(total_weight, total_cost):
+                            # the path from the source node to node j
                             path_s_i = self.node_labels[k_in].get_lowest_weight_path()  # path from source node s to current node i
                             if current_node.node_index != self.source_node:
                                 path_s_i += [current_node.node_index]
-                            self.node_labels[j_out].add_path(path_s_i, current_node.node_index)
+                            # add the label to the next node (j) and remove that node from treated lists
+                            self.node_labels[j_out].add_label(total_weight, total_cost, current_node.node_index, path_s_i + [j_out])
+                            self._update_upper_bound(j_out, total_cost)
                             # update outgoing nodes from node j, signaling that they now need to be re-treated for node j
                             for node in self.node_labels[j_out].outgoing_nodes:
                                 if j_out in self.node_labels[node].treated_nodes:
@@ -101,9 +103,8 @@ class LabelAlgorithmRec(LabelAlgorithmBase):
         """
         Runs a modified version of the Label Setting Algorithm on the given weight-constrained graph 
         with the given source node. This function generates all possible labels, ignoring the maximum 
-        weight constraint and including all labels, even when dominated. This algorithm does not give
-        the path with the lowest weight, but it does generate all labels for every path, with a chance
-        of overwritting labels.
+        weight constraint and without checking the labels before adding them. Each node still only keeps
+        its efficient labels (see NodeLabel.add_label), so the dominated labels are dropped as they arrive.
 
         v2 - start from the source node and work outward until every node has been treated
 
@@ -114,6 +115,7 @@ class LabelAlgorithmRec(LabelAlgorithmBase):
         """
         self.graph = graph
         self.source_node = source_node
+        self.destination_node = None    # every possible label, for every reachable node
         self.max_weight = max_weight 
 
         # Step 0: Initialize the labels
@@ -155,7 +157,7 @@ class LabelAlgorithmRec(LabelAlgorithmBase):
                 else:
                     # current node is the source node, so no incoming nodes exists (that we care about)
                     k_in = current_node.node_index
-                    k_label = current_node.labels[0]
+                    k_label = current_node.get_lowest_weight_label()[1]
                     W_k_i = k_label[0]
                     C_k_i = k_label[1]
 
@@ -165,16 +167,15 @@ class LabelAlgorithmRec(LabelAlgorithmBase):
                     total_weight = W_k_i + w_i_j
                     c_i_j = self.graph.wc_edges[i, j_out][1]        # cost of the edge (i, j)
                     total_cost = C_k_i + c_i_j
+                    # the path from the source node to node j
+                    path_s_i = self.node_labels[k_in].get_lowest_weight_path()  # path from source node s to current node i
+                    if current_node.node_index != self.source_node:
+                        path_s_i += [current_node.node_index]
                     # add the label to the next node (j) and remove that node from treated lists
-                    self.node_labels[j_out].add_label(total_weight, total_cost, current_node.node_index)
+                    self.node_labels[j_out].add_label(total_weight, total_cost, current_node.node_index, path_s_i + [j_out])
                     for node in self.node_labels[j_out].outgoing_nodes:
                         if j_out in self.node_labels[node].treated_nodes:
                             self.node_labels[node].treated_nodes.remove(j_out)
-                    # add the corresponding path from the source node to node j
-                    path_s_i = self.node_labels[k_in].get_lowest_weight_path()  # path from source node s to current node i
-                    if current_node.node_index != self.source_node:
-                        path_s_i += [current_node.node_index]
-                    self.node_labels[j_out].add_path(path_s_i, current_node.node_index)                    
 
                 current_node.treated_nodes.append(k_in)
                 current_node.needs_visit = False
@@ -203,7 +204,8 @@ class LabelAlgorithmRec(LabelAlgorithmBase):
             if node_label.num_untreated_nodes() > 0:
                 remaining_nodes.append(node)
         
-        percent_left: float = len(remaining_nodes) / len(self.node_labels.keys())
+        # only the nodes of the reduced graph can still be treated
+        percent_left: float = len(remaining_nodes) / len(self.graph.nodes)
 
         if percent_left > min_percent_remain:
             next_node = self._rec_next_node(from_node)
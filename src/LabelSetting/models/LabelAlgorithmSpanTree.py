@@ -7,7 +7,7 @@ from src.LabelSetting.models.SpanningTree import SpanningTree, TreeNode
 
 class LabelAlgorithmSpanTree(LabelAlgorithmBase):
 
-    def run_algorithm(self, graph: WCGraph, source_node: int, max_weight: int):
+    def run_algorithm(self, graph: WCGraph, source_node: int, max_weight: int, destination_node: int | None = None):
         """
         Runs the Label Setting Algorithm on the given weight-constrained graph with the given source node.
 
@@ -19,9 +19,11 @@ class LabelAlgorithmSpanTree(LabelAlgorithmBase):
             graph (WCGraph): the weight-constrained graph
             source_node (int): the index that defines the source node
             max_weight (itn): the maximum weight constraint
+            destination_node (int | None, optional): the destination node, the nodes that can't reach it are skipped. Defaults to None.
         """
         self.graph = graph
         self.source_node = source_node
+        self.destination_node = destination_node
         self.max_weight = max_weight 
 
         # Step 0: Initialize the labels
@@ -65,7 +67,7 @@ class LabelAlgorithmSpanTree(LabelAlgorithmBase):
                 else:
                     # current node is the source node, so no incoming nodes exists (that we care about)
                     k_in = current_node.node_index
-                    k_label = current_node.labels[0]
+                    k_label = current_node.get_lowest_weight_label()[1]
                     W_k_i = k_label[0]
                     C_k_i = k_label[1]
 
@@ -73,17 +75,17 @@ class LabelAlgorithmSpanTree(LabelAlgorithmBase):
                 for j_out in current_node.outgoing_nodes:
                     w_i_j = self.graph.wc_edges[i, j_out][0]       # the weight of edge (i, j)
                     total_weight = W_k_i + w_i_j
-                    if total_weight <= self.max_weight:
+                    if self._is_within_weight_bound(j_out, total_weight):
                         c_i_j = self.graph.wc_edges[i, j_out][1]   # cost of the edge (i, j)
                         total_cost = C_k_i + c_i_j
-                        if not self.node_labels[j_out].is_label_dominated(total_weight, total_cost):
-                            # add the label to the next node (j) and remove that node from treated lists
-                            self.node_labels[j_out].add_label(total_weight, total_cost, current_node.node_index)
-                            # add the corresponding path from the source node to node j
+                        if self._is_within_cost_bound(j_out, total_cost) and not self.node_labels[j_out].is_label_dominated(total_weight, total_cost):
+                            # the path from the source node to node j
                             path_s_i = self.node_labels[k_in].get_lowest_weight_path()  # path from source node s to current node i
                             if current_node.node_index != self.source_node:
                                 path_s_i += [current_node.node_index]
-                            self.node_labels[j_out].add_path(path_s_i, current_node.node_index)
+                            # add the label to the next node (j) and remove that node from treated lists
+                            self.node_labels[j_out].add_label(total_weight, total_cost, current_node.node_index, path_s_i + [j_out])
+                            self._update_upper_bound(j_out, total_cost)
                             # update outgoing nodes from node j, signaling that they now need to be re-treated for node j
                             for node in self.node_labels[j_out].outgoing_nodes:
                                 if j_out in self.node_labels[node].treated_nodes:
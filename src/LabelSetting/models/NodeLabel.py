@@ -1,5 +1,6 @@
 
-from typing import Dict, List, Set, Tuple
+import bisect
+from typing import List, Set, Tuple
 
 from src.GraphModeling.models.Graph import Graph
 from src.GraphModeling.models.WCGraph import WCGraph
@@ -8,93 +9,115 @@ from src.GraphModeling.models.WCGraph import WCGraph
 class NodeLabel:
     """
     The Node Label class defines a label-storing object for a node in a weight-constrained graph.
-        
+
+    The labels of the node form a Pareto frontier: they are kept sorted by increasing weight with strictly
+    decreasing cost, so no label dominates another one. A new label is found in the frontier with a binary
+    search (O(log L) for L labels), which is enough to test if it is dominated: only the label with the
+    highest weight not above the new weight can dominate it. The labels the new label dominates are the
+    ones right after its position, and are replaced by it as one slice assignment. The slice assignment
+    shifts the labels after it, so adding a label is O(L) in the worst case: the shift is a single memmove
+    of list pointers, which stays below the cost of the search until the frontier has about 10^4 labels.
+    Every label keeps the incoming node it came from and its path from the source.
+
     members:
         + node_index (int): the index identifier of the node
-        + labels (Dict[int, Tuple(int, int)]): a dictionary of node indicies to labels, of the form:
-            L_i = { j : (W_jk + w_ji, C_jk + c_ji) }
+        + labels (List[Tuple[int, int]]): the efficient (weight, cost) labels, sorted by increasing weight:
+            L_i = { (W_jk + w_ji, C_jk + c_ji) }
+        + paths (List[List[int]]): the path from the source to this node of each label (aligned with labels)
         + incoming_nodes (List[int]): a list of indicies of nodes with outgoing edges to this node.
         + outgoing_nodes (List[int]): a list of indicices of nodes with incoming edges from this node.
         + treated_nodes (List[int]): a list of treated nodes for the label (only treats outgoing labels)
-        + paths (Dict[int, list[list[int]]]): a dictionary of paths from the source node, through the incoming node, to this node
     """
 
-    def __init__(self, index: int, incoming_nodes: List[int] = [], outgoing_nodes: List[int] = []) -> None:
+    def __init__(self, index: int, incoming_nodes: List[int] | None = None, outgoing_nodes: List[int] | None = None) -> None:
         """
         Creates a new instance of a NodeLabel object.
 
         Args:
             index (int): the index identifier of the node
-            incoming_nodes (List[int], optional): the list of nodes with outgoing edges going to the node. Defaults to [].
+            incoming_nodes (List[int] | None, optional): the list of nodes with outgoing edges going to the node. Defaults to None (no nodes).
+            outgoing_nodes (List[int] | None, optional): the list of nodes with incoming edges from the node. Defaults to None (no nodes).
         """
         self.node_index = index
-        self.incoming_nodes = incoming_nodes
-        self.outgoing_nodes = outgoing_nodes
+        self.incoming_nodes = incoming_nodes if incoming_nodes is not None else []
+        self.outgoing_nodes = outgoing_nodes if outgoing_nodes is not None else []
         self.treated_nodes: List[int] = []
-        self.labels: Dict[int, Tuple[int, int]] = { node: () for node in incoming_nodes }
-        self.paths: Dict[int, list[list[int]]] = { node: [] for node in incoming_nodes }
         self.needs_visit = True
 
-    def add_label(self, weight: int, cost: int, index: int) -> None:
+        # the frontier, as parallel lists sorted by increasing weight (the costs are stored negated, so
+        # both lists are increasing and can be searched with bisect)
+        self._weights: List[int] = []
+        self._negated_costs: List[int] = []
+        self._label_nodes: List[int] = []
+        self._label_paths: List[List[int]] = []
+
+    @property
+    def labels(self) -> List[Tuple[int, int]]:
+        """The efficient (weight, cost) labels, sorted by increasing weight."""
+        return self.get_efficient_labels()
+
+    @property
+    def paths(self) -> List[List[int]]:
+        """The path of each efficient label, aligned with labels."""
+        return self.get_efficient_paths()
+
+    def add_label(self, weight: int, cost: int, index: int, path: List[int] | None = None) -> bool:
         """
-        Adds a label to the list of labels for the node.
+        Adds a label to the frontier of the node, unless it is dominated, and removes the labels it dominates.
+        Costs O(log L) to find the position of the label, plus O(L) in the worst case to shift the labels after it.
 
         Args:
             weight (int): the total weight of the label
             cost (int): the total cost of the label
             index (int): the index of the node where the edge came from
+            path (List[int] | None, optional): the path from the source to this node. Defaults to None (just this node).
+
+        Returns:
+            bool: true if the label was added, false if it is dominated
         """
         if index not in self.incoming_nodes:
             self.incoming_nodes.append(index)
-        
-        self.labels[index] = (weight, cost)
-    
-    def add_path(self, path: List[int], incoming_node: int) -> None:
-        """
-        Adds the path from the source to the current node that passes through the given incoming node.
 
-        Args:
-            path (List[int]): a list of nodes from the source to this node
-            incoming_node (int): the incoming node in the path
-        """
-        self.paths[incoming_node] = path + [ self.node_index ]
-    
+        if self.is_label_dominated(weight, cost):
+            return False
+
+        # the labels from the position of the new label on with a cost not below it are dominated by it
+        position = bisect.bisect_left(self._weights, weight)
+        end = bisect.bisect_right(self._negated_costs, -cost, lo = position)
+        label_path = path if path is not None else [self.node_index]
+        self._weights[position:end] = [weight]
+        self._negated_costs[position:end] = [-cost]
+        self._label_nodes[position:end] = [index]
+        self._label_paths[position:end] = [label_path]
+        return True
+
     def get_lowest_weight_path(self) -> List[int]:
         """
         Returns the path with the lowest weight based on the current labels
 
         Returns:
-            List[int]: a path of node indicies
+            List[int]: a path of node indicies (empty if the node has no labels)
         """
-        incoming_node = self.get_lowest_weight_label()[0]
-        return self.paths[incoming_node].copy()
-    
-    def get_lowest_weight_label(self) -> Tuple[int,  Tuple[int, int]] | None:
+        return self._label_paths[0].copy() if len(self._weights) > 0 else []
+
+    def get_lowest_weight_label(self) -> Tuple[int | None, Tuple[int, int] | None]:
         """
-        Finds the label with the lowest weight for this node
+        Returns the label with the lowest weight for this node (the first label of the frontier). Costs O(1).
 
         Returns:
-            Tuple[int,  Tuple[int, int]] | None: the node and corresponding label with the lowest weight, None if there are no labels
+            Tuple[int | None, Tuple[int, int] | None]: the incoming node and the (weight, cost) of the label with the lowest
+                weight, (None, None) if there are no labels
         """
-        minimal_label: Tuple[int, int] | None = None
-        minimal_node: int = None
-
-        for node, label in self.labels.items():
-            if minimal_label is not None and len(label) != 0:
-                if label[0] < minimal_label[0] or (label[0] == minimal_label[0] and label[1] < minimal_label[1]):
-                    minimal_label = label
-                    minimal_node = node
-            elif len(label) != 0:
-                minimal_label = label
-                minimal_node = node
-
-        return (minimal_node, minimal_label)
+        if len(self._weights) == 0:
+            return (None, None)
+        return (self._label_nodes[0], (self._weights[0], -self._negated_costs[0]))
 
     def is_label_dominated(self, weight: int, cost: int) -> bool:
         """
         Checks if a label is dominated based on the weight and cost. A label is dominated if
-        its weight and cost are both less than the weight and cost of another node in the set
-        of labels for this node. 
+        another label of the node has a weight and a cost that are both less than or equal
+        to its weight and cost. Costs O(log L): the label with the highest weight not above
+        the given weight has the lowest cost of those labels.
 
         Args:
             weight (int): the weight of the label
@@ -103,26 +126,37 @@ class NodeLabel:
         Returns:
             bool: true if the label is dominated by at least one label in this node
         """
+        position = bisect.bisect_right(self._weights, weight) - 1
+        return position >= 0 and -self._negated_costs[position] <= cost
 
-        return NodeLabel._is_label_dominated_in_list(weight, cost, self.labels.values())
-
-    def get_efficient_labels(self) -> Dict[int, Tuple[int, int]]:
+    def get_efficient_labels(self) -> List[Tuple[int, int]]:
         """
         Returns a list of all the efficient labels for the node. An efficient label is a label
-        that is not dominated by any other label for the node.
+        that is not dominated by any other label for the node, so these are all the labels.
 
         Returns:
-            Dict[int, Tuple[int, int]]: a dictionary of the nodes to their label, only returning efficient labels
+            List[Tuple[int, int]]: the (weight, cost) labels, sorted by increasing weight (and decreasing cost)
         """
-        efficient_labels = {}
-        
-        for node, label in self.labels.items():
-            other_labels = [ item for item in self.labels.values() if item != label ]
-            if len(label) != 0 and not NodeLabel._is_label_dominated_in_list(label[0], label[1], other_labels):
-                efficient_labels[node] = label
+        return [(weight, -negated_cost) for weight, negated_cost in zip(self._weights, self._negated_costs)]
+
+    def get_efficient_paths(self) -> List[List[int]]:
+        """
+        Returns the path from the source to this node of every efficient label.
+
+        Returns:
+            List[List[int]]: the paths, aligned with get_efficient_labels
+        """
+        return [path.copy() for path in self._label_paths]
+
+    def get_label_nodes(self) -> List[int]:
+        """
+        Returns the incoming node of every efficient label.
+
+        Returns:
+            List[int]: the incoming nodes, aligned with get_efficient_labels
+        """
+        return self._label_nodes.copy()
 
-        return efficient_labels
-    
     def get_untreated_nodes(self) -> Set[int]:
         """
         Returns a set of the remaining indicies not yet treated for a node: I_i - T_i
@@ -193,28 +227,3 @@ class NodeLabel:
         else:
             weight_cost = None
         return weight_cost
-    
-    @staticmethod
-    def _is_label_dominated_in_list(weight: int, cost: int, labels: List[Tuple[int, int]]) -> bool:
-        """
-        Checks if a label is dominated based on the weight and cost. A label is dominated if
-        its weight and cost are both less than the weight and cost of another node in the set
-        of labels for this node.
-
-        Args:
-            weight (int): the weight of the label
-            cost (int): the cost of the label
-            labels (Sequece): a list of labels
-
-        Returns:
-            bool: true if the label is dominated by at least one label in the list of labels
-        """
-        isDominated = False
-
-        for label in labels:
-            if len(label) != 0 and (weight > label[0] and cost > label[1]) or label == (weight, cost):
-                isDominated = True
-                break
-
-        return isDominated
-    
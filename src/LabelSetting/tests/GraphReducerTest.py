@@ -0,0 +1,175 @@
+from typing import List, Tuple
+
+from src.GraphModeling.models.WCGraph import WCGraph
+from src.GraphModeling.tests.WCGraphTest import assert_raises
+from src.LabelSetting.models.GraphReducer import GraphReducer
+from src.LabelSetting.models.LabelAlgorithmRec import LabelAlgorithmRec
+from src.LabelSetting.tests.LabelAlgorithmTest import get_frontier_test_graph
+
+
+def get_pareto_labels(graph: WCGraph, source_node: int, destination_node: int, max_weight: int) -> List[Tuple[int, int]]:
+    # brute force: the efficient (weight, cost) of every path within the maximum weight
+    labels = sorted(set(graph.calc_path_weight_cost(path) for path in graph.find_wc_paths(max_weight, source_node, destination_node)))
+    efficient = []
+    for weight, cost in labels:
+        if len(efficient) == 0 or cost < efficient[-1][1]:
+            efficient.append((weight, cost))
+    return efficient
+
+def test_weight_bounds():
+    print("\nGraph Reducer - Weight bounds\n")
+    graph = get_frontier_test_graph()
+    from_source, to_destination = GraphReducer.get_weight_bounds(graph, 0, 5)
+    assert from_source.tolist() == [0, 1, 5, 2, 2, 3] and to_destination.tolist() == [3, 2, 2, 1, 2, 0]
+
+    # every path through node 2 weighs at least 7, and through the edge (0, 3) or node 4 at least 4
+    reduced, from_source, to_destination = GraphReducer.reduce_by_weight_bounds(graph, 0, 5, 5)
+    assert sorted(reduced.nodes) == [0, 1, 3, 4, 5] and (0, 2) not in reduced.wc_edges and (0, 3) in reduced.wc_edges
+    assert from_source.tolist() == [0, 1, 2, 2, 3] and to_destination.tolist() == [3, 2, 1, 2, 0]
+    reduced = GraphReducer.reduce_by_weight_bounds(graph, 0, 5, 3)[0]
+    assert reduced.wc_edges == { (0, 1): (1, 10), (1, 3): (1, 10), (3, 5): (1, 1) }
+    # without a feasible path, only the source and the destination are left
+    reduced = GraphReducer.reduce_by_weight_bounds(graph, 0, 5, 2)[0]
+    assert reduced.nodes == [0, 5] and reduced.wc_edges == {}
+    assert GraphReducer.reduce_by_weight_bounds(graph, 0, 5, 10)[0] is graph
+
+    # the reduction never changes the efficient labels of the paths within the maximum weight
+    for seed in range(5):
+        graph = WCGraph.get_arbitrary_graph(12, 5, 5, std_weight = 3, std_cost = 3, peak = 4, seed = seed)
+        for max_weight in (10, 15, 20):
+            reduced = GraphReducer.reduce_by_weight_bounds(graph, 0, 11, max_weight)[0]
+            assert len(reduced.edges) <= len(graph.edges)
+            assert get_pareto_labels(reduced, 0, 11, max_weight) == get_pareto_labels(graph, 0, 11, max_weight)
+    print(f"|   {len(reduced.edges)} of {len(graph.edges)} edges kept")
+
+def test_lagrangian_costs():
+    print("\nGraph Reducer - Lagrangian costs\n")
+    graph = get_frontier_test_graph()
+    assert (graph.get_lagrangian_cost_matrix(0.5).toarray()[0] == [0, 10.5, 4.5, 10.5, 6, 0]).all()
+
+    # the best path within W = 5 costs 10: with u = 5, every path through node 1 or 2 costs at least 11
+    reduced = GraphReducer.reduce_by_lagrangian_costs(graph, 0, 5, 5, 5, 10)
+    assert reduced.wc_edges == { (0, 3): (3, 9), (0, 4): (2, 5), (4, 3): (1, 4), (3, 5): (1, 1) }
+    assert GraphReducer.reduce_by_lagrangian_costs(graph, 0, 5, 5, 5, float("inf")) is graph
+    assert_raises(ValueError, lambda: GraphReducer.reduce_by_lagrangian_costs(graph, 0, 5, 5, -1, 10))
+
+    labels = LabelAlgorithmRec()
+    labels.lagrange_multiplier = 5
+    labels.run_algorithm(graph, 0, 5, 5)
+    assert labels.graph.wc_edges == reduced.wc_edges and labels.upper_bound == 10 and labels.incumbent_path == [0, 3, 5]
+    assert labels.node_labels[5].labels == [(4, 10)] and labels.node_labels[2].labels == []
+
+    # the best path within the maximum weight is never removed
+    num_edges, num_kept = 0, 0
+    for seed in range(5):
+        graph = WCGraph.get_arbitrary_graph(12, 5, 5, std_weight = 3, std_cost = 3, peak = 4, seed = seed)
+        for max_weight in (10, 15, 20):
+            efficient = get_pareto_labels(graph, 0, 11, max_weight)
+            if len(efficient) == 0:
+                continue
+            for multiplier in (0, 0.5, 2):
+                # the most expensive efficient label is a feasible upper bound
+                reduced = GraphReducer.reduce_by_lagrangian_costs(graph, 0, 11, max_weight, multiplier, efficient[0][1])
+                assert get_pareto_labels(reduced, 0, 11, max_weight)[-1] == efficient[-1]
+                num_edges, num_kept = num_edges + len(graph.edges), num_kept + len(reduced.edges)
+    print(f"|   {num_kept} of {num_edges} edges kept")
+
+def get_series_parallel_test_graph() -> WCGraph:
+    return WCGraph({
+        #edge    constraint
+        #s  t    w  c
+        (0, 1): (1, 1),     # chain 0 -> 1 -> 2 -> 5: (3, 3)
+        (1, 2): (1, 1),
+        (2, 5): (1, 1),
+        (0, 3): (1, 5),     # chain 0 -> 3 -> 4 -> 5: (3, 15), dominated by the first chain
+        (3, 4): (1, 5),
+        (4, 5): (1, 5),
+        (0, 6): (1, 0),     # chain 0 -> 6 -> 5: (6, 0), efficient as well
+        (6, 5): (5, 0),
+        (5, 8): (1, 1)
+    })
+
+def get_relevant_nodes_test_graph() -> WCGraph:
+    return WCGraph({
+        #edge    constraint
+        #s  t    w  c
+        (7, 0): (1, 1),     # node 7 can't be reached from the source
+        (0, 1): (1, 2),
+        (1, 3): (1, 2),
+        (0, 2): (2, 1),
+        (2, 3): (2, 1),
+        (1, 4): (1, 1),     # node 4 is a dead end
+        (3, 5): (1, 1)
+    })
+
+def test_relevant_nodes():
+    print("\nGraph Reducer - Relevant nodes\n")
+    graph = get_relevant_nodes_test_graph()
+
+    assert sorted(graph.get_reachable_nodes(0).tolist()) == [0, 1, 2, 3, 4, 5]
+    assert sorted(graph.get_reachable_nodes(3, reverse = True).tolist()) == [0, 1, 2, 3, 7]
+    assert sorted(GraphReducer.get_relevant_nodes(graph, 0, 3).tolist()) == [0, 1, 2, 3]
+
+    # the induced subgraph keeps the edges between the nodes, with their weights and costs
+    subgraph = graph.get_induced_subgraph([0, 1, 2, 3])
+    assert subgraph.wc_edges == { (0, 1): (1, 2), (1, 3): (1, 2), (0, 2): (2, 1), (2, 3): (2, 1) }
+    assert GraphReducer.reduce_to_relevant_nodes(graph, 0, 3).wc_edges == subgraph.wc_edges
+    assert sorted(GraphReducer.reduce_to_relevant_nodes(graph, 0).nodes) == [0, 1, 2, 3, 4, 5]
+    # nothing to remove: the graph itself is returned
+    assert GraphReducer.reduce_to_relevant_nodes(subgraph, 0, 3) is subgraph
+
+    # the algorithm keeps the original graph, and the removed nodes have an empty label
+    labels = LabelAlgorithmRec()
+    labels.run_algorithm(graph, 0, 10, 3)
+    assert labels.original_graph is graph and sorted(labels.graph.nodes) == [0, 1, 2, 3]
+    assert sorted(labels.node_labels) == sorted(graph.nodes)
+    assert labels.node_labels[3].labels == [(2, 4), (4, 2)]
+    for node in (4, 5, 7):
+        assert labels.node_labels[node].labels == [] and labels.node_labels[node].incoming_nodes == []
+    print(f"|   {sorted(labels.graph.nodes)}")
+
+def test_series_parallel():
+    print("\nGraph Reducer - Series / parallel reduction\n")
+    graph = get_series_parallel_test_graph()
+
+    reduced, expansion = GraphReducer.reduce_series_parallel(graph, [0, 8])
+    # the dominated chain is removed, the second efficient chain goes through a new node (9)
+    assert reduced.wc_edges == { (0, 5): (3, 3), (0, 9): (6, 0), (9, 5): (0, 0), (5, 8): (1, 1) }
+    assert expansion == { (0, 5): [1, 2, 5], (0, 9): [6, 5], (9, 5): [] }
+    assert GraphReducer.expand_path([0, 5, 8], expansion) == [0, 1, 2, 5, 8]
+    assert GraphReducer.expand_path([0, 9, 5, 8], expansion) == [0, 6, 5, 8]
+    assert get_pareto_labels(reduced, 0, 8, 20) == get_pareto_labels(graph, 0, 8, 20) == [(4, 4), (7, 1)]
+
+    # the protected nodes are never merged away
+    protected_reduced, protected_expansion = GraphReducer.reduce_series_parallel(graph, [0, 2, 8])
+    assert (0, 2) in protected_reduced.wc_edges and (2, 5) in protected_reduced.wc_edges and protected_expansion[(0, 2)] == [1, 2]
+    # without protected nodes, the same chains are merged (node 8 is only the end of the last edge)
+    assert GraphReducer.reduce_series_parallel(graph)[1] == expansion
+
+    # the label algorithm gives the paths of the original graph
+    labels = LabelAlgorithmRec()
+    labels.reduce_series_parallel = True
+    labels.run_algorithm(graph, 0, 20, 8)
+    assert labels.node_labels[8].get_efficient_labels() == [(4, 4), (7, 1)]
+    paths = [labels.get_original_path(path) for path in labels.node_labels[8].get_efficient_paths()]
+    assert paths == [[0, 1, 2, 5, 8], [0, 6, 5, 8]]
+
+    # the incumbent path is found on the reduced graph ([0, 9, 5, 8], and [0, 8] once the weight bounds leave one
+    # chain), but given as a path of the original graph
+    for max_weight, incumbent_path in ((20, [0, 6, 5, 8]), (5, [0, 1, 2, 5, 8])):
+        labels = LabelAlgorithmRec()
+        labels.reduce_series_parallel = True
+        labels.bound_labels = True
+        labels.run_algorithm(graph, 0, max_weight, 8)
+        assert labels.incumbent_path == incumbent_path
+        assert graph.calc_path_weight_cost(labels.incumbent_path)[1] == labels.upper_bound
+    print(f"|   {reduced.wc_edges}")
+
+def main():
+    test_relevant_nodes()
+    test_weight_bounds()
+    test_lagrangian_costs()
+    test_series_parallel()
+
+if __name__ == "__main__":
+    main()
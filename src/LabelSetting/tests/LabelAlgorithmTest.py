@@ -23,12 +23,13 @@ def print_test_results(graph: WCGraph, labels: LabelAlgorithmBase, destination_n
     efficient_labels = labels.node_labels[destination_node].get_efficient_labels()
     print(f"|   Efficient labels for the destination node:\n|   |   {efficient_labels}\n")
     print(f"|   Efficient Paths:")
-    for node in efficient_labels.keys():
-        print(f"|    |   {labels.node_labels[destination_node].paths[node]}")
+    efficient_paths = labels.node_labels[destination_node].get_efficient_paths()
+    for efficient_path in efficient_paths:
+        print(f"|    |   {efficient_path}")
     
     path = []
-    for node in efficient_labels.keys():
-        path.extend(labels.node_labels[destination_node].paths[node])
+    for efficient_path in efficient_paths:
+        path.extend(efficient_path)
     edges = []
     for i in range(len(path) - 1):
         edges.append((path[i], path[i + 1]))
@@ -54,7 +55,7 @@ def test_label_iterative(graph: WCGraph, source_node: int, destination_node: int
 
     labels = LabelAlgorithmIter()
 
-    labels.run_algorithm(graph, source_node, weight)
+    labels.run_algorithm(graph, source_node, weight, destination_node)
 
     print_test_results(graph, labels, destination_node)
     return labels
@@ -66,7 +67,7 @@ def test_label_recursive(graph: WCGraph, source_node: int, destination_node: int
 
     labels.min_percent_remain = 0.9
 
-    labels.run_algorithm(graph, source_node, weight)
+    labels.run_algorithm(graph, source_node, weight, destination_node)
 
     print_test_results(graph, labels, destination_node)
     return labels
@@ -76,7 +77,7 @@ def test_label_spantree(graph: WCGraph, source_node: int, destination_node: int,
 
     labels = LabelAlgorithmSpanTree()
 
-    labels.run_algorithm(graph, source_node, weight)
+    labels.run_algorithm(graph, source_node, weight, destination_node)
 
     print_test_results(graph, labels, destination_node)
     return labels
@@ -91,6 +92,40 @@ def test_label_rec_all_labels(graph: WCGraph, source_node: int, destination_node
     print_test_results(graph, labels, destination_node)
     return labels
 
+def get_frontier_test_graph() -> WCGraph:
+    return WCGraph({
+        #edge    constraint
+        #s  t    w  c
+        (0, 1): (1, 10),
+        (1, 3): (1, 10),
+        (0, 2): (5, 2),
+        (2, 3): (1, 2),
+        (0, 3): (3, 9),
+        (0, 4): (2, 5),
+        (4, 3): (1, 4),
+        (3, 5): (1, 1)
+    })
+
+def test_cost_bounds():
+    print("\nLabel Algorithm - Cost bounds\n")
+    graph = get_frontier_test_graph()
+
+    for algorithm in (LabelAlgorithmRec, LabelAlgorithmSpanTree):
+        # without bounds (the default), the destination keeps every efficient label
+        labels = algorithm()
+        labels.run_algorithm(graph, 0, 10, 5)
+        assert labels.node_labels[5].get_efficient_labels() == [(3, 21), (4, 10), (7, 5)]
+        assert labels.upper_bound == float("inf")
+
+        # with bounds, only the labels that are not more expensive than the best path are kept
+        labels = algorithm()
+        labels.bound_labels = True
+        labels.run_algorithm(graph, 0, 10, 5)
+        assert labels.node_labels[5].get_efficient_labels() == [(7, 5)]
+        assert labels.node_labels[5].get_efficient_paths() == [[0, 2, 3, 5]]
+        assert labels.upper_bound == 5 and labels.incumbent_path == [0, 2, 3, 5]
+        print(f"|   {algorithm.__name__}: {labels.node_labels[5].get_efficient_labels()}")
+
 def test_1_simple_graph_on_all():
     graph = WCGraph({
         #edge    constraint
@@ -238,6 +273,8 @@ def test_load(graph_name: str, num_nodes: int):
 def main():
     print("Label Algorithm Test ------------------------------------")
 
+    test_cost_bounds()
+
     # Basic graph tests
     # test_1_simple_graph_on_all()
     # test_2_moderate_graph_rec()
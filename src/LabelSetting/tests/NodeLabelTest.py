@@ -0,0 +1,85 @@
+from src.LabelSetting.models.LabelAlgorithmRec import LabelAlgorithmRec
+from src.LabelSetting.models.LabelAlgorithmSpanTree import LabelAlgorithmSpanTree
+from src.LabelSetting.models.NodeLabel import NodeLabel
+from src.LabelSetting.tests.LabelAlgorithmTest import get_frontier_test_graph
+
+
+def test_frontier():
+    print("\nNode Label - Pareto frontier\n")
+    label = NodeLabel(3, [], [])
+    assert label.labels == [] and label.paths == [] and label.get_lowest_weight_label() == (None, None)
+    assert label.get_lowest_weight_path() == []
+
+    assert label.add_label(4, 8, 1, [0, 1, 3])
+    assert label.add_label(6, 4, 2, [0, 2, 3])
+    assert label.add_label(2, 12, 0, [0, 3])
+    assert label.labels == [(2, 12), (4, 8), (6, 4)]
+    assert label.paths == [[0, 3], [0, 1, 3], [0, 2, 3]]
+
+    # an equal (weight, cost) label is dominated, the first one is kept
+    assert not label.add_label(4, 8, 5, [0, 5, 3])
+    # ties on the weight or the cost with a higher other value are dominated as well
+    assert not label.add_label(4, 9, 5, [0, 5, 3])
+    assert not label.add_label(5, 8, 5, [0, 5, 3])
+    assert label.labels == [(2, 12), (4, 8), (6, 4)] and label.paths[1] == [0, 1, 3]
+    # but the incoming node is still recorded
+    assert 5 in label.incoming_nodes
+
+    # a tie on the weight with a lower cost replaces the label
+    assert label.add_label(4, 7, 6, [0, 6, 3])
+    assert label.labels == [(2, 12), (4, 7), (6, 4)] and label.get_label_nodes() == [0, 6, 2]
+
+    # a label dominating several labels removes all of them
+    assert label.add_label(3, 4, 4, [0, 4, 3])
+    assert label.labels == [(2, 12), (3, 4)] and label.paths == [[0, 3], [0, 4, 3]]
+    assert label.get_lowest_weight_label() == (0, (2, 12)) and label.get_lowest_weight_path() == [0, 3]
+
+    # the returned paths are copies
+    label.get_efficient_paths()[0].append(9)
+    label.get_lowest_weight_path().append(9)
+    assert label.paths[0] == [0, 3]
+
+    # without a path, the label is just the node
+    other = NodeLabel(7, [], [])
+    assert other.add_label(1, 1, 7) and other.paths == [[7]]
+
+    # the default incoming nodes are not shared between labels
+    first, second = NodeLabel(8), NodeLabel(9)
+    first.add_label(1, 1, 2)
+    assert first.incoming_nodes == [2] and second.incoming_nodes == [] and second.outgoing_nodes == []
+    print(f"|   {label.labels}")
+
+def test_frontier_in_graph():
+    print("\nNode Label - Frontier of a known graph\n")
+    graph = get_frontier_test_graph()
+
+    # node 3 is reached by 0-1-3 (2, 20), 0-3 (3, 9), 0-4-3 (3, 9) and 0-2-3 (6, 4): the second (3, 9) is a duplicate
+    expected = {
+        3: ([(2, 20), (3, 9), (6, 4)], [[0, 1, 3], [0, 3], [0, 2, 3]]),
+        5: ([(3, 21), (4, 10), (7, 5)], [[0, 1, 3, 5], [0, 3, 5], [0, 2, 3, 5]])
+    }
+    for algorithm in (LabelAlgorithmRec, LabelAlgorithmSpanTree):
+        labels = algorithm()
+        labels.run_algorithm(graph, 0, 10, 5)
+        for node, (node_labels, node_paths) in expected.items():
+            assert labels.node_labels[node].labels == node_labels
+            assert labels.node_labels[node].paths == node_paths
+        for node_label in labels.node_labels.values():
+            for (weight, cost), path in zip(node_label.labels, node_label.paths):
+                assert graph.calc_path_weight_cost(path) == (weight, cost)
+
+    # every possible label ignores the weight constraint, but each node still only keeps its efficient labels
+    labels = LabelAlgorithmRec()
+    labels.gen_all_possible_labels(graph, 0, 3)
+    assert labels.node_labels[0].labels == [(0, 0)] and labels.node_labels[4].labels == [(2, 5)]
+    for node, (node_labels, node_paths) in expected.items():
+        assert labels.node_labels[node].labels == node_labels
+        assert labels.node_labels[node].paths == node_paths
+    print(f"|   {labels.node_labels[5].labels}")
+
+def main():
+    test_frontier()
+    test_frontier_in_graph()
+
+if __name__ == "__main__":
+    main()